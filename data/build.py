@@ -0,0 +1,438 @@
+# In: the data generators' inputs: itemdetails.csv, itemmessages.csv, and
+# the disc files and lookup files that messages/messagedata2js.py reads
+# Out: the webpage's generated JS files (js/itemdetails.js,
+# js/itemmessages.js, js/messages/<code>.js, etc.), with only the out of
+# date ones rebuilt
+#
+# Each stage knows its input and output files. A stage runs if the contents
+# of any of its inputs, or the options it's built with, changed since its
+# last successful run, or if one of its outputs is missing. The stages
+# don't read each other's outputs, so they run at the same time.
+#
+# With --watch, it then keeps watching itemdetails.csv and itemmessages.csv,
+# and whenever one changes, re-parses only the rows that changed and
+# rewrites that file's JS right away.
+#
+# Unlike the generator scripts themselves, this can be run from any
+# directory.
+
+
+import argparse
+import collections
+import concurrent.futures
+import hashlib
+import os
+import subprocess
+import sys
+import time
+import traceback
+
+DATA_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+MESSAGES_DIRECTORY = os.path.join(DATA_DIRECTORY, 'messages')
+JS_DIRECTORY = os.path.join(os.path.dirname(DATA_DIRECTORY), 'js')
+sys.path.insert(0, MESSAGES_DIRECTORY)
+
+import messagedata2js
+from itemdata import (
+    iter_item_details_rows, iter_item_messages_rows, parse_item_details_row,
+    parse_item_messages_row)
+from itemdetails_csv2js import write_item_details_js
+from itemmessages_csv2js import write_item_messages_js
+
+
+
+# Stamps recording what each stage's outputs were last built from.
+CACHE_DIRECTORY = os.path.join(DATA_DIRECTORY, '.cache')
+
+
+def data_path(*parts):
+    return os.path.join(DATA_DIRECTORY, *parts)
+
+
+def js_path(*parts):
+    return os.path.join(JS_DIRECTORY, *parts)
+
+
+def hash_inputs(filenames, options):
+    # Hash the contents of the input files, along with the options the stage
+    # is built with, into one hex digest. Same as messagedata2js's
+    # hash_files, but the filenames are part of the hash too, so that adding
+    # or removing an input counts as a change.
+    h = hashlib.sha256()
+    for option in options:
+        h.update(str(option).encode('utf-8') + b'\x00')
+    for filename in filenames:
+        h.update(filename.encode('utf-8') + b'\x00')
+        file_hash = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                file_hash.update(chunk)
+        h.update(file_hash.digest())
+    return h.hexdigest()
+
+
+def stamp_filename(stage_name):
+    return os.path.join(CACHE_DIRECTORY, 'build-{}.stamp'.format(stage_name))
+
+
+def read_stamp(stage_name):
+    try:
+        with open(stamp_filename(stage_name), 'r') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def write_stamp(stage_name, key):
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    messagedata2js.write_file_atomically(stamp_filename(stage_name), key)
+
+
+def run_command(command, directory):
+    # Run a generator script in its own directory, since the scripts use
+    # paths relative to that. Returns what it printed, or raises
+    # RuntimeError with that output if it failed.
+    result = subprocess.run(
+        command, cwd=directory, stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT, universal_newlines=True)
+    if result.returncode != 0:
+        raise RuntimeError("{} exited with code {}:\n{}".format(
+            ' '.join(command), result.returncode, result.stdout))
+    return result.stdout
+
+
+def item_details_stage(args):
+    csv_filename = data_path('itemdetails.csv')
+    js_filename = js_path('itemdetails.js')
+    return dict(
+        inputs=[
+            csv_filename, data_path('itemdetails_csv2js.py'),
+            data_path('itemdata.py')],
+        options=[],
+        outputs=[js_filename],
+        run=lambda: write_item_details_js(csv_filename, js_filename),
+    )
+
+
+def item_messages_stage(args):
+    csv_filename = data_path('itemmessages.csv')
+    js_filename = js_path('itemmessages.js')
+    return dict(
+        inputs=[
+            csv_filename, data_path('itemmessages_csv2js.py'),
+            data_path('itemdata.py')],
+        options=[],
+        outputs=[js_filename],
+        run=lambda: write_item_messages_js(csv_filename, js_filename),
+    )
+
+
+def messages_stage(args):
+    # messagedata2js.py, for all the languages in language-files.txt. It
+    # also keeps a cache of its own, so when this stage does run, languages
+    # whose disc files didn't change aren't re-extracted.
+    # Returns None if there's no language-files.txt (the disc files aren't
+    # in the repository).
+    if not os.path.exists(
+      os.path.join(MESSAGES_DIRECTORY, 'language-files.txt')):
+        return None
+    languages = messagedata2js.read_language_files(MESSAGES_DIRECTORY)
+
+    inputs = [
+        os.path.join(MESSAGES_DIRECTORY, filename) for filename in
+        ['messagedata2js.py', 'language-files.txt']
+        + messagedata2js.LOOKUP_FILENAMES
+    ]
+    for language in languages:
+        inputs.append(os.path.join(language['directory'], 'message.bmg'))
+        inputs.append(os.path.join(language['directory'], 'messageid.tbl'))
+    if args.prune or args.indexed:
+        inputs.extend([
+            data_path('itemdetails.csv'), data_path('itemmessages.csv')])
+
+    options = []
+    for flag in ['binary', 'process', 'shards', 'prune', 'indexed']:
+        if getattr(args, flag):
+            options.append('--' + flag)
+    for ext in sorted(set(args.compress)):
+        options.extend(['--compress', ext])
+
+    outputs = [js_path('messagelookup.js')]
+    for language in languages:
+        code = language['code']
+        outputs.append(js_path('messages', code + '.js'))
+        if args.binary:
+            outputs.append(js_path('messages', code + '.bin'))
+        if args.shards:
+            outputs.append(js_path(
+                'messages', code, messagedata2js.SHARD_MANIFEST_FILENAME))
+        if args.process:
+            outputs.append(js_path('messagedetails', code + '.js'))
+            outputs.append(js_path('messageframes', code + '.js'))
+        if args.indexed:
+            outputs.append(js_path('indexed', code + '.js'))
+    if args.indexed:
+        outputs.append(js_path('indexed', messagedata2js.INDEX_FILENAME))
+
+    # --jobs and --force don't change what gets built, so they're not part
+    # of the stage's options.
+    command = [sys.executable, 'messagedata2js.py', '--jobs', str(args.jobs)]
+    command.extend(options)
+    if args.force:
+        command.append('--force')
+    return dict(
+        inputs=inputs,
+        options=options,
+        outputs=outputs,
+        run=lambda: run_command(command, MESSAGES_DIRECTORY),
+    )
+
+
+STAGE_FUNCTIONS = collections.OrderedDict([
+    ('itemdetails', item_details_stage),
+    ('itemmessages', item_messages_stage),
+    ('messages', messages_stage),
+])
+
+
+def stale_reason(stage_name, stage, key, force):
+    # Why the stage needs to run, or None if it's up to date.
+    if force:
+        return "forced"
+    missing = [f for f in stage['outputs'] if not os.path.exists(f)]
+    if missing:
+        return "missing " + os.path.relpath(missing[0])
+    if read_stamp(stage_name) != key:
+        return "inputs changed"
+    return None
+
+
+def run_stage(stage_name, stage, key):
+    # Run one stage, catching any error so that the other stages still
+    # finish. Returns (printed output or None, error traceback or None,
+    # seconds taken).
+    start = time.perf_counter()
+    output = None
+    error = None
+    try:
+        output = stage['run']()
+        write_stamp(stage_name, key)
+    except Exception:
+        error = traceback.format_exc()
+    return output, error, time.perf_counter() - start
+
+
+
+def build(stage_names, args):
+    # Run the given stages that are out of date. Returns the names of the
+    # stages that failed.
+    to_run = collections.OrderedDict()
+    for stage_name in stage_names:
+        stage = STAGE_FUNCTIONS[stage_name](args)
+        if stage is None:
+            print("{}: skipped, inputs not available".format(stage_name))
+            continue
+        key = hash_inputs(stage['inputs'], stage['options'])
+        reason = stale_reason(stage_name, stage, key, args.force)
+        if reason is None:
+            print("{}: up to date".format(stage_name))
+            continue
+        print("{}: out of date ({})".format(stage_name, reason))
+        to_run[stage_name] = (stage, key)
+
+    if args.dry_run or not to_run:
+        return []
+
+    with concurrent.futures.ThreadPoolExecutor(len(to_run)) as executor:
+        futures = collections.OrderedDict(
+            (stage_name, executor.submit(run_stage, stage_name, stage, key))
+            for stage_name, (stage, key) in to_run.items()
+        )
+
+    failed_stage_names = []
+    for stage_name, future in futures.items():
+        output, error, seconds = future.result()
+        if output:
+            print("[{}]".format(stage_name))
+            print(output, end='')
+        if error:
+            print("** Failed to build {}:\n{}".format(stage_name, error))
+            failed_stage_names.append(stage_name)
+        else:
+            print("{}: built in {:.1f} s".format(stage_name, seconds))
+    return failed_stage_names
+
+
+def item_watchers(args):
+    # The item data stages that --watch keeps up to date. Each watcher keeps
+    # its CSV's parsed rows, so that only changed rows need parsing again.
+    watchers = []
+    for stage_name, read_rows, parse_row, write_js in [
+      ('itemdetails', iter_item_details_rows, parse_item_details_row,
+       write_item_details_js),
+      ('itemmessages', iter_item_messages_rows, parse_item_messages_row,
+       write_item_messages_js)]:
+        stage = STAGE_FUNCTIONS[stage_name](args)
+        watchers.append(dict(
+            stage_name=stage_name,
+            stage=stage,
+            csv_filename=stage['inputs'][0],
+            js_filename=stage['outputs'][0],
+            read_rows=read_rows,
+            parse_row=parse_row,
+            write_js=write_js,
+            # File size and modification time when last read
+            signature=None,
+            # Raw row (tuple of cells) -> (item name, parsed item)
+            parsed_rows=dict(),
+            # Item name -> parsed item, in CSV order
+            items=collections.OrderedDict(),
+        ))
+    return watchers
+
+
+def file_signature(filename):
+    stat = os.stat(filename)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def update_watched_items(watcher):
+    # Re-read the watcher's CSV, parsing only the rows that aren't exactly
+    # the same as a row that was parsed before, and replace the watcher's
+    # items. Returns the names of the (added, changed, removed) items.
+    # Rows are read and checked the same way as the converters read them.
+    rows = [
+        tuple(row) for row in watcher['read_rows'](watcher['csv_filename'])]
+
+    old_items = watcher['items']
+    parsed_rows = dict()
+    items = collections.OrderedDict()
+    for row in rows:
+        if row in watcher['parsed_rows']:
+            item_name, item = watcher['parsed_rows'][row]
+        else:
+            item_name, item = watcher['parse_row'](list(row))
+        parsed_rows[row] = (item_name, item)
+        # Like the converters, a later row with the same item name wins.
+        items[item_name] = item
+    watcher['parsed_rows'] = parsed_rows
+    watcher['items'] = items
+
+    added = [name for name in items if name not in old_items]
+    changed = [
+        name for name in items
+        if name in old_items and items[name] != old_items[name]]
+    removed = [name for name in old_items if name not in items]
+    return added, changed, removed
+
+
+def describe_item_changes(added, changed, removed):
+    parts = []
+    for label, names in [
+      ("added", added), ("changed", changed), ("removed", removed)]:
+        if not names:
+            continue
+        shown = ', '.join(names[:5])
+        if len(names) > 5:
+            shown += ", and {} more".format(len(names) - 5)
+        parts.append("{} {}".format(label, shown))
+    return '; '.join(parts) or "no item changes"
+
+
+def watch_item_data(args, interval):
+    # Watch the item CSVs until interrupted, rewriting a CSV's JS file
+    # whenever the CSV changes. The build stamps are kept up to date too,
+    # so that a later build knows these outputs are current.
+    watchers = item_watchers(args)
+    for watcher in watchers:
+        watcher['signature'] = file_signature(watcher['csv_filename'])
+        update_watched_items(watcher)
+    print("Watching {} (Ctrl+C to stop)".format(', '.join(
+        os.path.relpath(watcher['csv_filename']) for watcher in watchers)))
+
+    try:
+        while True:
+            time.sleep(interval)
+            for watcher in watchers:
+                try:
+                    signature = file_signature(watcher['csv_filename'])
+                except FileNotFoundError:
+                    # Some editors replace the file by deleting it first.
+                    continue
+                if signature == watcher['signature']:
+                    continue
+                watcher['signature'] = signature
+
+                start = time.perf_counter()
+                try:
+                    added, changed, removed = update_watched_items(watcher)
+                    if added or changed or removed:
+                        watcher['write_js'](
+                            watcher['csv_filename'], watcher['js_filename'],
+                            watcher['items'])
+                    stage = watcher['stage']
+                    write_stamp(
+                        watcher['stage_name'],
+                        hash_inputs(stage['inputs'], stage['options']))
+                except Exception:
+                    # Probably a half-finished edit. Keep the last good
+                    # output, and try again on the next change.
+                    print("** {}: not updated:\n{}".format(
+                        os.path.basename(watcher['csv_filename']),
+                        traceback.format_exc()))
+                    continue
+                print("{}: {} ({:.1f} ms)".format(
+                    os.path.basename(watcher['csv_filename']),
+                    describe_item_changes(added, changed, removed),
+                    (time.perf_counter() - start) * 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild the webpage's data files that are out of date.")
+    parser.add_argument(
+        'stages', nargs='*', metavar='STAGE',
+        help="Only build these stages (choices: {}). Default: all.".format(
+            ', '.join(STAGE_FUNCTIONS)))
+    parser.add_argument(
+        '--force', action='store_true',
+        help="Rebuild even if the outputs are up to date.")
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help="Only print which stages are out of date.")
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="After building, keep watching the item CSVs, and rewrite"
+        " their JS files whenever they change.")
+    parser.add_argument(
+        '--interval', type=float, default=0.2, metavar='SECONDS',
+        help="How often --watch checks the CSVs for changes. Default: 0.2")
+    parser.add_argument(
+        '--jobs', type=int, default=1, metavar='N',
+        help="Passed on to messagedata2js.py, which extracts up to N"
+        " languages at once.")
+    # Options for messagedata2js.py. See its --help.
+    for flag in ['binary', 'process', 'shards', 'prune', 'indexed']:
+        parser.add_argument(
+            '--' + flag, action='store_true',
+            help="Pass --{} to messagedata2js.py.".format(flag))
+    parser.add_argument(
+        '--compress', action='append',
+        choices=messagedata2js.COMPRESSION_FORMATS, default=[],
+        metavar='FORMAT', help="Pass --compress to messagedata2js.py.")
+    args = parser.parse_args()
+    for stage_name in args.stages:
+        if stage_name not in STAGE_FUNCTIONS:
+            parser.error("Unknown stage: {} (choices: {})".format(
+                stage_name, ', '.join(STAGE_FUNCTIONS)))
+    stage_names = args.stages or list(STAGE_FUNCTIONS)
+
+    failed_stage_names = build(stage_names, args)
+    if failed_stage_names:
+        raise SystemExit("Build failed for: " + ', '.join(failed_stage_names))
+    if args.watch and not args.dry_run:
+        watch_item_data(args, args.interval)
@@ -0,0 +1,340 @@
+# In: extracted messages (js/messages/<code>.js, from
+# messages/messagedata2js.py), item data and the message lookup files, all
+# loaded once at startup
+# Out: a local HTTP server answering frame queries with JSON, so that
+# tools can get frame counts without loading the webpage:
+#
+# POST /route, with a JSON body like
+#   {"text": "<route text>", "category": "Any%",
+#    "arg_sets": [{"langCode": "usenglish", "character": "mario",
+#                  "boxEndTimingError": 10}]}
+#   -> the route's validation status and frames, same as routeeval.py
+# GET /message?lang=usenglish&id=<message id>&case=<case>&character=mario
+#   &bte=10
+#   -> one message's frames (case is optional, like in itemmessages.csv)
+# GET /languages
+#   -> the loaded language codes
+#
+# Requests are handled on one asyncio event loop. Item frames for every
+# loaded language and character are computed at startup (for the --bte
+# timing errors), and route results are kept by route text and arg sets, so
+# answering a query is mostly lookups and many connections can be kept busy
+# at once.
+
+
+import argparse
+import asyncio
+import collections
+import json
+import math
+import os
+import sys
+import time
+import urllib.parse
+
+import routeeval
+
+
+
+# Largest request body accepted, in bytes.
+MAX_BODY_SIZE = 1 << 20
+# Most header lines accepted in one request.
+MAX_HEADERS = 100
+# Most route results kept, by route text, category and arg sets.
+ROUTE_CACHE_SIZE = 1000
+# Largest box end timing error accepted, in frames. The webpage offers 0 to
+# 15.
+MAX_BOX_END_TIMING_ERROR = 60
+
+STATUS_TEXTS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+}
+
+
+def available_lang_codes(messages_directory):
+    # Language codes with a js/messages/<code>.js file.
+    return sorted(
+        filename[:-len('.js')] for filename in os.listdir(messages_directory)
+        if filename.endswith('.js'))
+
+
+def warm_item_frames(route_data, box_end_timing_errors):
+    # Fill in routeeval's item frames cache for every item, loaded language
+    # and character, so that routes with these timing errors are only sums.
+    for item in route_data['items'].values():
+        for lang_code in route_data['languages']:
+            for character in ['mario', 'luigi']:
+                for box_end_timing_error in box_end_timing_errors:
+                    arg_set = dict(
+                        langCode=lang_code, character=character,
+                        boxEndTimingError=box_end_timing_error)
+                    try:
+                        routeeval.item_frames(item, arg_set, route_data)
+                    except ValueError:
+                        # Reported when a route uses the item.
+                        pass
+
+
+def checked_arg_set(d, route_data):
+    # Check an arg set from a request, and return it as a new dict.
+    if not isinstance(d, dict):
+        raise ValueError("Arg sets must be objects")
+    lang_code = d.get('langCode')
+    if lang_code not in route_data['languages']:
+        raise ValueError("Language not loaded: {}".format(lang_code))
+    character = d.get('character', 'mario')
+    if character not in ['mario', 'luigi']:
+        raise ValueError("Unknown character: {}".format(character))
+    box_end_timing_error = d.get('boxEndTimingError', 10)
+    if isinstance(box_end_timing_error, bool) \
+      or not isinstance(box_end_timing_error, (int, float)):
+        raise ValueError("boxEndTimingError must be a number")
+    # json.loads accepts NaN and Infinity, which json.dumps can't give back
+    # as valid JSON.
+    if not math.isfinite(box_end_timing_error) \
+      or not 0 <= box_end_timing_error <= MAX_BOX_END_TIMING_ERROR:
+        raise ValueError(
+            "boxEndTimingError must be from 0 to {}".format(
+                MAX_BOX_END_TIMING_ERROR))
+    return dict(
+        langCode=lang_code, character=character,
+        boxEndTimingError=box_end_timing_error)
+
+
+def route_query(body, route_data):
+    # POST /route
+    try:
+        query = json.loads(body.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        raise ValueError("Body must be JSON")
+    if not isinstance(query, dict) or not isinstance(query.get('text'), str):
+        raise ValueError("Body must be an object with the route text")
+    category = query.get('category', 'Any%')
+    if category not in routeeval.CATEGORIES:
+        raise ValueError("Unknown category: {}".format(category))
+    arg_sets = query.get('arg_sets', routeeval.DEFAULT_ARG_SETS)
+    if not isinstance(arg_sets, list):
+        raise ValueError("arg_sets must be a list")
+    arg_sets = [checked_arg_set(d, route_data) for d in arg_sets]
+
+    cache = route_data['route_cache']
+    key = (query['text'], category, tuple(
+        (d['langCode'], d['character'], d['boxEndTimingError'])
+        for d in arg_sets))
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    try:
+        result = routeeval.evaluate_route(
+            query['text'], category, arg_sets, route_data)
+    except ValueError as e:
+        # Same as routeeval.py does for a route it can't evaluate.
+        result = dict(
+            name=None, complete=False, status=[str(e)], items=[],
+            totals=None)
+    cache[key] = result
+    if len(cache) > ROUTE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return result
+
+
+def message_query(params, route_data):
+    # GET /message
+    def param(name, default=None):
+        return params.get(name, [default])[0]
+
+    lang_code = param('lang', 'usenglish')
+    message_id = param('id')
+    arg_set = dict(langCode=lang_code, character=param('character', 'mario'))
+    bte = param('bte', '10')
+    try:
+        arg_set['boxEndTimingError'] = float(bte) if '.' in bte else int(bte)
+    except ValueError:
+        raise ValueError("bte must be a number")
+    arg_set = checked_arg_set(arg_set, route_data)
+
+    messages = route_data['languages'][lang_code]
+    if message_id not in messages:
+        raise ValueError("Message {} not found for {}".format(
+            message_id, lang_code))
+    message = messages[message_id]
+    case = param('case')
+    frames = routeeval.message_case_frames(message, arg_set, case)
+    return dict(
+        id=message_id,
+        langCode=lang_code,
+        case=case,
+        character=arg_set['character'],
+        boxEndTimingError=arg_set['boxEndTimingError'],
+        frames=routeeval.message_frames(message, arg_set, case),
+        base=frames['base'],
+        num_boxes=frames['num_boxes'],
+        animation_time=frames.get('animation_time'),
+    )
+
+
+def handle_request(request, route_data):
+    # Returns (HTTP status, JSON-friendly response).
+    url = urllib.parse.urlsplit(request['target'])
+    routes = {
+        '/route': 'POST',
+        '/message': 'GET',
+        '/languages': 'GET',
+    }
+    if url.path not in routes:
+        return 404, dict(error="Unknown path: {}".format(url.path))
+    if request['method'] != routes[url.path]:
+        return 405, dict(error="Use {} for {}".format(
+            routes[url.path], url.path))
+
+    try:
+        if url.path == '/route':
+            return 200, route_query(request['body'], route_data)
+        elif url.path == '/message':
+            return 200, message_query(
+                urllib.parse.parse_qs(url.query), route_data)
+        else:
+            return 200, sorted(route_data['languages'])
+    except ValueError as e:
+        return 400, dict(error=str(e))
+
+
+async def read_request(reader):
+    # Read one HTTP request. Returns a dict with method, target, headers
+    # (lowercase names) and body, or None if the client closed the
+    # connection. Raises ValueError for a malformed request.
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+        raise ValueError("Malformed request line")
+    method, target, version = parts
+
+    headers = dict()
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        line = line.decode('latin-1').strip()
+        if not line:
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise ValueError("Too many headers")
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise ValueError("Malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        content_length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise ValueError("Malformed Content-Length")
+    if content_length < 0 or content_length > MAX_BODY_SIZE:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(content_length)
+
+    # HTTP/1.1 connections stay open unless the client says otherwise.
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection == 'keep-alive' \
+        or (version == 'HTTP/1.1' and connection != 'close')
+    return dict(
+        method=method, target=target, headers=headers, body=body,
+        keep_alive=keep_alive)
+
+
+def write_response(writer, status, response, keep_alive):
+    body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+    writer.write((
+        "HTTP/1.1 {} {}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        "Content-Length: {}\r\n"
+        "Connection: {}\r\n"
+        "\r\n").format(
+            status, STATUS_TEXTS[status], len(body),
+            'keep-alive' if keep_alive else 'close').encode('latin-1'))
+    writer.write(body)
+
+
+async def handle_connection(reader, writer, route_data):
+    # Answer requests on one connection until either side closes it.
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except ValueError as e:
+                status = 413 if "too large" in str(e) else 400
+                write_response(writer, status, dict(error=str(e)), False)
+                await writer.drain()
+                break
+            if request is None:
+                break
+            status, response = handle_request(request, route_data)
+            write_response(writer, status, response, request['keep_alive'])
+            await writer.drain()
+            if not request['keep_alive']:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, route_data):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, route_data),
+        host, port)
+    print("Listening on http://{}:{}".format(host, port), file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Serve frame counts for routes and messages over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument(
+        '--language', action='append', dest='lang_codes', metavar='CODE',
+        help="Language to load. Can be given more than once."
+        " Default: every language in the messages directory.")
+    parser.add_argument(
+        '--bte', type=int, action='append', default=None,
+        help="Box end timing error to precompute item frames for. Can be"
+        " given more than once; others are computed when first asked for."
+        " Default: 10")
+    parser.add_argument(
+        '--messages-dir',
+        help="Directory with the js/messages/<code>.js files.")
+    args = parser.parse_args()
+    for bte in args.bte or []:
+        if not 0 <= bte <= MAX_BOX_END_TIMING_ERROR:
+            parser.error("--bte must be from 0 to {}".format(
+                MAX_BOX_END_TIMING_ERROR))
+
+    messages_directory = args.messages_dir or os.path.join(
+        routeeval.DATA_DIRECTORY, os.pardir, 'js', 'messages')
+    lang_codes = args.lang_codes or available_lang_codes(messages_directory)
+
+    start = time.perf_counter()
+    route_data = routeeval.load_route_data(lang_codes, messages_directory)
+    route_data['route_cache'] = collections.OrderedDict()
+    # Item frames for other timing errors are computed each time, so that
+    # the cache doesn't grow with every timing error that's asked for.
+    route_data['cached_box_end_timing_errors'] = set(args.bte or [10])
+    warm_item_frames(route_data, args.bte or [10])
+    print("Loaded {} in {:.1f} s".format(
+        ', '.join(sorted(route_data['languages'])),
+        time.perf_counter() - start), file=sys.stderr)
+
+    try:
+        asyncio.run(serve(args.host, args.port, route_data))
+    except KeyboardInterrupt:
+        pass
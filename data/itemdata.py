@@ -0,0 +1,227 @@
+# In: itemdetails.csv and itemmessages.csv
+# Out: the parsed item data, shared by the JS converters
+# (itemdetails_csv2js.py, itemmessages_csv2js.py) and the Python route tools
+# (routeeval.py and the ones built on it)
+#
+# Rows are read one at a time. Each file's layout is checked once, up front,
+# instead of every row being defended against separately. Item names,
+# message ids and cases are interned, since the same few hundred strings
+# come up over and over. Requirement strings ("60 stars", "Gateway 1",
+# etc.) can be parsed into Requirement tuples, so that route logic doesn't
+# have to match them against regexes again.
+
+
+import collections
+import csv
+import re
+import sys
+
+
+
+# itemdetails.csv's first columns, as named in its header row.
+ITEM_DETAILS_COLUMNS = [
+    'Item',
+    'Type',
+    'Requirements',
+    'Follows immediately from',
+    'Start location',
+    'End location (if different from start)',
+    'Star name',
+]
+
+# 70 stars, 1 star, etc.
+STARS_REQ_REGEX = re.compile(r'^(\d+) stars?$')
+# Less than 70 stars, Less than 1 star, etc.
+LESS_THAN_STARS_REQ_REGEX = re.compile(r'^Less than (\d+) stars?$')
+# 400 star bits, etc.
+STAR_BIT_REQ_REGEX = re.compile(r'^(\d+) star bits$')
+# Items can follow a star count ("8 stars") or a green star count
+# ("3 green stars") instead of another item.
+GREEN_STARS_REGEX = re.compile(r'^(\d+) green stars?$')
+
+# Message id with a case, like DiskGardenZone_Kinopio000[mario]
+BRACKETS_REGEX = re.compile(r'(.+)\[(.+)\]')
+SKIPPABLE_SUFFIX = '(SKIPPABLE)'
+
+
+# One of an item's requirements, or one of the things it follows. kind is
+# one of:
+# - 'item': a Level or Action item, named by name
+# - 'event': an Event item, named by name
+# - 'stars': at least count stars
+# - 'less_than_stars': fewer than count stars
+# - 'green_stars': count green stars (only in follows)
+# - 'star_bits': count star bits
+# - 'unknown': none of the above
+# text is the string it was parsed from.
+Requirement = collections.namedtuple(
+    'Requirement', ['kind', 'text', 'name', 'count'])
+
+REQUIREMENT_REGEXES = [
+    ('stars', STARS_REQ_REGEX),
+    ('less_than_stars', LESS_THAN_STARS_REQ_REGEX),
+    ('green_stars', GREEN_STARS_REGEX),
+    ('star_bits', STAR_BIT_REQ_REGEX),
+]
+
+
+def parse_requirement(text, items=None):
+    # items is item name -> details, as from read_item_details, for
+    # recognizing item names. Item names take precedence over counts.
+    if items is not None and text in items:
+        kind = 'event' if items[text]['type'] == 'Event' else 'item'
+        return Requirement(kind, text, text, None)
+    for kind, regex in REQUIREMENT_REGEXES:
+        match = regex.match(text)
+        if match:
+            return Requirement(kind, text, None, int(match.group(1)))
+    return Requirement('unknown', text, None, None)
+
+
+def item_requirements(items, key='requirements'):
+    # Item name -> parsed requirements, for each item in items (from
+    # read_item_details). key can also be 'follows'. Lots of items share
+    # requirements, so each distinct string is only parsed once.
+    parsed = dict()
+    result = dict()
+    for item_name, details in items.items():
+        requirements = []
+        for text in details[key]:
+            if text not in parsed:
+                parsed[text] = parse_requirement(text, items)
+            requirements.append(parsed[text])
+        result[item_name] = requirements
+    return result
+
+
+def clean_row(row):
+    # Google Docs LOVES to randomly insert newlines at the start/end of
+    # cells, so defend against that.
+    return [cell.strip() for cell in row]
+
+
+def check_item_details_header(header):
+    columns = clean_row(header[:len(ITEM_DETAILS_COLUMNS)])
+    if columns != ITEM_DETAILS_COLUMNS:
+        raise ValueError(
+            "itemdetails.csv columns should start with: {}; got: {}".format(
+                ', '.join(ITEM_DETAILS_COLUMNS), ', '.join(columns)))
+
+
+def parse_item_details_row(row):
+    # Returns (item name, details) for one row of itemdetails.csv.
+    row = clean_row(row)
+
+    item_name = sys.intern(row[0])
+    item_type = sys.intern(row[1])
+    requirements = [sys.intern(s) for s in row[2].splitlines()]
+    follows = [sys.intern(s) for s in row[3].splitlines()]
+    start_location = row[4] or None
+    end_location = row[5] or None
+    star_name = sys.intern(row[6]) if row[6] else None
+
+    details = dict(
+        requirements = requirements,
+        follows = follows,
+        start_location = start_location,
+        end_location = end_location,
+        star_name = star_name,
+    )
+    # type is a Python keyword, so assign this separately
+    details['type'] = item_type
+
+    return item_name, details
+
+
+def iter_item_details_rows(csv_filename):
+    # The raw rows of itemdetails.csv, in order, after checking the header
+    # and each row's length.
+    with open(csv_filename, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter=',')
+        check_item_details_header(next(reader))
+        for row in reader:
+            if len(row) < len(ITEM_DETAILS_COLUMNS):
+                raise ValueError(
+                    "itemdetails.csv line {}: expected {} columns, got"
+                    " {}".format(
+                        reader.line_num, len(ITEM_DETAILS_COLUMNS),
+                        len(row)))
+            yield row
+
+
+def iter_item_details(csv_filename):
+    # (item name, details) for each row of itemdetails.csv, in order.
+    for row in iter_item_details_rows(csv_filename):
+        yield parse_item_details_row(row)
+
+
+def read_item_details(csv_filename):
+    # Item name -> details. A later row with the same item name wins.
+    return dict(iter_item_details(csv_filename))
+
+
+def parse_message_cell(message):
+    # One message of itemmessages.csv, like AstroDome_Butler023,
+    # Common_TicoFat002[3 digit], HoneyQueenZone_HoneyQueen002(SKIPPABLE)
+    # or {mario: AstroGalaxy_Rosetta056, luigi: AstroGalaxy_Rosetta057}.
+    # Returns a dict with the message id (or a dict of ids by character),
+    # plus the case and skippable if given.
+    d = dict()
+
+    if message.endswith(SKIPPABLE_SUFFIX):
+        message = message[:-len(SKIPPABLE_SUFFIX)]
+        d['skippable'] = True
+
+    match = BRACKETS_REGEX.match(message)
+    if match:
+        m_id = match.group(1)
+        d['case'] = sys.intern(match.group(2))
+    else:
+        m_id = message
+
+    # Check for conditional IDs, such as
+    # {mario: DiskGardenZone_LuigiEvent001,
+    # luigi: DiskGardenZone_LuigiEvent002}
+    if m_id.startswith('{') and m_id.endswith('}'):
+        cases = dict()
+        for s in m_id[1:-1].split(','):
+            k, v = [x.strip() for x in s.split(':')]
+            cases[sys.intern(k)] = sys.intern(v)
+        d['id'] = cases
+    else:
+        d['id'] = sys.intern(m_id)
+
+    return d
+
+
+def parse_item_messages_row(row):
+    # Returns (item name, messages) for one row of itemmessages.csv.
+    row = clean_row(row)
+    messages = []
+    for message in row[1:]:
+        if message == "" or message == "<None>":
+            # Done with this item
+            break
+        messages.append(parse_message_cell(message))
+    return sys.intern(row[0]), messages
+
+
+def iter_item_messages_rows(csv_filename):
+    # The raw rows of itemmessages.csv, in order, skipping blank lines.
+    # This file has no header row.
+    with open(csv_filename, 'r', newline='') as f:
+        for row in csv.reader(f, delimiter=','):
+            if not row:
+                continue
+            yield row
+
+
+def iter_item_messages(csv_filename):
+    # (item name, messages) for each row of itemmessages.csv, in order.
+    for row in iter_item_messages_rows(csv_filename):
+        yield parse_item_messages_row(row)
+
+
+def read_item_messages(csv_filename):
+    # Item name -> messages. A later row with the same item name wins.
+    return dict(iter_item_messages(csv_filename))
@@ -1,38 +1,123 @@
-import csv
+import collections
 import json
+import os
 
+from itemdata import item_requirements, read_item_details
 
 
-if __name__ == '__main__':
-    
-    items = dict()
-    reader = csv.reader(open('itemdetails.csv', 'r'), delimiter=',')
+
+def compile_item_graph(items):
+    # Compile item details into a requirement graph, so that route
+    # processing doesn't have to interpret requirement strings. Items get
+    # integer ids in the same order as items, and everything else is lists
+    # indexed by id:
+    # - requirements: ids of the items that the item requires
+    # - min_stars: the star count that the item requires, or 0
+    # - less_than_stars: the star count that the item must be done before,
+    #   or None
+    # - unfulfillable: True if the item has a requirement that's not an
+    #   item or a star count (or star bits, which aren't checked)
+    # - following: ids of the items that follow the item
+    # Plus following_star_counts and following_green_star_counts, which map
+    # counts to ids of the items that follow them, and topological_order,
+    # the item ids with each item after the items it requires or follows.
     
-    # Skip header row
-    next(reader)
+    names = list(items)
+    ids = dict((name, item_id) for item_id, name in enumerate(names))
+    graph = dict(
+        names=names,
+        types=[items[name]['type'] for name in names],
+        requirements=[],
+        min_stars=[],
+        less_than_stars=[],
+        unfulfillable=[],
+        following=[[] for name in names],
+        following_star_counts=collections.OrderedDict(),
+        following_green_star_counts=collections.OrderedDict(),
+    )
     
-    for row in reader:
-        # Google Docs LOVES to randomly insert newlines at the start/end of
-        # cells, so defend against that.
-        row = [cell.strip() for cell in row]
+    requirements = item_requirements(items, 'requirements')
+    follows = item_requirements(items, 'follows')
+    for name in names:
+        required_ids = []
+        min_stars = 0
+        less_than_stars = None
+        unfulfillable = False
+        for req in requirements[name]:
+            if req.name is not None:
+                required_ids.append(ids[req.name])
+            elif req.kind == 'stars':
+                min_stars = max(min_stars, req.count)
+            elif req.kind == 'less_than_stars':
+                if less_than_stars is None or req.count < less_than_stars:
+                    less_than_stars = req.count
+            elif req.kind != 'star_bits':
+                unfulfillable = True
+        graph['requirements'].append(required_ids)
+        graph['min_stars'].append(min_stars)
+        graph['less_than_stars'].append(less_than_stars)
+        graph['unfulfillable'].append(unfulfillable)
         
-        item_name = row[0]
-        item_type = row[1]
-        requirements = row[2].splitlines() if row[2] else []
-        follows = row[3].splitlines() if row[3] else []
-        start_location = row[4] if row[4] else None
-        end_location = row[5] if row[5] else None
-        star_name = row[6] if row[6] else None
-        
-        items[item_name] = dict(
-            requirements = requirements,
-            follows = follows,
-            start_location = start_location,
-            end_location = end_location,
-            star_name = star_name,
-        )
-        # type is a Python keyword, so assign this separately
-        items[item_name]['type'] = item_type
+        for follows_req in follows[name]:
+            if follows_req.name is not None:
+                graph['following'][ids[follows_req.name]].append(ids[name])
+            elif follows_req.kind == 'stars':
+                graph['following_star_counts'].setdefault(
+                    follows_req.count, []).append(ids[name])
+            elif follows_req.kind == 'green_stars':
+                graph['following_green_star_counts'].setdefault(
+                    follows_req.count, []).append(ids[name])
+                
+    # Topological order, going through ready items in id order.
+    num_prerequisites = [len(set(reqs)) for reqs in graph['requirements']]
+    dependents = [[] for name in names]
+    for item_id, reqs in enumerate(graph['requirements']):
+        for req_id in set(reqs):
+            dependents[req_id].append(item_id)
+    for item_id, following_ids in enumerate(graph['following']):
+        for following_id in following_ids:
+            num_prerequisites[following_id] += 1
+            dependents[item_id].append(following_id)
+    ready = [
+        item_id for item_id, count in enumerate(num_prerequisites)
+        if count == 0]
+    order = []
+    while ready:
+        item_id = min(ready)
+        ready.remove(item_id)
+        order.append(item_id)
+        for dependent_id in dependents[item_id]:
+            num_prerequisites[dependent_id] -= 1
+            if num_prerequisites[dependent_id] == 0:
+                ready.append(dependent_id)
+    if len(order) < len(names):
+        raise ValueError(
+            "These items require or follow each other in a cycle: "
+            + ', '.join(
+                names[item_id] for item_id, count
+                in enumerate(num_prerequisites) if count > 0))
+    graph['topological_order'] = order
+    
+    return graph
+    
+    
+def write_item_details_js(csv_filename, js_filename, items=None):
+    # Write the item details and their compiled graph as a JS file. The
+    # file is written under a temporary name and then renamed into place,
+    # so the webpage never sees a half-written file. items can be given if
+    # the CSV has already been read.
+    if items is None:
+        items = read_item_details(csv_filename)
+    graph = compile_item_graph(items)
+    
+    temp_filename = js_filename + '.tmp'
+    with open(temp_filename, 'w') as js_file:
+        js_file.write("window.itemDetails = " + json.dumps(items))
+        js_file.write(";\nwindow.itemGraph = " + json.dumps(graph))
+    os.replace(temp_filename, js_filename)
+
+
+
+if __name__ == '__main__':
     
-    with open('../js/itemdetails.js', 'w') as js_file:
-        js_file.write("window.itemDetails = " + json.dumps(items, js_file))
\ No newline at end of file
+    write_item_details_js('itemdetails.csv', '../js/itemdetails.js')
@@ -0,0 +1,213 @@
+# In: fixture parameters (see bmgfixture.py), and optionally a results file
+# from an earlier run
+# Out: timings of each step of the message data build, run on a synthetic
+# message.bmg/messageid.tbl pair, optionally saved as JSON or compared
+# against earlier results
+#
+# Run from this directory, like messagedata2js.py.
+
+
+import argparse
+import collections
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import bmgfixture
+import messagedata2js
+
+sys.path.insert(0, os.pardir)
+from itemdata import read_item_details, read_item_messages
+
+
+
+def time_call(func, repeat):
+    # Best (smallest) time of several calls, in seconds. Anything func
+    # prints is discarded, so that the parser's progress output doesn't
+    # swamp the results.
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def make_benchmarks(fixture_directory, messages_list, lookup):
+    # Benchmark name -> (function to time, amount of work, work unit).
+    # The amount of work is used to report throughput.
+
+    bmg_filename = os.path.join(fixture_directory, 'message.bmg')
+    tbl_filename = os.path.join(fixture_directory, 'messageid.tbl')
+    num_bytes = os.path.getsize(bmg_filename) + os.path.getsize(tbl_filename)
+    num_messages = len(messages_list)
+
+    def parse_disc_files():
+        with open(bmg_filename, 'rb') as bmg, open(tbl_filename, 'rb') as tbl:
+            messagedata2js.read_messages_from_disc_files(bmg, tbl)
+
+    def parse_mapped_disc_files():
+        with open(bmg_filename, 'rb') as bmg, open(tbl_filename, 'rb') as tbl:
+            messagedata2js.read_messages_from_mapped_disc_files(bmg, tbl)
+
+    messages_js_filename = os.path.join(fixture_directory, 'usenglish.js')
+
+    def messages_js():
+        messagedata2js.write_messages_js(
+            messages_js_filename, 'usenglish', messages_list)
+
+    def messages_js_gz():
+        messagedata2js.write_messages_js(
+            messages_js_filename, 'usenglish', messages_list, ('gz',))
+
+    def messages_binary():
+        messagedata2js.encode_binary_messages(messages_list)
+
+    def process_messages():
+        # The pipeline adds fields to the messages, so give it fresh ones.
+        fresh_messages = [
+            dict(id=m['id'], content=m['content']) for m in messages_list
+        ]
+        for _ in messagedata2js.process_messages(
+          'usenglish', fresh_messages, lookup):
+            pass
+
+    item_details_filename = os.path.join(os.pardir, 'itemdetails.csv')
+    item_messages_filename = os.path.join(os.pardir, 'itemmessages.csv')
+
+    benchmarks = collections.OrderedDict()
+    benchmarks['parse_disc_files'] = (parse_disc_files, num_bytes, 'B')
+    benchmarks['parse_mapped_disc_files'] = (
+        parse_mapped_disc_files, num_bytes, 'B')
+    benchmarks['make_lookup'] = (messagedata2js.make_lookup, 1, 'call')
+    benchmarks['make_lookup_uncached'] = (
+        lambda: messagedata2js.make_lookup(use_cache=False), 1, 'call')
+    benchmarks['messages_js'] = (messages_js, num_messages, 'msg')
+    benchmarks['messages_js_gz'] = (messages_js_gz, num_messages, 'msg')
+    benchmarks['messages_binary'] = (messages_binary, num_messages, 'msg')
+    benchmarks['process_messages'] = (process_messages, num_messages, 'msg')
+    benchmarks['item_details_csv'] = (
+        lambda: read_item_details(item_details_filename),
+        os.path.getsize(item_details_filename), 'B')
+    benchmarks['item_messages_csv'] = (
+        lambda: read_item_messages(item_messages_filename),
+        os.path.getsize(item_messages_filename), 'B')
+    return benchmarks
+
+
+def format_throughput(amount, unit, seconds):
+    rate = amount / seconds
+    if unit == 'B':
+        return "{:.2f} MB/s".format(rate / 1e6)
+    return "{:.0f} {}/s".format(rate, unit)
+
+
+def run_benchmarks(benchmarks, names, repeat):
+    # Returns benchmark name -> best time in seconds, printing a line for
+    # each benchmark as it finishes.
+    results = collections.OrderedDict()
+    for name in names:
+        func, amount, unit = benchmarks[name]
+        seconds = time_call(func, repeat)
+        results[name] = seconds
+        print("{:<26}{:>10.2f} ms  {}".format(
+            name, seconds * 1000, format_throughput(amount, unit, seconds)))
+    return results
+
+
+def compare_results(results, baseline, tolerance):
+    # Print how each result compares to the baseline. Returns the names of
+    # benchmarks that got slower by more than the tolerance (a fraction).
+    regressions = []
+    print()
+    print("Compared to baseline:")
+    for name, seconds in results.items():
+        if name not in baseline['results']:
+            continue
+        change = seconds / baseline['results'][name] - 1
+        flag = ""
+        if change > tolerance:
+            flag = "  ** slower"
+            regressions.append(name)
+        print("{:<26}{:>+9.1f}%{}".format(name, change * 100, flag))
+    return regressions
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Time the message data build on synthetic disc files.")
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--text-length', type=int, default=80)
+    parser.add_argument('--escape-density', type=float, default=0.05)
+    parser.add_argument('--box-break-rate', type=float, default=0.2)
+    parser.add_argument('--gap-rate', type=float, default=0.02)
+    parser.add_argument('--null-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help="Run each benchmark this many times and keep the best time.")
+    parser.add_argument(
+        '--only', action='append', metavar='NAME',
+        help="Only run this benchmark. Can be given more than once.")
+    parser.add_argument(
+        '--save', metavar='FILE', help="Save the results to a JSON file.")
+    parser.add_argument(
+        '--compare', metavar='FILE',
+        help="Compare with results saved by --save, and exit with an error"
+        " if any benchmark got slower by more than --tolerance.")
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help="Allowed slowdown when comparing, as a fraction."
+        " Default: 0.2")
+    args = parser.parse_args()
+
+    fixture_params = collections.OrderedDict([
+        ('num_messages', args.messages),
+        ('text_length', args.text_length),
+        ('escape_density', args.escape_density),
+        ('box_break_rate', args.box_break_rate),
+        ('gap_rate', args.gap_rate),
+        ('null_rate', args.null_rate),
+        ('seed', args.seed),
+    ])
+
+    with tempfile.TemporaryDirectory() as fixture_directory:
+        messages_list = bmgfixture.write_fixture(
+            fixture_directory, **fixture_params)
+        benchmarks = make_benchmarks(
+            fixture_directory, messages_list, messagedata2js.make_lookup())
+
+        names = args.only or list(benchmarks)
+        for name in names:
+            if name not in benchmarks:
+                parser.error("Unknown benchmark: {} (choices: {})".format(
+                    name, ', '.join(benchmarks)))
+
+        print("Fixture: {}".format(', '.join(
+            "{}={}".format(k, v) for k, v in fixture_params.items())))
+        results = run_benchmarks(benchmarks, names, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(
+                dict(fixture=fixture_params, results=results), f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if baseline['fixture'] != fixture_params:
+            print("** Warning: the baseline used a different fixture: "
+                  + json.dumps(baseline['fixture']))
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            raise SystemExit(
+                "Slower than baseline: " + ', '.join(regressions))
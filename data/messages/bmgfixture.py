@@ -0,0 +1,278 @@
+# In: fixture parameters (message count, text length, escape density, etc.)
+# Out: a synthetic message.bmg / messageid.tbl pair laid out the same way as
+# the SMG1 disc files, so the extractor can be run and timed without any
+# real (copyrighted) disc data.
+
+
+import argparse
+import collections
+import json
+import os
+import random
+import struct
+
+
+
+# Characters to build message text from. Includes newlines and some
+# non-ASCII characters so that the UTF-16 decoding gets exercised.
+TEXT_CHARS = (
+    "abcdefghijklmnopqrstuvwxyz" "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "0123456789" "      " ".,!?'-" "\n"
+    "éèàüöñç" "ぁあいうえおかきくけこ" "星"
+)
+
+# Zone prefixes to build message ids from.
+ID_PREFIXES = [
+    'AstroGalaxy', 'AstroDome', 'DiskGardenZone', 'HeavensDoorGalaxy',
+    'Common', 'System', 'GalaxyName', 'ScenarioName',
+]
+
+
+def read_lookup_ids():
+    # Message ids that the lookup files in this directory give special
+    # handling: forced slow text, cutscene animation times, and numbers and
+    # names. Naming some fixture messages after these makes the fixture
+    # exercise that handling too.
+    # Returns (ids to use first, numbers/names ids, ids referred to by
+    # numbers/names).
+    special_ids = []
+    numbers_names = dict()
+    if os.path.exists('forced-slow-messages.txt'):
+        with open('forced-slow-messages.txt', 'r') as f:
+            special_ids.extend(line.strip() for line in f if line.strip())
+    if os.path.exists('animation-times.txt'):
+        with open('animation-times.txt', 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    special_ids.append(line.split('=')[0].strip())
+    if os.path.exists('number-name-specifics.json'):
+        with open('number-name-specifics.json', 'r') as f:
+            numbers_names = json.load(f)
+        special_ids.extend(numbers_names.keys())
+
+    referenced_ids = []
+    for d in numbers_names.values():
+        if d['_type'] == 'message':
+            referenced_ids.extend(
+                v for k, v in d.items() if not k.startswith('_')
+            )
+
+    # Remove duplicates, keeping the order.
+    special_ids = list(collections.OrderedDict.fromkeys(special_ids))
+    return special_ids, numbers_names, referenced_ids
+
+
+def make_escape(rng):
+    # Return the data bytes of a random escape sequence (everything after
+    # the 00 1A and the size byte). Some of these purposely contain 00 00 and
+    # 00 1A byte pairs, as real escape data can.
+    kind = rng.randrange(9)
+    if kind == 0:
+        # Text pause
+        return b'\x01\x00\x00\x00' + bytes([rng.choice([10, 15, 30, 60])])
+    elif kind == 1:
+        # Icon
+        return b'\x03\x00' + bytes([rng.choice([0, 1, 7, 11, 17])]) + b'\x00'
+    elif kind == 2:
+        # Text size
+        return rng.choice([b'\x04\x00\x00', b'\x04\x00\x02'])
+    elif kind == 3:
+        # Player name
+        return rng.choice([b'\x05\x00\x00\x00\x00', b'\x05\x00\x00\x01\x00'])
+    elif kind == 4:
+        # Number
+        return b'\x06\x01\x00\x00\x00\x1A\x00\x00'
+    elif kind == 5:
+        # Race time
+        return b'\x09\x00\x05'
+    elif kind == 6:
+        # Furigana: kanji count, then the reading in UTF-16, then a zero byte
+        reading = ''.join(rng.choice("あいうえお") for _ in range(2))
+        return b'\xFF\x00\x02\x01' + reading.encode('utf-16be') + b'\x00'
+    elif kind == 7:
+        # Voice audio
+        return b'\x02\x00\x00\x00\x53\x00'
+    else:
+        # Text color
+        return b'\xFF\x00\x00' + bytes([rng.randrange(7)])
+
+
+def make_content(rng, text_length, escape_density, box_break_rate):
+    # Return the message content in the same format as
+    # read_messages_from_disc_files: a list of text strings and escape
+    # sequences (as lists of byte values).
+    content = []
+    text = ""
+    for _ in range(text_length):
+        if rng.random() < escape_density:
+            if rng.random() < box_break_rate:
+                escape_bytes = b'\x01\x00\x01\x00'
+            else:
+                escape_bytes = make_escape(rng)
+            if text != "":
+                content.append(text)
+                text = ""
+            content.append([b for b in escape_bytes])
+            if escape_bytes == b'\x01\x00\x01\x00':
+                # Box breaks are normally followed by a newline.
+                text = "\n"
+        else:
+            text += rng.choice(TEXT_CHARS)
+    if text != "":
+        content.append(text)
+    return content
+
+
+def encode_content(content):
+    # The inverse of the DAT1 decoding: content list -> message bytes,
+    # including the null character at the end.
+    parts = []
+    for item in content:
+        if type(item) == str:
+            parts.append(item.encode('utf-16be'))
+        else:
+            parts.append(b'\x00\x1A' + bytes([len(item) + 3]) + bytes(item))
+    parts.append(b'\x00\x00')
+    return b''.join(parts)
+
+
+def make_fixture(
+    num_messages=2000, text_length=80, escape_density=0.05,
+    box_break_rate=0.2, gap_rate=0.02, null_rate=0.01, seed=0):
+    # Return (bmg bytes, tbl bytes, expected messages list). The expected
+    # messages list is what read_messages_from_disc_files should return for
+    # these files.
+    rng = random.Random(seed)
+
+    special_ids, numbers_names, referenced_ids = read_lookup_ids()
+
+    messages = []
+    for i in range(num_messages):
+        if i < len(special_ids):
+            # Use the ids that the lookup files have special handling for.
+            message_id = special_ids[i]
+        else:
+            message_id = "{}_Fixture{:05d}".format(
+                ID_PREFIXES[i % len(ID_PREFIXES)], i
+            )
+        if rng.random() < null_rate and message_id not in numbers_names:
+            content = None
+        else:
+            length = max(0, int(rng.gauss(text_length, text_length / 3)))
+            if message_id in numbers_names:
+                # Plain text plus the number/name. Other escapes, like
+                # player names, would give the message a second dimension
+                # of cases.
+                content = make_content(rng, length, 0, 0)
+                content.append([6, 1, 0, 0, 0, 0, 0, 0])
+            else:
+                content = make_content(
+                    rng, length, escape_density, box_break_rate
+                )
+        messages.append(dict(id=message_id, content=content))
+
+    # Player name escapes refer to these messages, and number/name escapes
+    # can refer to other messages too.
+    for message_id, name in [
+      ('System_PlayerName000', "Mario"),
+      ('System_PlayerName001', "Maaario"),
+      ('System_PlayerName100', "Luigi"),
+      ('System_PlayerName101', "Luuuigi")]:
+        messages.append(dict(id=message_id, content=[name]))
+    for message_id in referenced_ids:
+        name = ''.join(rng.choice(TEXT_CHARS[:52]) for _ in range(10))
+        messages.append(dict(id=message_id, content=[name]))
+    num_messages = len(messages)
+
+    # DAT1 contents. Offset 0 means "no content", so start with a null char.
+    dat1 = bytearray(b'\x00\x00')
+    content_offsets = []
+    for m in messages:
+        if m['content'] is None:
+            content_offsets.append(0)
+            continue
+        if rng.random() < gap_rate:
+            # Extra bytes between the end of one message and the start of
+            # the next.
+            dat1 += b'\x00' * rng.choice([1, 2, 3, 4])
+        content_offsets.append(len(dat1))
+        dat1 += encode_content(m['content'])
+    # Pad to a multiple of 32 bytes like the real file.
+    dat1 += b'\x00' * (-(len(dat1) + 8) % 32)
+
+    # INF1 section: 8 byte items (content offset + attributes).
+    inf1_item_size = 8
+    inf1_items = b''.join(
+        struct.pack('>I4x', offset) for offset in content_offsets
+    )
+    inf1_size = 16 + len(inf1_items)
+    inf1_padding = -inf1_size % 32
+    inf1_size += inf1_padding
+    inf1 = (
+        b'INF1'
+        + struct.pack('>IHH4x', inf1_size, num_messages, inf1_item_size)
+        + inf1_items + b'\x00' * inf1_padding
+    )
+
+    dat1 = b'DAT1' + struct.pack('>I', len(dat1) + 8) + bytes(dat1)
+
+    header = b'MESGbmg1' + struct.pack(
+        '>II', 0x20 + len(inf1) + len(dat1), 2
+    )
+    header += b'\x00' * (0x20 - len(header))
+    bmg = header + inf1 + dat1
+
+    # TBL: message count, unknown bytes, (index, id offset) pairs, then the
+    # null-terminated message ids.
+    ids = [m['id'].encode('ascii') + b'\x00' for m in messages]
+    id_offset = 0
+    pairs = []
+    for i, id_bytes in enumerate(ids):
+        pairs.append(struct.pack('>II', i, id_offset))
+        id_offset += len(id_bytes)
+    tbl = (
+        struct.pack('>I', num_messages) + b'\x00' * 0x24
+        + b''.join(pairs) + b''.join(ids)
+    )
+
+    return bmg, tbl, messages
+
+
+def write_fixture(directory, **kwargs):
+    # Write message.bmg and messageid.tbl into directory, and return the
+    # expected messages list.
+    bmg, tbl, messages = make_fixture(**kwargs)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'message.bmg'), 'wb') as f:
+        f.write(bmg)
+    with open(os.path.join(directory, 'messageid.tbl'), 'wb') as f:
+        f.write(tbl)
+    return messages
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic message.bmg/messageid.tbl pair.")
+    parser.add_argument('directory')
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--text-length', type=int, default=80)
+    parser.add_argument('--escape-density', type=float, default=0.05)
+    parser.add_argument('--box-break-rate', type=float, default=0.2)
+    parser.add_argument('--gap-rate', type=float, default=0.02)
+    parser.add_argument('--null-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    write_fixture(
+        args.directory,
+        num_messages=args.messages,
+        text_length=args.text_length,
+        escape_density=args.escape_density,
+        box_break_rate=args.box_break_rate,
+        gap_rate=args.gap_rate,
+        null_rate=args.null_rate,
+        seed=args.seed,
+    )
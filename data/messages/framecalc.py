@@ -0,0 +1,247 @@
+# In: message boxes from messagedata2js's process_messages pipeline
+# Out: box lengths and frames for every message, language and box end timing
+# error, computed in batches with NumPy instead of one box at a time.
+#
+# The results are the same as compute_box_length / compute_base_message_frames
+# in messagedata2js.py and MessageUtil.messageFrames in the webpage, including
+# the 32-bit float rounding of box lengths.
+
+
+import argparse
+import csv
+
+import numpy as np
+
+import messagedata2js
+
+
+
+def box_cases(boxes):
+    # Sorted list of cases that a message's boxes depend on, or [None] if
+    # the message doesn't depend on any case. The '_placeholder' case is only
+    # for display, so it's left out.
+    cases = set()
+    for box in boxes:
+        if box.cases is not None:
+            cases.update(box.cases)
+    cases.discard('_placeholder')
+    if not cases:
+        return [None]
+    return sorted(cases)
+
+
+def new_frame_table():
+    # A frame table is a dict of columns. Row columns have one entry per
+    # (language, message, case) combination; box columns have one entry per
+    # box of each row, with rows' boxes stored contiguously.
+    return dict(
+        lang_codes=[],
+        alpha_reqs=[],
+        fade_rates=[],
+        # Row columns
+        ids=[],
+        cases=[],
+        speed_index=[],
+        first_box=[],
+        num_boxes=[],
+        forced_slow=[],
+        animation_time=[],
+        # Box columns
+        box_chars=[],
+        box_pause=[],
+    )
+
+
+def add_language(table, lang_code, processed_messages, lookup):
+    # Add rows for one language's messages to the table. processed_messages
+    # only needs to have boxes filled in (process_messages with
+    # complete=False); null messages are skipped.
+
+    speed_index = len(table['lang_codes'])
+    table['lang_codes'].append(lang_code)
+    speeds = lookup['languageSpeeds'][lang_code]
+    table['alpha_reqs'].append(speeds['alphaReq'])
+    table['fade_rates'].append(speeds['fadeRate'])
+
+    forced_slow_ids = set(lookup['forcedSlow'])
+    animation_times = lookup['animationTimes']
+    box_chars = table['box_chars']
+    box_pause = table['box_pause']
+
+    for m in processed_messages:
+        boxes = m['boxes']
+        if not boxes:
+            continue
+        forced_slow = m['id'] in forced_slow_ids
+        animation_time = animation_times.get(m['id'], 0)
+
+        for case in box_cases(boxes):
+            table['ids'].append(m['id'])
+            table['cases'].append(case)
+            table['speed_index'].append(speed_index)
+            table['first_box'].append(len(box_chars))
+            table['num_boxes'].append(len(boxes))
+            table['forced_slow'].append(forced_slow)
+            table['animation_time'].append(animation_time)
+
+            for box in boxes:
+                box_chars.append(box.chars[box.case_index(case)])
+                box_pause.append(box.pause_length)
+
+
+def pack_table(table):
+    # Convert the table's columns to NumPy arrays, and add the per-box
+    # columns needed for the frame computations.
+
+    packed = dict(
+        lang_codes=list(table['lang_codes']),
+        ids=list(table['ids']),
+        cases=list(table['cases']),
+        alpha_reqs=np.array(table['alpha_reqs'], dtype=np.float32),
+        fade_rates=np.array(table['fade_rates'], dtype=np.float32),
+        speed_index=np.array(table['speed_index'], dtype=np.intp),
+        first_box=np.array(table['first_box'], dtype=np.intp),
+        num_boxes=np.array(table['num_boxes'], dtype=np.int64),
+        forced_slow=np.array(table['forced_slow'], dtype=bool),
+        animation_time=np.array(table['animation_time'], dtype=np.int64),
+        box_chars=np.array(table['box_chars'], dtype=np.int64),
+        box_pause=np.array(table['box_pause'], dtype=np.int64),
+    )
+
+    # Which row each box belongs to, and whether it's the row's first box.
+    num_rows = len(packed['ids'])
+    packed['box_row'] = np.repeat(
+        np.arange(num_rows, dtype=np.intp), packed['num_boxes'])
+    packed['box_is_first'] = np.zeros(len(packed['box_chars']), dtype=bool)
+    packed['box_is_first'][packed['first_box']] = True
+    return packed
+
+
+def compute_box_lengths(box_chars, box_pause, alpha_req, fade_rate):
+    # Box length = pause length + floor(alpha req / fade rate), where
+    # alpha req = chars * alpha req per char + 1, all in 32-bit float like
+    # the game. Arguments broadcast against each other, so alpha_req and
+    # fade_rate can be per box, or have an extra leading axis to compute
+    # several speeds at once.
+    f32 = np.float32
+    alpha = box_chars.astype(f32) * alpha_req.astype(f32) + f32(1)
+    char_fade_length = np.floor(alpha / fade_rate.astype(f32))
+    return char_fade_length.astype(np.int64) + box_pause
+
+
+def compute_base_frames(box_lengths, packed):
+    # Base frames of every row, from its box lengths (the last axis of
+    # box_lengths).
+
+    # Holding A speeds up text scroll by 3x. After the first box, the A
+    # press on the previous box required you to release A, so the first
+    # 10 length units go at slow speed.
+    first_box_frames = -(-box_lengths // 3)
+    later_box_frames = np.where(
+        box_lengths > 10, 10 + -(-(box_lengths - 10) // 3), box_lengths)
+    box_frames = np.where(
+        packed['box_is_first'], first_box_frames, later_box_frames)
+
+    # Forced slow messages go at 1 frame per length unit.
+    box_forced_slow = packed['forced_slow'][packed['box_row']]
+    box_frames = np.where(box_forced_slow, box_lengths, box_frames)
+
+    # 2 frame delay at the end of each box.
+    box_frames = box_frames + 2
+
+    if box_frames.shape[-1] == 0:
+        return box_frames
+    return np.add.reduceat(box_frames, packed['first_box'], axis=-1)
+
+
+def compute_frames(base_frames, packed, box_end_timing_errors):
+    # Total frames for each row and box end timing error value. The result
+    # has base_frames' shape plus a trailing axis for the timing errors.
+    # Like the webpage, timing errors of 0 or less add nothing.
+    box_end_timing_errors = np.maximum(np.asarray(box_end_timing_errors), 0)
+    frames = (
+        base_frames[..., np.newaxis]
+        + packed['num_boxes'][:, np.newaxis] * box_end_timing_errors
+    )
+    # Cutscene animations have to play out entirely before advancing.
+    return np.maximum(frames, packed['animation_time'][:, np.newaxis])
+
+
+def compute_frame_table(packed, box_end_timing_errors, all_speeds=False):
+    # Compute box lengths, base frames and total frames for every row.
+    #
+    # By default each row uses its own language's speed. With all_speeds,
+    # every row is computed with every language's speed instead, and the
+    # results get a leading axis indexed like packed['lang_codes'].
+
+    if all_speeds:
+        alpha_req = packed['alpha_reqs'][:, np.newaxis]
+        fade_rate = packed['fade_rates'][:, np.newaxis]
+    else:
+        box_speed = packed['speed_index'][packed['box_row']]
+        alpha_req = packed['alpha_reqs'][box_speed]
+        fade_rate = packed['fade_rates'][box_speed]
+
+    box_lengths = compute_box_lengths(
+        packed['box_chars'], packed['box_pause'], alpha_req, fade_rate)
+    base_frames = compute_base_frames(box_lengths, packed)
+    frames = compute_frames(base_frames, packed, box_end_timing_errors)
+    return dict(
+        box_lengths=box_lengths,
+        base_frames=base_frames,
+        frames=frames,
+    )
+
+
+def write_frame_table_csv(filename, packed, results, box_end_timing_errors):
+    # One row per (language, message, case), with base frames, box count,
+    # and total frames for each box end timing error.
+    speed_lang_codes = packed['lang_codes']
+    with open(filename, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(
+            ['language', 'id', 'case', 'boxes', 'base']
+            + ['frames (BTE {})'.format(bte) for bte in box_end_timing_errors]
+        )
+        base_frames = results['base_frames'].tolist()
+        frames = results['frames'].tolist()
+        num_boxes = packed['num_boxes'].tolist()
+        speed_index = packed['speed_index'].tolist()
+        for i, message_id in enumerate(packed['ids']):
+            writer.writerow(
+                [speed_lang_codes[speed_index[i]], message_id,
+                 packed['cases'][i] or '', num_boxes[i], base_frames[i]]
+                + frames[i]
+            )
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Compute frame tables for every extracted message.")
+    parser.add_argument(
+        '--max-bte', type=int, default=15,
+        help="Compute box end timing errors from 0 up to this many frames.")
+    parser.add_argument(
+        '--out', default='frametable.csv',
+        help="CSV file to write the table to.")
+    args = parser.parse_args()
+
+    lookup = messagedata2js.make_lookup()
+    languages = messagedata2js.read_language_files()
+
+    table = new_frame_table()
+    for language in languages:
+        messages_list = messagedata2js.read_language_messages(language)
+        add_language(
+            table, language['code'],
+            messagedata2js.process_messages(
+                language['code'], messages_list, lookup, complete=False),
+            lookup,
+        )
+    packed = pack_table(table)
+
+    box_end_timing_errors = np.arange(args.max_bte + 1)
+    results = compute_frame_table(packed, box_end_timing_errors)
+    write_frame_table_csv(args.out, packed, results, box_end_timing_errors)
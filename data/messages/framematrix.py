@@ -0,0 +1,275 @@
+# In: the messages of every language in language-files.txt (from
+# messagedata2js.py's cache, or else the disc files), and optionally route
+# text files (like sampleroute120.txt)
+# Out: frames for every message id, language and character as a dense
+# matrix, saved as .npy and CSV, plus the same rolled up per route item
+# (from itemmessages.csv) and per given route, to see which language is
+# fastest for what
+#
+# The frames of all languages are computed in one batch, with framecalc.py.
+# Run from this directory, like messagedata2js.py.
+
+
+import argparse
+import collections
+import concurrent.futures
+import csv
+import itertools
+import os
+import sys
+
+import numpy as np
+
+import framecalc
+import messagedata2js
+
+sys.path.insert(0, os.pardir)
+import routeeval
+from itemdata import read_item_messages
+
+
+
+CHARACTERS = ['mario', 'luigi']
+
+
+def language_table(language, use_mmap=False):
+    # Frame table rows (see framecalc.new_frame_table) for one language.
+    lookup = messagedata2js.make_lookup()
+    messages_list = messagedata2js.read_language_messages(language, use_mmap)
+    table = framecalc.new_frame_table()
+    framecalc.add_language(
+        table, language['code'],
+        messagedata2js.process_messages(
+            language['code'], messages_list, lookup, complete=False),
+        lookup,
+    )
+    return table
+
+
+def merge_tables(tables):
+    # Combine frame tables of different languages into one, as if their
+    # languages had all been added to the same table.
+    merged = framecalc.new_frame_table()
+    for table in tables:
+        speed_offset = len(merged['lang_codes'])
+        box_offset = len(merged['box_chars'])
+        for key in ['lang_codes', 'alpha_reqs', 'fade_rates', 'ids', 'cases',
+                    'num_boxes', 'forced_slow', 'animation_time',
+                    'box_chars', 'box_pause']:
+            merged[key].extend(table[key])
+        merged['speed_index'].extend(
+            i + speed_offset for i in table['speed_index'])
+        merged['first_box'].extend(
+            i + box_offset for i in table['first_box'])
+    return merged
+
+
+def frame_lookup(packed, box_end_timing_error):
+    # Compute frames for every (language, message, case) row of the packed
+    # table in one batch. Returns a dict from (language code, message id,
+    # case) to frames.
+    results = framecalc.compute_frame_table(packed, [box_end_timing_error])
+    frames = results['frames'][:, 0].tolist()
+    lang_codes = [packed['lang_codes'][i] for i in packed['speed_index']]
+    return dict(zip(zip(lang_codes, packed['ids'], packed['cases']), frames))
+
+
+def message_rows(packed):
+    # (message id, case) for each row of the message matrix, in the order
+    # the ids first appear. Every id gets a row for no particular case,
+    # where characters' cases go by the column's character. Other cases
+    # (like which galaxy a number/name is for) get their own rows.
+    other_cases = collections.OrderedDict()
+    for message_id, case in zip(packed['ids'], packed['cases']):
+        cases = other_cases.setdefault(message_id, set())
+        if case is not None and case not in CHARACTERS:
+            cases.add(case)
+    rows = []
+    for message_id, cases in other_cases.items():
+        rows.append((message_id, None))
+        rows.extend((message_id, case) for case in sorted(cases))
+    return rows
+
+
+def message_frames(frames, lang_code, message_id, case, character):
+    # Frames for a message, like routeeval.message_frames: a message without
+    # cases is the same for everyone, and otherwise the case is either
+    # given, or it's the character. None if there's no such message.
+    for key_case in [None, case, character]:
+        key = (lang_code, message_id, key_case)
+        if key in frames:
+            return frames[key]
+    return None
+
+
+def message_matrix(frames, rows, columns):
+    matrix = np.full((len(rows), len(columns)), np.nan, dtype=np.float32)
+    for i, (message_id, case) in enumerate(rows):
+        for j, (lang_code, character) in enumerate(columns):
+            value = message_frames(
+                frames, lang_code, message_id, case, character)
+            if value is not None:
+                matrix[i, j] = value
+    return matrix
+
+
+def item_matrix(frames, item_messages, columns):
+    # Frames for each item's messages, skippable ones excepted, like
+    # routeeval.item_frames. NaN where a message is missing.
+    matrix = np.zeros((len(item_messages), len(columns)), dtype=np.float32)
+    for i, messages in enumerate(item_messages.values()):
+        for j, (lang_code, character) in enumerate(columns):
+            for m in messages:
+                if m.get('skippable'):
+                    continue
+                message_id = m['id']
+                if type(message_id) != str:
+                    message_id = message_id[character]
+                value = message_frames(
+                    frames, lang_code, message_id, m.get('case'), character)
+                if value is None:
+                    matrix[i, j] = np.nan
+                    break
+                matrix[i, j] += value
+    return matrix
+
+
+def route_matrix(
+  route_filenames, category, item_names, items, messages_directory=None):
+    # Route totals: the sum of the route items' rows of the item matrix,
+    # events included. NaN for routes that are incomplete. Returns (route
+    # names, matrix).
+    # Routes are parsed like routeeval.py does, which needs the usenglish
+    # messages in messages_directory (see routeeval.load_route_data).
+    route_data = routeeval.load_route_data([], messages_directory)
+    item_rows = dict((name, i) for i, name in enumerate(item_names))
+    names = []
+    matrix = np.full(
+        (len(route_filenames), items.shape[1]), np.nan, dtype=np.float32)
+    for i, filename in enumerate(route_filenames):
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+        try:
+            route = routeeval.parse_route(text, route_data)
+            routeeval.check_and_add_events(route, category, route_data)
+        except ValueError as e:
+            route = dict(name=None, complete=False, status=[str(e)])
+        names.append(route['name'] or filename)
+        if not route['complete']:
+            print("** {}: {}".format(filename, ' / '.join(
+                route['status'] or ["Route is incomplete!"])),
+                file=sys.stderr)
+            continue
+        # Items that aren't in itemmessages.csv have no messages.
+        rows = [
+            item_rows[item_obj['item']['name']]
+            for item_obj in route['items']
+            if item_obj['item']['name'] in item_rows]
+        matrix[i] = items[rows].sum(axis=0)
+    return names, matrix
+
+
+def fastest_column(values, column_names):
+    # Name of the column with the fewest frames (the first one if tied), or
+    # '' if every value is missing.
+    if np.all(np.isnan(values)):
+        return ''
+    return column_names[int(np.nanargmin(values))]
+
+
+def write_matrix(filename_base, label_names, labels, column_names, matrix):
+    # Save the matrix as <filename_base>.npy, and as <filename_base>.csv
+    # with the row labels, a column per language/character, and the fastest
+    # language/character for each row. Rows are in the same order in both.
+    np.save(filename_base + '.npy', matrix)
+    with open(filename_base + '.csv', 'w', newline='', encoding='utf-8') \
+      as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(label_names + column_names + ['fastest'])
+        for row_labels, values in zip(labels, matrix):
+            writer.writerow(
+                list(row_labels)
+                + ['' if np.isnan(v) else int(v) for v in values.tolist()]
+                + [fastest_column(values, column_names)])
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Compare frames of every message, item and route across"
+        " languages and characters.")
+    parser.add_argument(
+        'routes', nargs='*',
+        help="Route text files, or directories of them, to total up.")
+    parser.add_argument(
+        '--bte', type=int, default=10,
+        help="Box end timing error to count frames with. Default: 10")
+    parser.add_argument(
+        '--category', choices=sorted(routeeval.CATEGORIES), default='Any%')
+    parser.add_argument(
+        '--out', default='framematrix',
+        help="Write <OUT>.npy/.csv, <OUT>-items.npy/.csv and (with routes)"
+        " <OUT>-routes.npy/.csv. Default: framematrix")
+    parser.add_argument(
+        '--messages-dir',
+        help="Directory with the js/messages/<code>.js files, for parsing"
+        " routes.")
+    parser.add_argument('--mmap', action='store_true')
+    parser.add_argument(
+        '--jobs', type=int, default=1, metavar='N',
+        help="Process up to N languages' messages at once, in worker"
+        " processes.")
+    args = parser.parse_args()
+
+    lookup = messagedata2js.make_lookup()
+    languages = []
+    for language in messagedata2js.read_language_files():
+        if language['code'] in lookup['languageSpeeds']:
+            languages.append(language)
+        else:
+            print("** No text speeds for {} in language-speeds.txt,"
+                  " skipping it".format(language['code']), file=sys.stderr)
+    missing_lang_codes = set(lookup['languageSpeeds']) \
+        - set(language['code'] for language in languages)
+    if missing_lang_codes:
+        print("No disc files for: " + ', '.join(sorted(missing_lang_codes)),
+              file=sys.stderr)
+
+    if args.jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(args.jobs) as executor:
+            tables = list(executor.map(
+                language_table, languages, itertools.repeat(args.mmap)))
+    else:
+        tables = [
+            language_table(language, args.mmap) for language in languages]
+    packed = framecalc.pack_table(merge_tables(tables))
+    frames = frame_lookup(packed, args.bte)
+
+    columns = [
+        (lang_code, character)
+        for lang_code in packed['lang_codes'] for character in CHARACTERS]
+    column_names = [
+        '{}/{}'.format(lang_code, character)
+        for lang_code, character in columns]
+
+    rows = message_rows(packed)
+    write_matrix(
+        args.out, ['id', 'case'],
+        [(message_id, case or '') for message_id, case in rows],
+        column_names, message_matrix(frames, rows, columns))
+
+    item_messages = read_item_messages(messagedata2js.ITEM_MESSAGES_FILENAME)
+    items = item_matrix(frames, item_messages, columns)
+    write_matrix(
+        args.out + '-items', ['item'],
+        [(name,) for name in item_messages], column_names, items)
+
+    route_filenames = list(routeeval.route_filenames(args.routes))
+    if route_filenames:
+        route_names, routes = route_matrix(
+            route_filenames, args.category, list(item_messages), items,
+            args.messages_dir)
+        write_matrix(
+            args.out + '-routes', ['file', 'route'],
+            list(zip(route_filenames, route_names)), column_names, routes)
@@ -6,54 +6,167 @@
 import argparse
 import binascii
 import collections
+import contextlib
 import csv
+import gzip
+import hashlib
+import io
+import itertools
 import json
 import math
-import numpy as np
+import mmap
 import os
+import pickle
 import re
+import shutil
 import struct
+import sys
+import time
+import traceback
 
+try:
+    import brotli
+except ImportError:
+    # Only needed for --compress br.
+    brotli = None
 
+sys.path.insert(0, os.pardir)
+from itemdata import read_item_details, read_item_messages
 
-def make_lookup():
+
+
+# Parsed messages and written JS files are cached in here, keyed by hashes
+# of the files they were built from.
+CACHE_DIRECTORY = '.cache'
+# Bump this whenever the parsed message format changes, so that existing
+# cache entries are no longer used.
+PARSER_VERSION = 1
+# Binary message file format (see encode_binary_messages). Bump the version
+# whenever the layout changes.
+BINARY_MAGIC = b'SMGM'
+BINARY_VERSION = 1
+# Precompressed copies that output JS files can have next to them (see
+# streaming_output), for static servers that send those instead.
+COMPRESSION_FORMATS = ['gz', 'br']
+# Output is encoded and written in chunks of about this many characters.
+WRITE_CHUNK_SIZE = 1 << 16
+# Message shards (see write_message_shards). Zone prefixes with fewer
+# messages than this share one shard. The special file names start with _
+# so that they can't clash with a zone prefix.
+SHARD_MIN_MESSAGES = 20
+OTHER_SHARD = '_other'
+SHARD_MANIFEST_FILENAME = '_manifest.js'
+# Messages and item messages with integer ids (see write_indexed_messages).
+INDEXED_DIRECTORY = '../../js/indexed'
+INDEX_FILENAME = 'index.js'
+# Files read by make_lookup().
+LOOKUP_FILENAMES = [
+    'color-codes.txt',
+    'icon-codes.txt',
+    'forced-slow-messages.txt',
+    'language-speeds.txt',
+    'number-name-specifics.json',
+    'animation-times.txt',
+]
+# Compiled lookup cache (see make_lookup), in the lookup files' directory.
+# Bump the version whenever the lookup's layout changes.
+LOOKUP_CACHE_FILENAME = os.path.join(CACHE_DIRECTORY, 'lookup.pickle')
+LOOKUP_CACHE_VERSION = 1
+# Item data files, which say what messages the webpage's routes use. Read
+# by read_root_message_ids().
+ITEM_DETAILS_FILENAME = os.path.join(os.pardir, 'itemdetails.csv')
+ITEM_MESSAGES_FILENAME = os.path.join(os.pardir, 'itemmessages.csv')
+
+
+def make_lookup(directory='', use_cache=True):
+    # directory is where the lookup files are; by default, the current
+    # directory.
+    # The parsed lookup is cached. The cache is used as is while the lookup
+    # files' sizes and modification times are unchanged; if those changed,
+    # it's still used if the files' contents hash the same (after a
+    # checkout or copy, for example).
+    if not use_cache:
+        return parse_lookup(directory)
+    
+    filenames = [
+        os.path.join(directory, filename) for filename in LOOKUP_FILENAMES]
+    signature = []
+    for filename in filenames:
+        st = os.stat(filename)
+        signature.append((st.st_size, st.st_mtime_ns))
+        
+    cache_filename = os.path.join(directory, LOOKUP_CACHE_FILENAME)
+    try:
+        with open(cache_filename, 'rb') as f:
+            cached = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        cached = dict()
+    if cached.get('version') == LOOKUP_CACHE_VERSION:
+        if cached['signature'] == signature:
+            return cached['lookup']
+    
+    content_hash = hash_files(filenames, LOOKUP_CACHE_VERSION)
+    if cached.get('version') == LOOKUP_CACHE_VERSION \
+      and cached['hash'] == content_hash:
+        lookup = cached['lookup']
+    else:
+        lookup = parse_lookup(directory)
+    data = pickle.dumps(
+        dict(version=LOOKUP_CACHE_VERSION, signature=signature,
+             hash=content_hash, lookup=lookup),
+        pickle.HIGHEST_PROTOCOL)
+    try:
+        os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+        write_file_atomically(cache_filename, data)
+    except OSError:
+        # Can't write the cache (a read-only checkout, say); the lookup is
+        # just parsed again next time.
+        pass
+    return lookup
+    
+    
+def parse_lookup(directory=''):
+    # Read all of the lookup files in directory.
+    path = lambda filename: os.path.join(directory, filename)
     lookup = dict()
             
     lookup['colors'] = dict()
-    reader = csv.reader(open('color-codes.txt', 'r'), delimiter=',')
+    reader = csv.reader(open(path('color-codes.txt'), 'r'), delimiter=',')
     for row in reader:
         code = int(row[0])
         name = row[1]
         lookup['colors'][code] = name
     
     lookup['icons'] = dict()
-    reader = csv.reader(open('icon-codes.txt', 'r'), delimiter=',')
+    reader = csv.reader(open(path('icon-codes.txt'), 'r'), delimiter=',')
     for row in reader:
         code = int(row[0])
         name = row[1]
         lookup['icons'][code] = name
     
     lookup['forcedSlow'] = []
-    reader = csv.reader(open('forced-slow-messages.txt', 'r'), delimiter=',')
+    reader = csv.reader(
+        open(path('forced-slow-messages.txt'), 'r'), delimiter=',')
     for row in reader:
         message_id = row[0]
         lookup['forcedSlow'].append(message_id)
             
     lookup['languageSpeeds'] = dict()
-    reader = csv.reader(open('language-speeds.txt', 'r'), delimiter=',')
+    reader = csv.reader(
+        open(path('language-speeds.txt'), 'r'), delimiter=',')
     for row in reader:
         lang_code = row[0]
         d = dict(alphaReq=float(row[1]), fadeRate=float(row[2]))
         lookup['languageSpeeds'][lang_code] = d
     
     lookup['numbersNames'] = dict()
-    j = json.load(open('number-name-specifics.json', 'r'))
+    j = json.load(open(path('number-name-specifics.json'), 'r'))
     for message_id, d in j.items():
         lookup['numbersNames'][message_id] = d
     
     lookup['animationTimes'] = dict()
     line_regex = re.compile('([A-Za-z0-9_]+) = ([0-9]+)')
-    with open('animation-times.txt', 'r') as lines:
+    with open(path('animation-times.txt'), 'r') as lines:
         for line in lines:
             line = line.strip()
             if line == '':
@@ -75,203 +188,367 @@ def make_lookup():
     
     return lookup
     
-def add_to_box(box, key, value):
-    if key == 'chars':
-        def add_func(box_case, value): box_case['chars'] += value
-    elif key == 'text':
-        def add_func(box_case, value): box_case['text'] += value
-    elif key == 'pause_length':
-        def add_func(box_case, value): box_case['pause_length'] += value
-    else:
-        raise ValueError("Invalid key for add_to_box: "+key)
+class Box(object):
+    # One message box: its text, char count and pause length, and once
+    # computed, its length.
+    #
+    # Until a case-dependent escape (a number, a player name, etc.) comes
+    # up, the box has a single case and cases is None. After that, cases is
+    # a tuple of case names, and chars and lengths have one entry per case
+    # in the same order. The pause length never depends on the case.
+    #
+    # The text is kept as a list of parts, to be joined when needed. A part
+    # is either a string shared by all cases, or a tuple with one string per
+    # case. So splitting a box into cases doesn't copy any text.
+    __slots__ = ('cases', 'chars', 'pause_length', 'lengths', 'text_parts')
     
-    if key not in box:
-        # box does not have the regular box dict items; this
-        # top level dict must be tracking multiple cases instead.
+    def __init__(self):
+        self.cases = None
+        self.chars = [0]
+        self.pause_length = 0
+        self.lengths = None
+        self.text_parts = []
+        
+    def case_index(self, case):
+        # Index into chars and lengths for a case. A box without cases has
+        # the same values for every case.
+        if self.cases is None:
+            return 0
+        return self.cases.index(case)
+        
+    def split_cases(self, cases):
+        # Establish multiple cases, each starting from the counts so far.
+        self.cases = tuple(cases)
+        self.chars = self.chars * len(self.cases)
+        
+    def case_indices(self, value):
+        # (case index, value) pairs for a dict of values by case.
+        if self.cases is None:
+            self.split_cases(value.keys())
+        pairs = []
+        for case, v in value.items():
+            if case not in self.cases:
+                raise ValueError(
+                    "A message has multiple dimensions of cases,"
+                    " and we don't know how to handle that yet."
+                )
+            pairs.append((self.cases.index(case), v))
+        return pairs
+        
+    def add_chars(self, value):
+        # value is a char count, or a dict of char counts by case.
         if type(value) == dict:
-            # box has cases, value has cases.
-            # Hopefully their cases match up.
-            for k,v in value.items():
-                if k not in box:
-                    raise ValueError(
-                        "A message has multiple dimensions of cases,"
-                        " and we don't know how to handle that yet."
-                    )
-                add_func(box[k], v)
+            for i, v in self.case_indices(value):
+                self.chars[i] += v
         else:
-            # box has cases, value does not. Add the value to each of
-            # box's cases.
-            for k in box.keys():
-                add_func(box[k], value)
-    else:
+            chars = self.chars
+            for i in range(len(chars)):
+                chars[i] += value
+                
+    def add_pause(self, pause_length):
+        self.pause_length += pause_length
+        
+    def add_text(self, value):
+        # value is a string, or a dict of strings by case.
         if type(value) == dict:
-            # box doesn't have cases, value does. Must change the box
-            # structure to have cases now.
+            pairs = self.case_indices(value)
+            case_texts = [''] * len(self.cases)
+            for i, v in pairs:
+                case_texts[i] = v
+            self.text_parts.append(tuple(case_texts))
+        elif value:
+            self.text_parts.append(value)
             
-            # Make a copy of the old box using the dict constructor.
-            old_box = dict(box)
-            # Empty the box dict.
-            box.clear()
-            # Fill up the box dict with the new structure.
-            for k,v in value.items():
-                box[k] = dict(old_box)
-                add_func(box[k], v)
+    def is_empty(self):
+        # True if no text has been added to the box yet.
+        return not self.text_parts
+        
+    def text(self, case=None):
+        # The box's text for a case. For a box with cases, the default is
+        # the '_placeholder' case, which has placeholder text in place of
+        # the case-dependent parts.
+        if self.cases is None:
+            i = 0
         else:
-            # A simple message so far: the value in this
-            # message is still not dependent on any cases.
-            add_func(box, value)
-    
-def handle_escape_sequence(escape_bytes, boxes, lookup, message_id,
-    display_colors=False, display_furigana=False):
-
-    if escape_bytes[:4] == b'\x01\x00\x00\x00':
-        # Text pause - length is either 10, 15, 30, or 60
-        pause_length = escape_bytes[4]
-        text = '<Text pause, ' + str(pause_length) + 'L>'
-        
-        add_to_box(boxes[-1], 'pause_length', pause_length)
-    elif escape_bytes[:3] == b'\x01\x00\x01':
-        # Message box break.
-        text = ''
-        boxes.append(dict(chars=0, text="", pause_length=0))
-    elif escape_bytes[:3] == b'\x01\x00\x02':
-        text = '<Lower-baseline text>'
-    elif escape_bytes[:3] == b'\x01\x00\x03':
-        text = '<Center align>'
-    elif escape_bytes[:5] == b'\x02\x00\x00\x00\x53':
-        text = '<Play voice audio>'
-    elif escape_bytes[:2] == b'\x03\x00':
-        # Icon
-        icon_byte = escape_bytes[2]
-        icon_type = lookup['icons'][icon_byte]
-        text = '<' + icon_type + ' icon>'
-        # Any icon counts as one character.
-        add_to_box(boxes[-1], 'chars', 1)
-    elif escape_bytes[:3] == b'\x04\x00\x00':
-        text = '<Small text>'
-    elif escape_bytes[:3] == b'\x04\x00\x02':
-        text = '<Large text>'
-    elif escape_bytes == b'\x05\x00\x00\x00\x00':
-        text = '<Player name>'
-        lookup['msg_in_msg'][message_id] = dict(
-            _placeholder=text,
-            mario="System_PlayerName000",
-            luigi="System_PlayerName100",
+            i = self.cases.index(
+                '_placeholder' if case is None else case)
+        return ''.join(
+            part if type(part) == str else part[i]
+            for part in self.text_parts
         )
         
-    elif escape_bytes == b'\x05\x00\x00\x01\x00':
-        text = '<Mr. Plaaayer naaame>'
-        lookup['msg_in_msg'][message_id] = dict(
-            _placeholder=text,
-            mario="System_PlayerName001",
-            luigi="System_PlayerName101",
-        )
+    def replace_text(self, old, new_by_case):
+        # Replace old with each case's text from the dict new_by_case. The
+        # box must already have cases.
+        self.text_parts = [tuple(
+            self.text(case).replace(old, new_by_case[case])
+            for case in self.cases
+        )]
         
-    elif escape_bytes[0] == 6:
-        # A number. In general we don't know how many characters will be
-        # added... it's message dependent and even case dependent beyond
-        # that (e.g. which level a Hungry Luma is in). But we have a
-        # structured way of handling case dependent numbers/names, and we'll
-        # do that for the most important messages.
-        if message_id in lookup['numbers_names']:
-            # Make a copy with the dict constructor so that modifications
-            # don't ruin the lookup.
-            d = dict(lookup['numbers_names'][message_id])
-            nn_type = d.pop('_type')
-            if nn_type == 'text':
-                text = d
-                chars_by_case = dict([(case, len(t)) for case, t in d.items()])
-                add_to_box(boxes[-1], 'chars', chars_by_case)
-            elif nn_type == 'message':
-                # Must fill this in with the contents of another message.
-                # But we don't know what order the messages are processed
-                # in, so we'll do this later once we've gone through all
-                # the messages once.
-                text = d['_placeholder']
-                lookup['msg_in_msg'][message_id] = d
-            else:
-                raise ValueError("Unsupported numbers_names type: "+nn_type)
-        else:
-            text = '<Number>'
-    elif escape_bytes[0] == 7:
-        # A name. Again, case by case basis, and we'll cover just the most
-        # important messages.
-        if message_id in lookup['numbers_names']:
-            d = dict(lookup['numbers_names'][message_id])
-            nn_type = d.pop('_type')
-            if nn_type == 'text':
-                text = d
-                chars_by_case = dict([(case, len(t)) for case, t in d.items()])
-                add_to_box(boxes[-1], 'chars', chars_by_case)
-            elif nn_type == 'message':
-                text = d['_placeholder']
-                lookup['msg_in_msg'][message_id] = d
-            else:
-                raise ValueError("Unsupported numbers_names type: "+nn_type)
-        else:
-            text = '<Name>'
-    elif escape_bytes == b'\x09\x00\x05':
-        text = 'xx:xx:xx'
-        add_to_box(boxes[-1], 'chars', len(text))
-    elif escape_bytes[:3] == b'\xFF\x00\x00':
-        # Text color.
-        color_byte = escape_bytes[3]
-        color_type = lookup['colors'][color_byte]
-        if display_colors:
-            text = '<' + color_type + ' color>'
-        else:
-            text = ''
-    elif escape_bytes[:3] == b'\xFF\x00\x02':
-        # Japanese furigana (kanji reading help).
-        kanji_count = struct.unpack('B', escape_bytes[3:4])[0]
-        furigana_bytes = escape_bytes[4:-1]
-        furigana_str = furigana_bytes.decode('utf-16be')
-        if display_furigana:
-            text = '<' + furigana_str + '>'
-        else:
-            text = ''
-    else:
-        # Unknown escape sequence.
+        
+def add_msg_in_msg(lookup, message_id, d):
+    # Note that part of a message must be filled in with another message's
+    # content. A message can have several of these (e.g. two different
+    # player name escapes), but each placeholder only needs noting once.
+    entries = lookup['msg_in_msg'].setdefault(message_id, [])
+    if d not in entries:
+        entries.append(d)
+    
+# Escape sequence types, for looking up by the escape's first byte: each
+# first byte maps to a list of (prefix, exact, type name), with longer
+# prefixes first so that the most specific type matches. If exact is True,
+# the escape must equal the prefix rather than just start with it.
+# Filled in by register_escape.
+ESCAPE_TABLE = dict()
+# Escape sequence type name -> handler.
+ESCAPE_HANDLERS = dict()
+# Escape sequence type name -> ids of the messages whose text that type of
+# escape always includes (e.g. player names).
+ESCAPE_MESSAGE_IDS = dict()
+
+
+def register_escape(name, prefix, handler, exact=False, message_ids=()):
+    # Add an escape sequence type. The handler is called as
+    # handler(escape_bytes, boxes, lookup, message_id, display_colors,
+    # display_furigana), and returns the text to add to the last box.
+    # message_ids lists the messages that the escape's text comes from, if
+    # any.
+    entries = ESCAPE_TABLE.setdefault(prefix[0], [])
+    entries.append((prefix, exact, name))
+    entries.sort(key=lambda entry: -len(entry[0]))
+    ESCAPE_HANDLERS[name] = handler
+    ESCAPE_MESSAGE_IDS[name] = list(message_ids)
+    
+    
+def escape_type(escape_bytes):
+    # Type name of an escape sequence, or 'unknown'.
+    if not escape_bytes:
+        return 'unknown'
+    for prefix, exact, name in ESCAPE_TABLE.get(escape_bytes[0], ()):
+        if escape_bytes == prefix \
+          or (not exact and escape_bytes.startswith(prefix)):
+            return name
+    return 'unknown'
+    
+    
+def decode_escapes(messages_list, escape_types=None):
+    # Decode every escape sequence in a list of messages at once. Returns a
+    # dict from escape bytes to type name, with one entry per distinct
+    # escape; pass escape_types to add to an existing dict.
+    if escape_types is None:
+        escape_types = dict()
+    for m in messages_list:
+        if m['content'] is None:
+            continue
+        for item in m['content']:
+            if type(item) != str:
+                escape_bytes = bytes(item)
+                if escape_bytes not in escape_types:
+                    escape_types[escape_bytes] = escape_type(escape_bytes)
+    return escape_types
+    
+    
+def handle_escape_sequence(escape_bytes, boxes, lookup, message_id,
+    display_colors=False, display_furigana=False, name=None):
+    # Add an escape sequence's contents to the boxes. name is the escape's
+    # type name, if it's already been decoded.
+    
+    if name is None:
+        name = escape_type(escape_bytes)
+    if name == 'unknown':
         text = \
             "<Unknown escape " + binascii.hexlify(escape_bytes).decode() + ">"
+    else:
+        text = ESCAPE_HANDLERS[name](
+            escape_bytes, boxes, lookup, message_id,
+            display_colors, display_furigana
+        )
         
-    add_to_box(boxes[-1], 'text', text)
+    boxes[-1].add_text(text)
     return boxes
     
     
-def compute_box_length(box, lang_code):
-    f32 = np.float32
-    char_alpha_req = 0.9
-    if lang_code == 'usenglish':
-        fade_rate = 0.4375
-    elif lang_code == 'jpjapanese':
-        fade_rate = 0.35
-    else:
+def fixed_text_escape(text):
+    # Handler for an escape that only shows as some text.
+    def handler(escape_bytes, boxes, lookup, message_id,
+      display_colors, display_furigana):
+        return text
+    return handler
+    
+    
+def pause_escape(escape_bytes, boxes, lookup, message_id,
+  display_colors, display_furigana):
+    # Text pause - length is either 10, 15, 30, or 60
+    pause_length = escape_bytes[4]
+    boxes[-1].add_pause(pause_length)
+    return '<Text pause, ' + str(pause_length) + 'L>'
+    
+    
+def box_break_escape(escape_bytes, boxes, lookup, message_id,
+  display_colors, display_furigana):
+    # Message box break.
+    boxes.append(Box())
+    return ''
+    
+    
+def icon_escape(escape_bytes, boxes, lookup, message_id,
+  display_colors, display_furigana):
+    icon_byte = escape_bytes[2]
+    icon_type = lookup['icons'][icon_byte]
+    # Any icon counts as one character.
+    boxes[-1].add_chars(1)
+    return '<' + icon_type + ' icon>'
+    
+    
+def player_name_escape(placeholder, mario_id, luigi_id):
+    # Handler for a player name escape. The name's text comes from another
+    # message, which gets filled in once all the messages have gone by.
+    def handler(escape_bytes, boxes, lookup, message_id,
+      display_colors, display_furigana):
+        add_msg_in_msg(lookup, message_id, dict(
+            _placeholder=placeholder,
+            mario=mario_id,
+            luigi=luigi_id,
+        ))
+        return placeholder
+    return handler
+    
+    
+def number_name_escape(unknown_text):
+    # Handler for a number or name escape. In general we don't know how
+    # many characters will be added... it's message dependent and even case
+    # dependent beyond that (e.g. which level a Hungry Luma is in). But we
+    # have a structured way of handling case dependent numbers/names, and
+    # we'll do that for the most important messages.
+    def handler(escape_bytes, boxes, lookup, message_id,
+      display_colors, display_furigana):
+        if message_id not in lookup['numbersNames']:
+            return unknown_text
+        # Make a copy with the dict constructor so that modifications
+        # don't ruin the lookup.
+        d = dict(lookup['numbersNames'][message_id])
+        nn_type = d.pop('_type')
+        if nn_type == 'text':
+            chars_by_case = dict([(case, len(t)) for case, t in d.items()])
+            boxes[-1].add_chars(chars_by_case)
+            return d
+        elif nn_type == 'message':
+            # Must fill this in with the contents of another message.
+            # But we don't know what order the messages are processed
+            # in, so we'll do this later once we've gone through all
+            # the messages once.
+            add_msg_in_msg(lookup, message_id, d)
+            return d['_placeholder']
+        else:
+            raise ValueError("Unsupported numbers_names type: "+nn_type)
+    return handler
+    
+    
+def race_time_escape(escape_bytes, boxes, lookup, message_id,
+  display_colors, display_furigana):
+    text = 'xx:xx:xx'
+    boxes[-1].add_chars(len(text))
+    return text
+    
+    
+def color_escape(escape_bytes, boxes, lookup, message_id,
+  display_colors, display_furigana):
+    # Text color.
+    color_byte = escape_bytes[3]
+    color_type = lookup['colors'][color_byte]
+    if display_colors:
+        return '<' + color_type + ' color>'
+    return ''
+    
+    
+def furigana_escape(escape_bytes, boxes, lookup, message_id,
+  display_colors, display_furigana):
+    # Japanese furigana (kanji reading help).
+    furigana_bytes = escape_bytes[4:-1]
+    furigana_str = furigana_bytes.decode('utf-16be')
+    if display_furigana:
+        return '<' + furigana_str + '>'
+    return ''
+    
+    
+register_escape('pause', b'\x01\x00\x00\x00', pause_escape)
+register_escape('box_break', b'\x01\x00\x01', box_break_escape)
+register_escape(
+    'lower_baseline', b'\x01\x00\x02',
+    fixed_text_escape('<Lower-baseline text>'))
+register_escape(
+    'center_align', b'\x01\x00\x03', fixed_text_escape('<Center align>'))
+register_escape(
+    'voice', b'\x02\x00\x00\x00\x53',
+    fixed_text_escape('<Play voice audio>'))
+register_escape('icon', b'\x03\x00', icon_escape)
+register_escape(
+    'small_text', b'\x04\x00\x00', fixed_text_escape('<Small text>'))
+register_escape(
+    'large_text', b'\x04\x00\x02', fixed_text_escape('<Large text>'))
+register_escape(
+    'player_name', b'\x05\x00\x00\x00\x00',
+    player_name_escape(
+        '<Player name>', 'System_PlayerName000', 'System_PlayerName100'),
+    exact=True,
+    message_ids=['System_PlayerName000', 'System_PlayerName100'])
+register_escape(
+    'mr_player_name', b'\x05\x00\x00\x01\x00',
+    player_name_escape(
+        '<Mr. Plaaayer naaame>',
+        'System_PlayerName001', 'System_PlayerName101'),
+    exact=True,
+    message_ids=['System_PlayerName001', 'System_PlayerName101'])
+register_escape('number', b'\x06', number_name_escape('<Number>'))
+register_escape('name', b'\x07', number_name_escape('<Name>'))
+register_escape('race_time', b'\x09\x00\x05', race_time_escape, exact=True)
+register_escape('color', b'\xFF\x00\x00', color_escape)
+register_escape('furigana', b'\xFF\x00\x02', furigana_escape)
+    
+    
+F32_STRUCT = struct.Struct('<f')
+
+
+def f32(x):
+    # Round a float to the nearest 32-bit float, as the game's arithmetic
+    # does. Doing each 32-bit operation on Python's 64-bit floats and then
+    # rounding gives exactly the 32-bit result for +, -, * and /, since a
+    # 64-bit float has more than twice the precision.
+    return F32_STRUCT.unpack(F32_STRUCT.pack(x))[0]
+    
+    
+def compute_box_length(box, lang_code, lookup):
+    if lang_code not in lookup['languageSpeeds']:
         raise ValueError("Unsupported language code: " + str(lang_code))
+    char_alpha_req = f32(lookup['languageSpeeds'][lang_code]['alphaReq'])
+    fade_rate = f32(lookup['languageSpeeds'][lang_code]['fadeRate'])
         
-    alpha_req = (f32(box['chars']) * f32(char_alpha_req)) + f32(1)
-    char_fade_length = math.floor(alpha_req / f32(fade_rate))
-    box['length'] = box['pause_length'] + char_fade_length
+    # One length per case.
+    box.lengths = []
+    for chars in box.chars:
+        alpha_req = f32(f32(f32(chars) * char_alpha_req) + 1)
+        char_fade_length = math.floor(f32(alpha_req / fade_rate))
+        box.lengths.append(box.pause_length + char_fade_length)
     
     
 def boxes_to_display(boxes):
     box_lines = []
     for box in boxes:
-        if 'chars' not in box:
+        if box.cases is not None:
             # Box has multiple cases
             case_strs = []
-            for case, box_for_case in box.items():
+            for i, case in enumerate(box.cases):
                 if case == '_placeholder':
                     continue
                 case_strs.append("{}: {} length, {} chars".format(
-                    case, box_for_case['length'], box_for_case['chars']
+                    case, box.lengths[i], box.chars[i]
                 ))
             # Alphabetize the cases
             case_strs.sort()
             box_lines.append('{' + ', '.join(case_strs) + '}')
         else:
             box_lines.append("{} length, {} chars".format(
-                box['length'], box['chars']
+                box.lengths[0], box.chars[0]
             ))
     s = "\n".join(box_lines)
     return s
@@ -330,21 +607,21 @@ def compute_message_frames(message, lookup):
     if additional_factors != []:
         base_d['additional_factors'] = additional_factors
         
-    animation_time = lookup['animation_times'].get(message['id'], None)
+    animation_time = lookup['animationTimes'].get(message['id'], None)
     if animation_time is not None:
         base_d['animation_time'] = animation_time
         
-    forced_slow = message['id'] in lookup['forced_slow']
+    forced_slow = message['id'] in lookup['forcedSlow']
     base_d['forced_slow'] = forced_slow
     
     message_cases = []
     for box in message['boxes']:
-        if 'chars' not in box:
+        if box.cases is not None:
             # box has cases.
-            # Add box cases to running list of message cases 
-            message_cases.extend(list(box.keys()))
-            # Remove dupes
-            message_cases = list(set(message_cases))
+            # Add box cases to running list of message cases
+            for case in box.cases:
+                if case not in message_cases:
+                    message_cases.append(case)
             
     if len(message_cases) > 0:
         frames = dict()
@@ -353,9 +630,7 @@ def compute_message_frames(message, lookup):
         for case_name in message_cases:
             frames[case_name] = dict(base_d)
             box_lengths = [
-                box[case_name]['length']
-                if 'length' not in box
-                else box['length']
+                box.lengths[box.case_index(case_name)]
                 for box in message['boxes']
             ]
             base = compute_base_message_frames(
@@ -375,7 +650,7 @@ def compute_message_frames(message, lookup):
         
     else:
         frames = dict(base_d)
-        box_lengths = [box['length'] for box in message['boxes']]
+        box_lengths = [box.lengths[0] for box in message['boxes']]
         base = compute_base_message_frames(
             box_lengths, forced_slow
         )
@@ -403,14 +678,18 @@ def print_message_field_examples(
     examples = [24,181,250,351,453,633,1942]
     s = "Example {}:\n".format(label)
     for ex in examples:
+        if ex >= len(messages):
+            # Smaller message file than the real ones
+            continue
         s += "({})\n{}\n".format(str(ex), value_fmt.format(
             messages[ex][key]
         ))
     print(s)
 
 
-def read_messages_from_disc_files(bmg, tbl):
+def read_messages_from_disc_files(bmg, tbl, stats=None):
     messages = []
+    stage_start = time.perf_counter()
     
     num_messages = struct.unpack('>I', tbl.read(4))[0]
     print("Number of messages: " + str(num_messages))
@@ -446,6 +725,7 @@ def read_messages_from_disc_files(bmg, tbl):
     print_message_field_examples(
         messages, 'id', "message IDs"
     )
+    stage_start = end_stage(stats, 'tbl', stage_start)
     
     # Read bmg header.
     header = bmg.read(0x20)
@@ -467,6 +747,7 @@ def read_messages_from_disc_files(bmg, tbl):
     # Read blank bytes at the end of the INF1 section.
     num_blank_bytes = inf1_section_size - 16 - inf1_num_messages*inf1_item_size
     blank_bytes = bmg.read(num_blank_bytes)
+    stage_start = end_stage(stats, 'inf1', stage_start)
     
     # Read bmg's DAT1 section.
     dat1_magic_constant = bmg.read(4)
@@ -497,6 +778,7 @@ def read_messages_from_disc_files(bmg, tbl):
             print("** Reading {} extra bytes before message {}".format(
                 num_extra_bytes, i
             ))
+            count_stat(stats, 'gap_bytes', num_extra_bytes)
             unused = bmg.read(num_extra_bytes)
             
         m['content'] = []
@@ -541,315 +823,1491 @@ def read_messages_from_disc_files(bmg, tbl):
         # Don't need this anymore.
         m.pop('content_offset')
     
+    end_stage(stats, 'dat1', stage_start)
     return messages
+
+
+def find_code_unit(data, pattern, start):
+    # Find the next occurrence of a 2-byte pattern which lines up with a
+    # UTF-16 code unit boundary, counting code units from start.
+    # Returns -1 if there is no such occurrence.
+    index = data.find(pattern, start)
+    while index != -1 and (index - start) % 2 != 0:
+        index = data.find(pattern, index + 1)
+    return index
+
+
+def read_messages_from_mapped_disc_files(bmg, tbl, stats=None):
+    # Same result as read_messages_from_disc_files, but the files are
+    # memory-mapped instead of being read a few bytes at a time. The tables
+    # are decoded in bulk, and message text is decoded a whole run at a
+    # time, between escape sequences.
+    with mmap.mmap(tbl.fileno(), 0, access=mmap.ACCESS_READ) as tbl_map, \
+         mmap.mmap(bmg.fileno(), 0, access=mmap.ACCESS_READ) as bmg_map:
+        return read_messages_from_buffers(bmg_map, tbl_map, stats)
+
+
+def read_messages_from_buffers(bmg_data, tbl_data, stats=None):
+    # bmg_data and tbl_data can be anything supporting the buffer protocol
+    # plus find(), such as bytes or mmap objects.
+    tbl_view = memoryview(tbl_data)
+    bmg_view = memoryview(bmg_data)
+    try:
+        return decode_message_tables(
+            bmg_data, bmg_view, tbl_data, tbl_view, stats)
+    finally:
+        # Release the views so that an mmap can be closed afterward.
+        tbl_view.release()
+        bmg_view.release()
+
+
+def decode_message_tables(
+  bmg_data, bmg_view, tbl_data, tbl_view, stats=None):
+    messages = []
+    stage_start = time.perf_counter()
+
+    num_messages = struct.unpack_from('>I', tbl_view, 0)[0]
+    print("Number of messages: " + str(num_messages))
+
+    # After the message count and 0x24 unknown bytes, there's a table of
+    # (message index, message ID offset) pairs.
+    table_start = 4 + 0x24
+    table_end = table_start + 8*num_messages
+    id_offsets = []
+    for i, (message_index, id_offset) in enumerate(
+      struct.iter_unpack('>II', tbl_view[table_start:table_end])):
+        assert(message_index == i)
+        id_offsets.append(id_offset)
+
+    # The message IDs come right after that table, null-terminated.
+    # The ID offsets are relative to the first ID.
+    ids_start = table_end - (id_offsets[0] if id_offsets else 0)
+    for i, id_offset in enumerate(id_offsets):
+        id_start = ids_start + id_offset
+        if i < num_messages - 1:
+            id_end = ids_start + id_offsets[i+1] - 1
+        else:
+            id_end = tbl_data.find(b'\x00', id_start)
+        message_id = str(tbl_view[id_start:id_end], 'ascii')
+        messages.append(dict(id=message_id))
+    stage_start = end_stage(stats, 'tbl', stage_start)
+
+    # bmg header is 0x20 bytes, followed by the INF1 section.
+    inf1_start = 0x20
+    assert(bmg_view[inf1_start:inf1_start+4] == b'INF1')
+    inf1_section_size, inf1_num_messages, inf1_item_size = \
+        struct.unpack_from('>IHH', bmg_view, inf1_start + 4)
+    assert(num_messages == inf1_num_messages)
+
+    # Each INF1 item starts with the message's content offset; we don't need
+    # the rest of the item.
+    items_start = inf1_start + 16
+    items_end = items_start + num_messages*inf1_item_size
+    item_format = '>I{}x'.format(inf1_item_size - 4)
+    content_offsets = [
+        offset for (offset,) in
+        struct.iter_unpack(item_format, bmg_view[items_start:items_end])
+    ]
+    stage_start = end_stage(stats, 'inf1', stage_start)
+
+    # DAT1 section comes after INF1.
+    dat1_start = inf1_start + inf1_section_size
+    assert(bmg_view[dat1_start:dat1_start+4] == b'DAT1')
+    dat1_content_start = dat1_start + 8
+
+    current_file_pos = dat1_content_start
+
+    for i, m in enumerate(messages):
+
+        content_offset = content_offsets[i]
+        if content_offset == 0:
+            # Message with no content location specified.
+            m['content'] = None
+            continue
+
+        pos = dat1_content_start + content_offset
+        if pos < current_file_pos:
+            raise ValueError(
+                "Messages seem to be out of order!"
+                " Haven't been programmed to handle this."
+            )
+        elif pos > current_file_pos:
+            # Occasionally there are extra bytes between the end (null char) of
+            # one message and the start of the next message.
+            print("** Reading {} extra bytes before message {}".format(
+                pos - current_file_pos, i
+            ))
+            count_stat(stats, 'gap_bytes', pos - current_file_pos)
+
+        content = []
+        # The message ends at the null character \x00\x00.
+        end = find_code_unit(bmg_data, b'\x00\x00', pos)
+
+        while True:
+            escape_start = find_code_unit(bmg_data, b'\x00\x1A', pos)
+            if escape_start == -1 or escape_start > end:
+                break
+
+            # Text up to the escape sequence.
+            if escape_start > pos:
+                content.append(str(bmg_view[pos:escape_start], 'utf-16be'))
+
+            # Next 1 byte is the size of the entire escape sequence,
+            # including the 00 1A and the size byte itself.
+            escape_size = bmg_view[escape_start+2]
+            pos = escape_start + escape_size
+            # Add the escape sequence data as a list of numbers
+            # (byte values).
+            content.append(list(bmg_view[escape_start+3:pos]))
+
+            if pos > end or (end - pos) % 2 != 0:
+                # The escape sequence contained what looked like the
+                # null character, or it shifted us off of the code unit
+                # boundary the null character was found on. Search again.
+                end = find_code_unit(bmg_data, b'\x00\x00', pos)
+
+        # Add the final bit of text if there is one.
+        if end > pos:
+            content.append(str(bmg_view[pos:end], 'utf-16be'))
+
+        m['content'] = content
+        current_file_pos = end + 2
+
+    end_stage(stats, 'dat1', stage_start)
+    return messages
+
+
+def new_stats():
+    # Build statistics for one language (or for the steps that aren't per
+    # language): seconds spent per stage, counters, and output file sizes
+    # in bytes. Functions that take a stats argument fill these in if it's
+    # not None. See --profile and --report.
+    return dict(
+        stages=collections.OrderedDict(),
+        counts=collections.Counter(),
+        sizes=collections.OrderedDict(),
+    )
     
     
-def get_text_bytes(bytes_generator, num_bytes):
-    bytes_gotten = bytes()
-    for i in range(num_bytes):
-        # Generator of a bytes object returns integers for
-        # some reason, so have to wrap it back up into a bytes().
-        bytes_gotten += bytes([next(bytes_generator)])
-    return bytes_gotten
+def end_stage(stats, stage, start):
+    # Add the time since start (a time.perf_counter() value) to the stage.
+    # Returns the current time, to start timing the next stage from.
+    now = time.perf_counter()
+    if stats is not None:
+        stats['stages'][stage] = \
+            stats['stages'].get(stage, 0) + (now - start)
+    return now
     
-def process_messages(lang_code, messages, lookup):
     
-    # TODO: Account for new m['content'] format
-    # TODO: Include escape character handling
-    # TODO: Include boxes char addition, including the non-affecting
-    # line break after a box break. See this:
-    #
-    # # A message box break seems to always be followed by a
-    # # newline character, but in this situation the newline
-    # # doesn't affect the time the box text takes to scroll.
-    # # So we won't count this newline as a character for our
-    # # purposes.
-    # # Note that at the start of a box, there is no possibility for
-    # # multiple cases yet, since we only know to add multiple cases
-    # # after a particular escape sequence (number, player name,
-    # # etc.). So that simplifies the check.
-    # newline_after_box_break = (
-    #     char == '\n' and 'text' in boxes[-1]
-    #     and boxes[-1]['text'] == ""
-    # )
-    #
-    # if not newline_after_box_break:
-    #     add_to_box(boxes[-1], 'text', char)
-    #     add_to_box(boxes[-1], 'chars', 1)
+@contextlib.contextmanager
+def timed_stage(stats, stage):
+    # Time a block of code as the given stage.
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end_stage(stats, stage, start)
     
-    msg_id_lookup = dict()
     
+def count_stat(stats, key, amount=1):
+    if stats is not None:
+        stats['counts'][key] += amount
     
-    # Fill in box information for each message.
     
-    for i, m in enumerate(messages):
+def record_size(stats, key, filename):
+    if stats is not None:
+        stats['sizes'][key] = os.path.getsize(filename)
         
-        msg_id_lookup[m['id']] = m
         
-        if m['bytes'] is None:
-            m['text_display'] = "<Null message>"
-            m['boxes'] = None
+def count_message_stats(stats, messages_list):
+    # Count messages, null messages, and escape sequences by type.
+    if stats is None:
+        return
+    counts = stats['counts']
+    escape_types = decode_escapes(messages_list)
+    for m in messages_list:
+        counts['messages'] += 1
+        if m['content'] is None:
+            counts['null_messages'] += 1
             continue
-            
-        # Make generator
-        m_bytes = (b for b in m['bytes'])
+        for item in m['content']:
+            if type(item) == str:
+                counts['text_code_units'] += utf16_length(item)
+            else:
+                counts['escapes'] += 1
+                counts['escapes_' + escape_types[bytes(item)]] += 1
+                
+                
+def print_stats(stats, label):
+    # Human-readable summary of a stats dict, for --profile.
+    print("[{}]".format(label))
+    total = sum(stats['stages'].values())
+    for stage, seconds in stats['stages'].items():
+        print("  {:<22}{:>10.1f} ms{:>7.1f}%".format(
+            stage, seconds * 1000, 100 * seconds / total if total else 0))
+    for key, value in sorted(stats['counts'].items()):
+        print("  {:<22}{:>10}".format(key, value))
+    for key, size in stats['sizes'].items():
+        print("  {:<22}{:>10} bytes".format(key, size))
+    
+    
+def hash_files(filenames, *extra_keys):
+    # Hash the contents of the given files, along with any extra key values
+    # (version numbers, other hashes), into one hex digest.
+    h = hashlib.sha256()
+    for key in extra_keys:
+        h.update(str(key).encode('utf-8') + b'\x00')
+    for filename in filenames:
+        file_hash = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                file_hash.update(chunk)
+        h.update(file_hash.digest())
+    return h.hexdigest()
+    
+    
+def write_file_atomically(filename, data):
+    # Write to a temporary file and then rename it into place, so that an
+    # interrupted run never leaves a half-written file behind.
+    temp_filename = filename + '.tmp'
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    encoding = None if isinstance(data, bytes) else 'utf-8'
+    with open(temp_filename, mode, encoding=encoding) as f:
+        f.write(data)
+    os.replace(temp_filename, filename)
+    
+    
+def read_cache_stamp(lang_code):
+    # Returns the output key that this language's JS file was last written
+    # with, or None if there's no record of it.
+    stamp_filename = os.path.join(
+        CACHE_DIRECTORY, 'messages-{}.stamp'.format(lang_code))
+    try:
+        with open(stamp_filename, 'r') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+    
+    
+def load_cached_messages(lang_code, parse_key):
+    # Returns the parsed messages list saved for these disc files, or None if
+    # there isn't one.
+    cache_filename = os.path.join(
+        CACHE_DIRECTORY, 'messages-{}.pickle'.format(lang_code))
+    try:
+        with open(cache_filename, 'rb') as f:
+            cached = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if cached.get('key') != parse_key:
+        return None
+    return cached['messages']
+    
+    
+def save_cached_messages(lang_code, parse_key, messages_list):
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    cache_filename = os.path.join(
+        CACHE_DIRECTORY, 'messages-{}.pickle'.format(lang_code))
+    data = pickle.dumps(
+        dict(key=parse_key, messages=messages_list), pickle.HIGHEST_PROTOCOL)
+    write_file_atomically(cache_filename, data)
+    
+    
+def read_language_files(directory=''):
+    # Each row of language-files.txt has a language code, and the directory
+    # holding that language's message.bmg and messageid.tbl. directory is
+    # where language-files.txt is; by default, the current directory.
+    # Relative message.bmg directories are relative to that.
+    languages = []
+    reader = csv.reader(
+        open(os.path.join(directory, 'language-files.txt'), 'r'),
+        delimiter=',')
+    for row in reader:
+        lang_code = row[0]
+        message_bmg_directory = os.path.join(directory, row[1])
+        languages.append(dict(code=lang_code, directory=message_bmg_directory))
+    return languages
+    
+    
+def language_parse_key(language):
+    # Cache key for a language's parsed messages.
+    return hash_files(
+        [os.path.join(language['directory'], 'message.bmg'),
+         os.path.join(language['directory'], 'messageid.tbl')],
+        PARSER_VERSION,
+    )
+    
+    
+def read_language_messages(
+    language, use_mmap=False, use_cache=True, parse_key=None, stats=None):
+    # Read one language's messages list, from the cache if the disc files
+    # haven't changed since they were last parsed, or else from the disc
+    # files themselves.
+    
+    lang_code = language['code']
+    if parse_key is None:
+        with timed_stage(stats, 'hash'):
+            parse_key = language_parse_key(language)
+    
+    if use_cache:
+        with timed_stage(stats, 'cache_load'):
+            messages_list = load_cached_messages(lang_code, parse_key)
+        if messages_list is not None:
+            count_stat(stats, 'cache_hits')
+            return messages_list
+    
+    bmg_filename = os.path.join(language['directory'], 'message.bmg')
+    tbl_filename = os.path.join(language['directory'], 'messageid.tbl')
+    with open(bmg_filename, 'rb') as bmg, open(tbl_filename, 'rb') as tbl:
+        if use_mmap:
+            messages_list = read_messages_from_mapped_disc_files(
+                bmg, tbl, stats)
+        else:
+            messages_list = read_messages_from_disc_files(bmg, tbl, stats)
+    with timed_stage(stats, 'cache_save'):
+        save_cached_messages(lang_code, parse_key, messages_list)
+    return messages_list
+    
+    
+def write_messages_js(js_filename, lang_code, messages_list, compress=()):
+    # Write the language's JS file: message id -> content, as JSON. Messages
+    # are encoded and written one at a time, so the file's contents are
+    # never held in memory all at once.
+    with js_object_writer(js_filename, 'messages', lang_code, compress) \
+      as write_entry:
+        for m in messages_list:
+            write_entry(m['id'], m['content'])
+    
+    
+def message_zone_prefix(message_id):
+    # The part of a message id before the first _, like "DiskGardenZone" for
+    # "DiskGardenZone_Kinopio000", or '' if there's no _.
+    prefix, separator, _ = message_id.partition('_')
+    return prefix if separator else ''
+    
+    
+def group_message_shards(messages_list):
+    # Group a language's messages into shards by zone prefix. Returns an
+    # ordered dict of shard name -> messages list.
+    prefix_counts = collections.Counter(
+        message_zone_prefix(m['id']) for m in messages_list)
+    shards = collections.OrderedDict()
+    for m in messages_list:
+        prefix = message_zone_prefix(m['id'])
+        if prefix and prefix_counts[prefix] >= SHARD_MIN_MESSAGES:
+            shard_name = prefix
+        else:
+            shard_name = OTHER_SHARD
+        shards.setdefault(shard_name, []).append(m)
+    return shards
+    
+    
+def write_message_shards(
+  shard_directory, lang_code, messages_list, compress=()):
+    # Write the language's messages split into shards, one JS file per shard
+    # in shard_directory, plus a manifest listing the shards. The webpage
+    # can then load just the shards with the messages that a route needs
+    # instead of the whole language. A message is in the shard named after
+    # its zone prefix if the manifest has one, and otherwise in the
+    # manifest's other_shard.
+    # Returns the shard names.
+    
+    shards = group_message_shards(messages_list)
+    
+    # Shards from an earlier build may not exist anymore. The manifest goes
+    # first, so that the webpage never sees a manifest with missing shards.
+    if os.path.isdir(shard_directory):
+        shutil.rmtree(shard_directory)
         
-        # At this point the current file position matches the position of the
-        # next message.
-        boxes = [dict(chars=0, text="", pause_length=0)]
+    for shard_name, shard_messages in shards.items():
+        with js_object_writer(
+          os.path.join(shard_directory, shard_name + '.js'),
+          'messageShards', lang_code + '/' + shard_name, compress) \
+          as write_entry:
+            for m in shard_messages:
+                write_entry(m['id'], m['content'])
+                
+    with js_object_writer(
+      os.path.join(shard_directory, SHARD_MANIFEST_FILENAME),
+      'messageManifests', lang_code, compress) as write_entry:
+        write_entry('shards', list(shards))
+        write_entry('other_shard', OTHER_SHARD)
         
-        byte_pair = get_text_bytes(m_bytes, 2)
+    return list(shards)
+    
+    
+def read_root_message_ids():
+    # Ids of the messages that the webpage looks up directly: each item's
+    # messages in itemmessages.csv (both ids of a {mario: ..., luigi: ...}
+    # conditional id), and each level's star name in itemdetails.csv.
+    root_ids = []
+    item_messages = read_item_messages(ITEM_MESSAGES_FILENAME)
+    for messages in item_messages.values():
+        for d in messages:
+            if isinstance(d['id'], dict):
+                root_ids.extend(d['id'].values())
+            else:
+                root_ids.append(d['id'])
+    for details in read_item_details(ITEM_DETAILS_FILENAME).values():
+        if details['star_name']:
+            root_ids.append(details['star_name'])
+    # Remove duplicates, keeping the order.
+    return list(collections.OrderedDict.fromkeys(root_ids))
+    
+    
+def message_references(message, lookup, escape_types):
+    # Ids of the messages whose text this message includes through its
+    # escape sequences: player names, and the messages that
+    # number-name-specifics.json says its number/name escapes refer to.
+    # escape_types is as returned by decode_escapes, and must include this
+    # message's escapes.
+    referenced_ids = []
+    if message['content'] is None:
+        return referenced_ids
+    numbers_names = lookup['numbersNames'].get(message['id'])
+    for item in message['content']:
+        if type(item) == str:
+            continue
+        name = escape_types[bytes(item)]
+        referenced_ids.extend(ESCAPE_MESSAGE_IDS.get(name, []))
+        if name in ['number', 'name'] and numbers_names \
+          and numbers_names['_type'] == 'message':
+            referenced_ids.extend(
+                v for k, v in numbers_names.items() if not k.startswith('_')
+            )
+    return referenced_ids
+    
+    
+def prune_messages(messages_list, root_ids, lookup):
+    # Keep only the messages that the webpage can reach from root_ids: the
+    # root messages, plus (transitively) the messages whose text they
+    # include.
+    # Returns (kept messages, dropped messages, root ids that this language
+    # has no message for). Kept and dropped messages stay in the original
+    # order.
+    messages_by_id = dict((m['id'], m) for m in messages_list)
+    escape_types = dict()
+    reachable_ids = set()
+    missing_ids = set()
+    to_visit = list(root_ids)
+    while to_visit:
+        message_id = to_visit.pop()
+        if message_id in reachable_ids or message_id in missing_ids:
+            continue
+        if message_id not in messages_by_id:
+            missing_ids.add(message_id)
+            continue
+        reachable_ids.add(message_id)
+        message = messages_by_id[message_id]
+        decode_escapes([message], escape_types)
+        to_visit.extend(message_references(message, lookup, escape_types))
         
-        # The message ends at the null character \x00\x00. So, read until that
-        # character is found.
+    kept = [m for m in messages_list if m['id'] in reachable_ids]
+    dropped = [m for m in messages_list if m['id'] not in reachable_ids]
+    return kept, dropped, sorted(missing_ids)
+    
+    
+def write_prune_report(filename, dropped, missing_ids):
+    # CSV listing what pruning left out of a language's output: a row for
+    # each dropped message, and a row for each root id that the language
+    # has no message for (likely a typo in the item data).
+    counts_by_zone = collections.Counter(
+        message_zone_prefix(m['id']) for m in dropped)
+    with open(filename, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['id', 'zone', 'status'])
+        for message_id in missing_ids:
+            writer.writerow([
+                message_id, message_zone_prefix(message_id), 'missing'])
+        for m in dropped:
+            writer.writerow([
+                m['id'], message_zone_prefix(m['id']), 'unreachable'])
+    return counts_by_zone
+    
+    
+def index_item_messages(messages, indexes):
+    # An item's messages (from read_item_messages) as [message, case,
+    # skippable] lists, where message is the message's position in the
+    # message index, or for a {mario: ..., luigi: ...} conditional id, an
+    # object of positions.
+    entries = []
+    for d in messages:
+        if isinstance(d['id'], dict):
+            ref = dict(
+                (character, indexes[message_id])
+                for character, message_id in d['id'].items())
+        else:
+            ref = indexes[d['id']]
+        entries.append([ref, d.get('case'), d.get('skippable', False)])
+    return entries
+    
+    
+def write_indexed_language(
+  js_filename, lang_code, messages_list, indexes, index_key, compress=()):
+    # Write one language's messages as an array in message index order:
+    # each message's content, or 0 where the language has no message with
+    # that id. index_key says which message index the positions are for.
+    contents = [0] * len(indexes)
+    for m in messages_list:
+        contents[indexes[m['id']]] = m['content']
+    with streaming_output(js_filename, compress) as write:
+        write(
+            "if (window.indexedMessages === undefined)"
+            " {window.indexedMessages = {};}\n")
+        write(
+            "window.indexedMessages.{code} = {{key: {key}, messages: ["
+            .format(code=lang_code, key=json.dumps(index_key)))
+        for i, content in enumerate(contents):
+            if i > 0:
+                write(",")
+            write(json.dumps(content, ensure_ascii=False))
+        write("]};")
+    
+    
+def write_indexed_messages(
+  languages, lookup, use_mmap=False, use_cache=True, prune=False,
+  compress=()):
+    # Write every language's messages keyed by integer position instead of
+    # by message id, so that the webpage finds an item's messages by
+    # indexing arrays. js/indexed/index.js has the message ids (sorted; a
+    # message's position is its integer id), the item names in item graph
+    # order, and each item's messages as integer ids (see
+    # index_item_messages). js/indexed/<code>.js has each language's
+    # messages in that order (see write_indexed_language). With prune, only
+    # the messages that prune_messages keeps are included.
+    # Returns the names of the files written.
+    root_ids = read_root_message_ids()
+    
+    def language_messages(language):
+        messages_list = read_language_messages(language, use_mmap, use_cache)
+        if prune:
+            messages_list, _, _ = prune_messages(
+                messages_list, root_ids, lookup)
+        return messages_list
+    
+    # Message ids of all languages, plus any that the item data uses but no
+    # language has. Languages are read once here and once when writing, so
+    # that only one language's messages are held at a time.
+    ids = set(root_ids)
+    for language in languages:
+        ids.update(m['id'] for m in language_messages(language))
+    message_ids = sorted(ids)
+    indexes = dict(
+        (message_id, i) for i, message_id in enumerate(message_ids))
+    # Stops the webpage from using a language file written for a different
+    # index, if it catches the files mid-rebuild.
+    index_key = hashlib.sha256(
+        '\n'.join(message_ids).encode('utf-8')).hexdigest()[:16]
+    
+    if os.path.isdir(INDEXED_DIRECTORY):
+        # Languages that are no longer built shouldn't be left behind.
+        shutil.rmtree(INDEXED_DIRECTORY)
+    filenames = []
+    for language in languages:
+        filename = os.path.join(
+            INDEXED_DIRECTORY, '{}.js'.format(language['code']))
+        write_indexed_language(
+            filename, language['code'], language_messages(language),
+            indexes, index_key, compress)
+        filenames.append(filename)
+    
+    item_messages = read_item_messages(ITEM_MESSAGES_FILENAME)
+    item_names = list(read_item_details(ITEM_DETAILS_FILENAME))
+    index = dict(
+        key=index_key,
+        messages=message_ids,
+        items=item_names,
+        itemMessages=[
+            index_item_messages(item_messages.get(name, []), indexes)
+            for name in item_names],
+    )
+    filename = os.path.join(INDEXED_DIRECTORY, INDEX_FILENAME)
+    with streaming_output(filename, compress) as write:
+        write("window.messageIndex = ")
+        write(json.dumps(index, ensure_ascii=False))
+        write(";")
+    filenames.append(filename)
+    return filenames
+    
+    
+def message_files(lang_codes):
+    # Which of the optional message files are there for each language,
+    # besides js/messages/<code>.js, which always is. This goes in
+    # messagelookup.js, so that the webpage can load the best one directly
+    # instead of trying each in turn.
+    languages = collections.OrderedDict()
+    for lang_code in lang_codes:
+        languages[lang_code] = dict(
+            frames=os.path.exists(
+                '../../js/messageframes/{}.js'.format(lang_code)),
+            indexed=os.path.exists(
+                os.path.join(INDEXED_DIRECTORY, lang_code + '.js')),
+            shards=os.path.exists(os.path.join(
+                '../../js/messages', lang_code, SHARD_MANIFEST_FILENAME)),
+            binary=os.path.exists(
+                '../../js/messages/{}.bin'.format(lang_code)),
+        )
+    return dict(
+        index=os.path.exists(os.path.join(INDEXED_DIRECTORY, INDEX_FILENAME)),
+        languages=languages,
+    )
+    
+    
+def utf16_length(s):
+    # Length of a string in UTF-16 code units, which is how JavaScript
+    # measures string length.
+    return len(s.encode('utf-16-le')) // 2
+    
+    
+def encode_binary_messages(messages_list):
+    # Encode messages in the compact binary format that the webpage can load
+    # instead of the JSON-in-JS file. All numbers are little-endian.
+    #
+    # Header (16 bytes): magic, version (u16), 2 blank bytes, message
+    # count (u32), string table size (u32).
+    # Index: 12 bytes per message (all u32): where the message's id ends
+    # and where its strings end in the string table, and where its content
+    # ends in the content area. Each message's strings and content start
+    # where the previous message's end. The content end's top bit is set
+    # for a null message.
+    # String table: UTF-8. For each message, its id followed by the text of
+    # its content. Positions in the string table count UTF-16 code units of
+    # the decoded string, so the webpage can decode the whole table at once
+    # and slice it.
+    # Content area: each message's content items back to back. An item is
+    # a u16 header, then either nothing for text (header = text length in
+    # code units; the text is the next string in the string table) or an
+    # escape sequence's raw bytes (header = 0x8000 + number of bytes).
+    
+    strings = []
+    strings_length = 0
+    index = bytearray()
+    content_area = bytearray()
+    
+    for m in messages_list:
+        if not m['id'].isascii():
+            raise ValueError(
+                "Message id {!r} isn't ASCII; the binary string table needs"
+                " ASCII ids".format(m['id']))
+        strings.append(m['id'])
+        strings_length += len(m['id'])
+        id_end = strings_length
         
-        if byte_pair == b'\x00\x00':
-            m['text_display'] = "<Blank message>"
-            m['boxes'] = None
+        if m['content'] is None:
+            index += struct.pack(
+                '<III', id_end, strings_length,
+                0x80000000 | len(content_area))
             continue
         
-        while byte_pair != b'\x00\x00':
-            if byte_pair == b'\x00\x1A':
-                # Escape sequence - this part is not normal text
-                escape_size = struct.unpack('B', bmg.read(1))[0] - 3
-                escape_bytes = get_text_bytes(m_bytes, escape_size)
-                
-                handle_escape_sequence(
-                    escape_bytes, boxes, lookup, m['id']
-                )
+        for item in m['content']:
+            if type(item) == str:
+                length = utf16_length(item)
+                if length >= 0x8000:
+                    raise ValueError(
+                        "Text too long for binary format in {}".format(
+                            m['id']))
+                content_area += struct.pack('<H', length)
+                strings.append(item)
+                strings_length += length
             else:
-                # Character in UTF-16 big endian
-                char = byte_pair.decode('utf-16be')
-                
-                # A message box break seems to always be followed by a
-                # newline character, but in this situation the newline
-                # doesn't affect the time the box text takes to scroll.
-                # So we won't count this newline as a character for our
-                # purposes.
-                # Note that at the start of a box, there is no possibility for
-                # multiple cases yet, since we only know to add multiple cases
-                # after a particular escape sequence (number, player name,
-                # etc.). So that simplifies the check.
-                newline_after_box_break = (
-                    char == '\n' and 'text' in boxes[-1]
-                    and boxes[-1]['text'] == ""
-                )
-                
-                if not newline_after_box_break:
-                    add_to_box(boxes[-1], 'text', char)
-                    add_to_box(boxes[-1], 'chars', 1)
-            
-            byte_pair = get_text_bytes(m_bytes, 2)
-            
-        m['boxes'] = boxes
+                content_area += struct.pack('<H', 0x8000 | len(item))
+                content_area += bytes(item)
+        index += struct.pack(
+            '<III', id_end, strings_length, len(content_area))
+    
+    string_table = ''.join(strings).encode('utf-8')
+    header = BINARY_MAGIC + struct.pack(
+        '<HxxII', BINARY_VERSION, len(messages_list), len(string_table))
+    return header + bytes(index) + string_table + bytes(content_area)
+    
+    
+def decode_binary_messages(data):
+    # The inverse of encode_binary_messages: returns a messages list.
+    
+    if data[:4] != BINARY_MAGIC:
+        raise ValueError("Not a binary message file")
+    version, count, string_table_size = struct.unpack_from('<HxxII', data, 4)
+    if version != BINARY_VERSION:
+        raise ValueError(
+            "Unsupported binary message file version: {}".format(version))
+    
+    index_start = 16
+    string_table_start = index_start + 12*count
+    content_start = string_table_start + string_table_size
+    
+    # Work in UTF-16, so that string table positions are simple offsets.
+    string_table = data[string_table_start:content_start] \
+        .decode('utf-8').encode('utf-16-le')
+    def string_table_slice(start, end):
+        return string_table[2*start:2*end].decode('utf-16-le')
+    
+    messages_list = []
+    strings_start = 0
+    pos = content_start
+    for id_end, strings_end, content_end in struct.iter_unpack(
+      '<III', data[index_start:string_table_start]):
+        message_id = string_table_slice(strings_start, id_end)
+        text_pos = id_end
+        strings_start = strings_end
+        end = content_start + (content_end & 0x7FFFFFFF)
+        
+        if content_end & 0x80000000:
+            messages_list.append(dict(id=message_id, content=None))
+            continue
         
+        content = []
+        while pos < end:
+            item_header, = struct.unpack_from('<H', data, pos)
+            pos += 2
+            if item_header & 0x8000:
+                size = item_header & 0x7FFF
+                content.append(list(data[pos:pos+size]))
+                pos += size
+            else:
+                content.append(
+                    string_table_slice(text_pos, text_pos+item_header))
+                text_pos += item_header
+        messages_list.append(dict(id=message_id, content=content))
         
-    # A few messages depend on other messages' content to be completed.
+    return messages_list
+    
+    
+def extract_language(
+  language, use_mmap=False, use_cache=True, write_binary=False, stats=None,
+  compress=(), write_shards=False, prune=False):
+    # Read one language's messages from that language's disc files, and
+    # write them to the language's JS file. With write_binary, also write
+    # them in the binary format (js/messages/<code>.bin), and with
+    # write_shards, split into shards (js/messages/<code>/, see
+    # write_message_shards). compress lists the precompressed copies of the
+    # JS files to write (see streaming_output). With prune, only the
+    # messages that the webpage can reach from the item data are written
+    # (see prune_messages), and the rest are listed in pruned-<code>.csv.
+    #
+    # With use_cache, a language whose disc files, lookup files and parser
+    # version are all unchanged since the last run is skipped entirely. If
+    # only the lookup files changed, the parsed messages are loaded from the
+    # cache instead of re-reading the disc files.
     
-    for msg_id, d in lookup['msg_in_msg'].items():
-        msg_to_complete = msg_id_lookup[msg_id]
-        text_to_replace = d['_placeholder']
-        replacement_texts = dict()
-        replacement_text_lengths = dict()
+    lang_code = language['code']
+    msg_filename = '../../js/messages/{code}.js'.format(code=lang_code)
+    binary_filename = '../../js/messages/{code}.bin'.format(code=lang_code)
+    shard_directory = '../../js/messages/{code}'.format(code=lang_code)
+    manifest_filename = os.path.join(
+        shard_directory, SHARD_MANIFEST_FILENAME)
+    report_filename = 'pruned-{code}.csv'.format(code=lang_code)
+    
+    with timed_stage(stats, 'hash'):
+        parse_key = language_parse_key(language)
+        output_options = list(compress)
+        input_filenames = list(LOOKUP_FILENAMES)
+        if write_binary:
+            output_options.append('binary')
+        if write_shards:
+            output_options.append('shards')
+        if prune:
+            output_options.append('prune')
+            input_filenames.extend(
+                [ITEM_DETAILS_FILENAME, ITEM_MESSAGES_FILENAME])
+        output_key = hash_files(
+            input_filenames, parse_key, *output_options)
+    
+    # The optional outputs have to be there exactly when they're asked for.
+    # Otherwise there are old ones to remove (the webpage would load them),
+    # or missing ones to write.
+    if use_cache and read_cache_stamp(lang_code) == output_key \
+      and os.path.exists(msg_filename) \
+      and os.path.exists(binary_filename) == bool(write_binary) \
+      and os.path.isdir(shard_directory) == bool(write_shards) \
+      and os.path.exists(manifest_filename) == bool(write_shards) \
+      and os.path.exists(report_filename) == bool(prune):
+        print("{} is up to date".format(msg_filename))
+        count_stat(stats, 'up_to_date')
+        return
+    
+    messages_list = read_language_messages(
+        language, use_mmap, use_cache, parse_key, stats
+    )
+    count_message_stats(stats, messages_list)
+    
+    if prune:
+        with timed_stage(stats, 'prune'):
+            messages_list, dropped, missing_ids = prune_messages(
+                messages_list, read_root_message_ids(), make_lookup())
+            counts_by_zone = write_prune_report(
+                report_filename, dropped, missing_ids)
+        count_stat(stats, 'kept_messages', len(messages_list))
+        count_stat(stats, 'pruned_messages', len(dropped))
+        count_stat(stats, 'missing_root_messages', len(missing_ids))
+        top_zones = ', '.join(
+            "{} ({})".format(zone or "<no zone>", count)
+            for zone, count in counts_by_zone.most_common(5))
+        print("Kept {} of {} messages; {} pruned, listed in {}: {}".format(
+            len(messages_list), len(messages_list) + len(dropped),
+            len(dropped), report_filename, top_zones or "none"))
+        if missing_ids:
+            print("** No message for {} ids that the item data uses,"
+                  " like {}".format(len(missing_ids), missing_ids[0]))
+    elif os.path.exists(report_filename):
+        os.remove(report_filename)
         
-        for case, v in d.items():
-            if case == '_placeholder':
-                replacement_texts[case] = v
-                replacement_text_lengths[case] = 0
-                continue
-            replacement_msg_id = v
-            msg = msg_id_lookup[replacement_msg_id]
-            # We'll assume each replacement message only has 1 box and 1 case.
-            text = msg['boxes'][0]['text']
-            # Build a dict of the replacement text for each case.
-            # (Every known msg_in_msg instance also has multiple cases.)
-            replacement_texts[case] = text
-            # Build a dict of the replacement text length for each case.
-            replacement_text_lengths[case] = len(text)
-        
-        for box in msg_to_complete['boxes']:
-            # We'll assume that a box awaiting message completion does not
-            # already have multiple cases established. If it did,
-            # we'd likely have a case of multiple dimensions of cases, which
-            # we don't know how to handle anyway.
-            if 'text' not in box:
-                continue
-            if text_to_replace not in box['text']:
-                continue
-                
-            # Count how many times the to-be-replaced text appears.
-            num_occurrences = box['text'].count(text_to_replace)
+    # Write message data in a JS file. Encoding and writing are interleaved,
+    # so they're timed together.
+    with timed_stage(stats, 'write'):
+        write_messages_js(msg_filename, lang_code, messages_list, compress)
+    record_size(stats, 'messages_js', msg_filename)
+    for ext in compress:
+        record_size(
+            stats, 'messages_js_' + ext, msg_filename + '.' + ext)
+    
+    if write_binary:
+        with timed_stage(stats, 'binary_encode'):
+            binary_data = encode_binary_messages(messages_list)
+        with timed_stage(stats, 'write'):
+            write_file_atomically(binary_filename, binary_data)
+        record_size(stats, 'messages_bin', binary_filename)
+        print("{}: {} bytes ({} bytes as JS)".format(
+            binary_filename, len(binary_data),
+            os.path.getsize(msg_filename)))
+    elif os.path.exists(binary_filename):
+        # Don't leave a binary file with old messages around; the webpage
+        # would load it instead of the JS file.
+        os.remove(binary_filename)
+        
+    if write_shards:
+        with timed_stage(stats, 'write_shards'):
+            shard_names = write_message_shards(
+                shard_directory, lang_code, messages_list, compress)
+        count_stat(stats, 'shards', len(shard_names))
+        record_size(stats, 'shard_manifest_js', manifest_filename)
+    elif os.path.isdir(shard_directory):
+        # Same for old shards.
+        shutil.rmtree(shard_directory)
+    
+    # Frames precomputed from the old messages are out of date now. The
+    # --process step writes new ones.
+    frames_filename = '../../js/messageframes/{code}.js'.format(code=lang_code)
+    for filename in [frames_filename] + [
+      frames_filename + '.' + ext for ext in COMPRESSION_FORMATS]:
+        if os.path.exists(filename):
+            os.remove(filename)
+    
+    # Record what this output was built from.
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    write_file_atomically(
+        os.path.join(CACHE_DIRECTORY, 'messages-{}.stamp'.format(lang_code)),
+        output_key,
+    )
+        
+        
+def run_language_job(
+  language, use_mmap, use_cache, write_binary=False, compress=(),
+  write_shards=False, prune=False, capture_output=True):
+    # Run extract_language, catching any error so that one bad language
+    # doesn't take down the others.
+    # Returns (language code, printed output, error traceback or None,
+    # build stats).
+    # When capture_output is True, anything the extraction prints is
+    # collected and returned instead, so that output from worker processes
+    # doesn't get interleaved.
+    output = io.StringIO()
+    error = None
+    stats = new_stats()
+    with contextlib.ExitStack() as stack:
+        if capture_output:
+            stack.enter_context(contextlib.redirect_stdout(output))
+        try:
+            extract_language(
+                language, use_mmap, use_cache, write_binary, stats,
+                compress, write_shards, prune)
+        except Exception:
+            error = traceback.format_exc()
+    return language['code'], output.getvalue(), error, stats
+    
+    
+def build_message_boxes(message, lookup, escape_types=None):
+    # Fill in the message's boxes from its content: text, char counts and
+    # pause lengths per box, split by case where needed.
+    # escape_types is an optional dict of already decoded escape types, as
+    # returned by decode_escapes; escapes not in it get added to it.
+    
+    content = message['content']
+    
+    if content is None:
+        message['text_display'] = "<Null message>"
+        message['boxes'] = None
+        return
+        
+    boxes = [Box()]
+    
+    for item in content:
+        if type(item) == str:
+            # Text.
             
-            replacement_text_char_counts = dict()
-            for case, length in replacement_text_lengths.items():
-                replacement_text_char_counts[case] = length * num_occurrences
+            # A message box break seems to always be followed by a
+            # newline character, but in this situation the newline
+            # doesn't affect the time the box text takes to scroll.
+            # So we won't count this newline as a character for our
+            # purposes.
+            # Note that at the start of a box, there is no possibility for
+            # multiple cases yet, since we only know to add multiple cases
+            # after a particular escape sequence (number, player name,
+            # etc.). So that simplifies the check.
+            newline_after_box_break = (
+                item.startswith('\n') and boxes[-1].is_empty()
+            )
+            if newline_after_box_break:
+                item = item[1:]
             
-            # Update char counts and establish multiple cases in the box dict.
-            add_to_box(box, 'chars', replacement_text_char_counts)
+            boxes[-1].add_text(item)
+            boxes[-1].add_chars(len(item))
+        else:
+            # Escape sequence, as a list of byte values.
+            escape_bytes = bytes(item)
+            name = None
+            if escape_types is not None:
+                name = escape_types.get(escape_bytes)
+                if name is None:
+                    name = escape_type(escape_bytes)
+                    escape_types[escape_bytes] = name
+            handle_escape_sequence(
+                escape_bytes, boxes, lookup, message['id'], name=name
+            )
             
-            # Now that the box dict has multiple cases, updating the text will
-            # be easier.
-            for case, box_for_case in box.items():
-                box_for_case['text'] = box_for_case['text'].replace(
-                    text_to_replace, replacement_texts[case]
+    message['boxes'] = boxes
+    
+    
+def complete_msg_in_msg(message, d, replacement_texts):
+    # Fill in the parts of a message that depend on other messages' content.
+    # d is one of the message's msg_in_msg entries, and replacement_texts
+    # maps message ids to the text of their first box.
+    
+    text_to_replace = d['_placeholder']
+    case_texts = dict()
+    case_text_lengths = dict()
+    
+    for case, v in d.items():
+        if case == '_placeholder':
+            case_texts[case] = v
+            case_text_lengths[case] = 0
+            continue
+        if v not in replacement_texts:
+            raise ValueError(
+                "Message {} refers to message {}, which has no text.".format(
+                    message['id'], v
                 )
-                
-                
-    # Complete the messages' information.
+            )
+        # We'll assume each replacement message only has 1 box and 1 case.
+        text = replacement_texts[v]
+        # Build a dict of the replacement text for each case.
+        # (Every known msg_in_msg instance also has multiple cases.)
+        case_texts[case] = text
+        # Build a dict of the replacement text length for each case.
+        case_text_lengths[case] = len(text)
     
-    for i, m in enumerate(messages):
+    for box in message['boxes']:
+        # A box that already has multiple cases must have gotten them from
+        # another msg_in_msg entry with the same cases (e.g. a second kind
+        # of player name). Its placeholder case still has the placeholder
+        # text in it, so we can count from there.
+        if box.cases is not None and '_placeholder' not in box.cases:
+            continue
+        box_text = box.text()
+        if text_to_replace not in box_text:
+            continue
+            
+        # Count how many times the to-be-replaced text appears.
+        num_occurrences = box_text.count(text_to_replace)
+        
+        replacement_text_char_counts = dict()
+        for case, length in case_text_lengths.items():
+            replacement_text_char_counts[case] = length * num_occurrences
         
-        boxes = m['boxes']
+        # Update char counts and establish multiple cases in the box.
+        box.add_chars(replacement_text_char_counts)
+        
+        # Now that the box has multiple cases, update each case's text.
+        box.replace_text(text_to_replace, case_texts)
+            
+            
+def complete_message(message, lang_code, lookup):
+    # Compute box lengths, frames, and display strings for a message whose
+    # boxes are all filled in.
+    
+    boxes = message['boxes']
+    
+    if not boxes:
+        # Null message.
+        # text_display was already handled.
+        message['boxes_display'] = "<N/A>"
+        message['frames'] = None
+        message['frames_display'] = "<N/A>"
+        return
         
-        if not boxes:
-            # Blank/null message.
-            # text_display was already handled in either case.
-            m['boxes_display'] = "<N/A>"
-            m['frames'] = None
-            m['frames_display'] = "<N/A>"
+    if message['content'] == []:
+        message['text_display'] = "<Blank message>"
+    else:
+        box_texts = [box.text() for box in boxes]
+        message['text_display'] = '\n\n'.join(box_texts)
+    
+    message_cases = []
+    
+    for box in boxes:
+        compute_box_length(box, lang_code, lookup)
+        if box.cases is not None:
+            # Box has multiple cases.
+            message_cases.extend(box.cases)
+            for case in message_cases:
+                if case not in box.cases:
+                    raise ValueError(
+                        "Different boxes in a message have different cases!"
+                        " Needs multiple dimensions of cases, and we don't"
+                        " know how to handle that yet."
+                    )
+            
+    message['boxes_display'] = boxes_to_display(boxes)
+    
+    compute_message_frames(message, lookup)
+    
+    
+def process_messages(lang_code, messages, lookup, complete=True):
+    # Generator pipeline: takes messages as {id, content} dicts (as returned
+    # by read_messages_from_disc_files), and yields them one by one with
+    # boxes, frames and display strings filled in.
+    # If complete is False, only the boxes (text, chars and pause lengths)
+    # are filled in, for callers that compute lengths and frames themselves.
+    #
+    # Most messages are yielded as soon as they're processed. The few
+    # messages containing other messages' text (player names, galaxy names)
+    # are held back until everything else has gone by, since we don't know
+    # what order the messages come in. Only the first-box text of the
+    # messages they refer to is kept around for that.
+    
+    # Per-language state, so that the shared lookup isn't modified.
+    lookup = dict(lookup)
+    lookup['msg_in_msg'] = dict()
+    # Each distinct escape sequence only needs decoding once.
+    escape_types = dict()
+    
+    # Messages whose text may be needed by other messages.
+    referenced_ids = set([
+        'System_PlayerName000', 'System_PlayerName001',
+        'System_PlayerName100', 'System_PlayerName101',
+    ])
+    for d in lookup['numbersNames'].values():
+        if d['_type'] == 'message':
+            referenced_ids.update(
+                v for k, v in d.items() if not k.startswith('_')
+            )
+    replacement_texts = dict()
+    deferred_messages = []
+    
+    for m in messages:
+        m = dict(m)
+        build_message_boxes(m, lookup, escape_types)
+        
+        if m['id'] in referenced_ids and m['boxes'] \
+          and m['boxes'][0].cases is None:
+            replacement_texts[m['id']] = m['boxes'][0].text()
+            
+        if m['id'] in lookup['msg_in_msg']:
+            deferred_messages.append(m)
             continue
+            
+        if complete:
+            complete_message(m, lang_code, lookup)
+        yield m
         
-        box_texts = [
-            box['_placeholder']['text']
-            if 'text' not in box
-            else box['text']
-            for box in boxes
-        ]
-        m['text_display'] = '\n\n'.join(box_texts)
-        
-        message_cases = []
-        
-        for box in boxes:
-            if 'chars' not in box:
-                # Box has multiple cases.
-                for case, box_for_case in box.items():
-                    compute_box_length(box_for_case, lang_code)
-                    message_cases.append(case)
-                for case in message_cases:
-                    if case not in box:
-                        raise ValueError(
-                            "Different boxes in a message have different cases!"
-                            " Needs multiple dimensions of cases, and we don't"
-                            " know how to handle that yet."
-                        )
+    # A few messages depend on other messages' content to be completed.
+    for m in deferred_messages:
+        for d in lookup['msg_in_msg'][m['id']]:
+            complete_msg_in_msg(m, d, replacement_texts)
+        if complete:
+            complete_message(m, lang_code, lookup)
+        yield m
+        
+        
+def box_details(box):
+    # Box info to save in the message details JS file. The text is left out,
+    # since the client has the full message content already.
+    def details(i):
+        return dict(
+            chars=box.chars[i],
+            pause_length=box.pause_length,
+            length=box.lengths[i],
+        )
+    
+    if box.cases is not None:
+        return dict(
+            (case, details(i)) for i, case in enumerate(box.cases)
+        )
+    return details(0)
+    
+    
+@contextlib.contextmanager
+def streaming_output(filename, compress=()):
+    # Write a UTF-8 text file a piece at a time. Yields a function taking a
+    # string. For each format in compress ('gz', 'br'), a compressed copy
+    # (<filename>.gz, <filename>.br) is written in the same pass. The files
+    # are only put in place once they're complete, and compressed copies
+    # that weren't asked for are removed, so that a server never sends an
+    # outdated one.
+    
+    if 'br' in compress and brotli is None:
+        raise ValueError("Brotli compression needs the brotli package.")
+    
+    os.makedirs(os.path.dirname(filename) or os.curdir, exist_ok=True)
+    filenames = [filename] + [filename + '.' + ext for ext in compress]
+    
+    with contextlib.ExitStack() as stack:
+        files = [
+            stack.enter_context(open(name + '.tmp', 'wb'))
+            for name in filenames]
+        sinks = [files[0].write]
+        for ext, f in zip(compress, files[1:]):
+            if ext == 'gz':
+                # mtime=0 so that unchanged output gives an identical file.
+                gz_file = stack.enter_context(gzip.GzipFile(
+                    filename='', mode='wb', fileobj=f, mtime=0))
+                sinks.append(gz_file.write)
+            elif ext == 'br':
+                compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+                sinks.append(
+                    lambda data, f=f, compressor=compressor:
+                    f.write(compressor.process(data)))
+                stack.callback(
+                    lambda f=f, compressor=compressor:
+                    f.write(compressor.finish()))
             else:
-                compute_box_length(box, lang_code)
-                
-        m['boxes_display'] = boxes_to_display(boxes)
+                raise ValueError("Unknown compression format: " + ext)
         
-        compute_message_frames(m, lookup)
+        chunk = []
+        chunk_size = [0]
+        def flush():
+            data = ''.join(chunk).encode('utf-8')
+            del chunk[:]
+            chunk_size[0] = 0
+            for sink in sinks:
+                sink(data)
+        def write(s):
+            chunk.append(s)
+            chunk_size[0] += len(s)
+            if chunk_size[0] >= WRITE_CHUNK_SIZE:
+                flush()
         
+        yield write
+        
+        flush()
+        
+    for name in filenames:
+        os.replace(name + '.tmp', name)
+    for ext in COMPRESSION_FORMATS:
+        if ext not in compress and os.path.exists(filename + '.' + ext):
+            os.remove(filename + '.' + ext)
     
-    print_message_field_examples(
-        messages, 'text_display', "message text"
-    )
-    print_message_field_examples(
-        messages, 'boxes_display', "message boxes"
-    )
-    print_message_field_examples(
-        messages, 'frames_display', "message frames"
+    
+@contextlib.contextmanager
+def js_object_writer(js_filename, variable, lang_code, compress=()):
+    # Stream a JS file that sets window.<variable>.<code> to an object, one
+    # entry at a time. Yields a function taking (key, value). See
+    # streaming_output for compress.
+    # If lang_code isn't a plain language code (e.g. "usenglish/System" for
+    # a message shard), it's set as window.<variable>["<code>"] instead.
+    
+    if re.match(r'^\w+$', lang_code):
+        target = "window.{var}.{code}"
+    else:
+        target = "window.{var}[{code}]"
+        lang_code = json.dumps(lang_code)
+    
+    with streaming_output(js_filename, compress) as write:
+        write(
+            r"if (window.{var} === undefined)"
+            r" {{window.{var} = {{}};}}".format(var=variable)
+        )
+        write("\n")
+        write((target + " = {{").format(var=variable, code=lang_code))
+        
+        separator = [""]
+        def write_entry(key, value):
+            write(separator[0])
+            write(json.dumps(key))
+            write(":")
+            write(json.dumps(value, ensure_ascii=False))
+            separator[0] = ","
+        
+        yield write_entry
+        
+        write("};")
+    
+    
+def frame_table_entry(message):
+    # Precomputed frames for one message, for js/messageframes/<code>.js:
+    # base frames, box count, box lengths and cutscene animation time, per
+    # case if the message has cases. The client only has to add the box end
+    # timing error term.
+    
+    def entry(frames, box_lengths):
+        d = dict(
+            base=frames['base'],
+            num_boxes=frames['num_boxes'],
+            box_lengths=box_lengths,
+        )
+        if 'animation_time' in frames:
+            d['animation_time'] = frames['animation_time']
+        return d
+    
+    frames = message['frames']
+    if 'base' in frames:
+        return entry(frames, [box.lengths[0] for box in message['boxes']])
+    
+    # The '_placeholder' case is only for display.
+    return dict(
+        (case, entry(frames_for_case, [
+            box.lengths[box.case_index(case)] for box in message['boxes']
+        ]))
+        for case, frames_for_case in frames.items()
+        if case != '_placeholder'
     )
     
-    return messages
-
+    
+def write_processed_messages(
+  lang_code, processed_messages, csv_writer, compress=(), keep_ids=None):
+    # Consume the process_messages pipeline, writing a row to csv_writer for
+    # each message, and streaming the message's boxes and frames to
+    # js/messagedetails/<code>.js and its frame table entry to
+    # js/messageframes/<code>.js. Only one message is held at a time.
+    # compress is as in streaming_output. If keep_ids is given, only those
+    # messages go in the JS files (the CSV still gets every message).
+    
+    details_filename = \
+        '../../js/messagedetails/{code}.js'.format(code=lang_code)
+    frames_filename = \
+        '../../js/messageframes/{code}.js'.format(code=lang_code)
+    
+    with js_object_writer(
+      details_filename, 'messageDetails', lang_code, compress) \
+      as write_details, \
+      js_object_writer(
+      frames_filename, 'messageFrames', lang_code, compress) \
+      as write_frames:
+        
+        for m in processed_messages:
+            csv_writer.writerow([
+                m['id'], lang_code,
+                m['boxes_display'], m['frames_display'], m['text_display'],
+            ])
+            if keep_ids is not None and m['id'] not in keep_ids:
+                continue
+            
+            write_details(m['id'], dict(
+                boxes=[box_details(b) for b in m['boxes']]
+                if m['boxes'] else None,
+                frames=m['frames'],
+            ))
+            if m['frames'] is not None:
+                write_frames(m['id'], frame_table_entry(m))
 
 
 if __name__ == '__main__':
     
-    languages = []
-    reader = csv.reader(open('language-files.txt', 'r'), delimiter=',')
-    for row in reader:
-        lang_code = row[0]
-        message_bmg_directory = row[1]
-        languages.append(dict(code=lang_code, directory=message_bmg_directory))
+    parser = argparse.ArgumentParser(
+        description="Extract SMG1 message data from disc files.")
+    parser.add_argument(
+        '--mmap', action='store_true',
+        help="Memory-map the disc files and decode them in bulk, instead of"
+        " reading them a few bytes at a time.")
+    parser.add_argument(
+        '--jobs', type=int, default=1, metavar='N',
+        help="Extract up to N languages at once, in worker processes.")
+    parser.add_argument(
+        '--force', action='store_true',
+        help="Ignore the build cache and re-extract every language.")
+    parser.add_argument(
+        '--binary', action='store_true',
+        help="Also write each language's messages in the compact binary"
+        " format, js/messages/<code>.bin, which the webpage loads instead"
+        " of the JS file when it's there.")
+    parser.add_argument(
+        '--process', action='store_true',
+        help="Also compute boxes and frames for every message, and write"
+        " them to messages.csv, js/messagedetails/<code>.js and the"
+        " webpage's frame tables, js/messageframes/<code>.js.")
+    parser.add_argument(
+        '--shards', action='store_true',
+        help="Also write each language's messages split into shards by zone"
+        " prefix, js/messages/<code>/, so that the webpage only has to load"
+        " the messages that a route needs.")
+    parser.add_argument(
+        '--prune', action='store_true',
+        help="Only write the messages that the webpage can use: the item"
+        " messages and star names from the item data, and the messages"
+        " those include (player names, etc.). The rest are listed in"
+        " pruned-<code>.csv.")
+    parser.add_argument(
+        '--indexed', action='store_true',
+        help="Also write every language's messages with integer ids in place"
+        " of message ids, plus one shared table of the ids and the items'"
+        " messages, to js/indexed/. The webpage loads these instead of the"
+        " other message files when they're there.")
+    parser.add_argument(
+        '--compress', action='append', choices=COMPRESSION_FORMATS,
+        default=[], metavar='FORMAT',
+        help="Also write a gzip (gz) or brotli (br) compressed copy of each"
+        " language's JS files, for a static server to send precompressed."
+        " Can be given more than once. br needs the brotli package.")
+    parser.add_argument(
+        '--profile', action='store_true',
+        help="Print time spent per stage, message/escape counts and output"
+        " sizes for each language.")
+    parser.add_argument(
+        '--report', metavar='FILE',
+        help="Write the --profile statistics to a JSON file.")
+    args = parser.parse_args()
+    if 'br' in args.compress and brotli is None:
+        parser.error("--compress br needs the brotli package.")
+    compress = tuple(sorted(set(args.compress)))
     
-    # messages is a dict whose entries are auto-initialized to an empty dict.
-    # Will be indexed by message id, and then by language code.
-    messages = collections.defaultdict(dict)
+    build_start = time.perf_counter()
+    languages = read_language_files()
     
-    for language in languages:
-        
-        messages = dict()
-        
-        # Read this language's messages from this language's disc files
-        lang_code = language['code']
-        bmg_filename = os.path.join(language['directory'], 'message.bmg')
-        tbl_filename = os.path.join(language['directory'], 'messageid.tbl')
-        with open(bmg_filename, 'rb') as bmg, open(tbl_filename, 'rb') as tbl:
-            messages_list = read_messages_from_disc_files(bmg, tbl)
-            
-        for m in messages_list:
-            messages[m['id']] = m['content']
-            
-        # Write message data in a JS file.
-        msg_filename = '../../js/messages/{code}.js'.format(code=lang_code)
-        # Make necessary directories if they don't exist. 
-        os.makedirs(os.path.dirname(msg_filename), exist_ok=True)
-        with open(msg_filename, 'w', encoding='utf-8') as f:
-            f.write(
-                r"if (window.messages === undefined) {window.messages = {};}"
-            )
-            f.write("\n")
-            f.write(
-                "window.messages.{code} = {message_json};".format(
-                    code=lang_code,
-                    message_json=json.dumps(messages, ensure_ascii=False),
-                )
-            )
+    if args.jobs > 1:
+        # Languages are independent of each other, so extract them in
+        # worker processes. Results come back in language order no matter
+        # which worker finishes first. (Imported here, since it's slow to
+        # import and most runs don't need it.)
+        import concurrent.futures
+        with concurrent.futures.ProcessPoolExecutor(args.jobs) as executor:
+            results = list(executor.map(
+                run_language_job, languages,
+                itertools.repeat(args.mmap), itertools.repeat(not args.force),
+                itertools.repeat(args.binary), itertools.repeat(compress),
+                itertools.repeat(args.shards), itertools.repeat(args.prune),
+            ))
+    else:
+        results = []
+        for language in languages:
+            results.append(run_language_job(
+                language, args.mmap, not args.force, args.binary, compress,
+                args.shards, args.prune, capture_output=False
+            ))
+    
+    language_stats = collections.OrderedDict()
+    failed_lang_codes = []
+    for lang_code, output, error, stats in results:
+        language_stats[lang_code] = stats
+        if output:
+            print("[{}]".format(lang_code))
+            print(output, end='')
+        if error:
+            print("** Failed to extract {}:\n{}".format(lang_code, error))
+            failed_lang_codes.append(lang_code)
+    if failed_lang_codes:
+        raise SystemExit(
+            "Extraction failed for: " + ', '.join(failed_lang_codes)
+        )
+    
+    # Stats for steps that aren't per language.
+    build_stats = new_stats()
     
     # Make message-data lookup structure with various info (color/icon escape
     # codes, which messages force slow speed, etc.)
-    lookup = make_lookup()
-    lookup_filename = '../../js/messagelookup.js'
-    with open(lookup_filename, 'w', encoding='utf-8') as f:
-        f.write(
-            "window.messageLookup = {lookup_json};".format(
-                lookup_json=json.dumps(lookup, ensure_ascii=False),
-            )
-        )
+    with timed_stage(build_stats, 'lookup'):
+        lookup = make_lookup()
+    
+    if args.indexed:
+        with timed_stage(build_stats, 'indexed'):
+            indexed_filenames = write_indexed_messages(
+                languages, lookup, args.mmap, not args.force, args.prune,
+                compress)
+        for filename in indexed_filenames:
+            record_size(
+                build_stats,
+                'indexed_' + os.path.basename(filename).replace('.', '_'),
+                filename)
+    elif os.path.isdir(INDEXED_DIRECTORY):
+        # Don't leave old indexed files around; the webpage would load them
+        # instead of the current messages.
+        shutil.rmtree(INDEXED_DIRECTORY)
     
         
-    raise ValueError("Rest of this program doesn't work anymore, but will be ported")
-         
+    if args.process:
+        # Compute boxes and frames for every message of every language.
+        # Results are streamed out one message at a time: a row per message
+        # and language in messages.csv (a human readable spreadsheet),
+        # js/messagedetails/<code>.js for webpage programming, and
+        # js/messageframes/<code>.js, which the webpage uses instead of
+        # computing every message's frames itself.
+        # newline='' prevents tons of extra blank rows from being written
+        with open('messages.csv', 'w', newline='', encoding='utf-8') \
+          as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['id', 'language', 'boxes', 'frames', 'text'])
+            for language in languages:
+                lang_code = language['code']
+                stats = language_stats[lang_code]
+                with timed_stage(stats, 'process_load'):
+                    messages_list = read_language_messages(
+                        language, args.mmap, not args.force
+                    )
+                keep_ids = None
+                if args.prune:
+                    with timed_stage(stats, 'prune'):
+                        kept, _, _ = prune_messages(
+                            messages_list, read_root_message_ids(), lookup)
+                    keep_ids = set(m['id'] for m in kept)
+                # Processing and writing are interleaved, so they're timed
+                # together.
+                with timed_stage(stats, 'process_and_write'):
+                    write_processed_messages(
+                        lang_code,
+                        process_messages(lang_code, messages_list, lookup),
+                        writer, compress, keep_ids,
+                    )
+                record_size(
+                    stats, 'messagedetails_js',
+                    '../../js/messagedetails/{}.js'.format(lang_code))
+                record_size(
+                    stats, 'messageframes_js',
+                    '../../js/messageframes/{}.js'.format(lang_code))
+                for ext in compress:
+                    for name in ['messagedetails', 'messageframes']:
+                        record_size(
+                            stats, '{}_js_{}'.format(name, ext),
+                            '../../js/{}/{}.js.{}'.format(
+                                name, lang_code, ext))
+        record_size(build_stats, 'messages_csv', 'messages.csv')
     
-         
-    for language in languages:
-        messages[language['code']] = process_messages(
-            language['code'], messages[language['code']], lookup
+    # Written last, since it lists which of the other message files are
+    # there.
+    lookup_filename = '../../js/messagelookup.js'
+    with timed_stage(build_stats, 'write'):
+        write_file_atomically(
+            lookup_filename,
+            "window.messageLookup = {lookup_json};\n"
+            "window.messageFiles = {files_json};".format(
+                lookup_json=json.dumps(lookup, ensure_ascii=False),
+                files_json=json.dumps(message_files(
+                    language['code'] for language in languages)),
+            )
         )
-            
-    first_lang_code = languages[0]['code']
+    record_size(build_stats, 'messagelookup_js', lookup_filename)
     
-    # Write CSV file - for a human readable spreadsheet
-    csv_columns = [
-        ('boxes', 'boxes_display'),
-        ('frames', 'frames_display'),
-        ('text', 'text_display'),
-    ]
-    headers = ['id']
-    for language in languages:
-        for csv_key, dict_key in csv_columns:
-            headers.append(language['code'] + ' ' + csv_key)
-    # newline='' prevents tons of extra blank rows from being written
-    with open('messages.csv', 'w', newline='') as csv_file:
-        writer = csv.writer(csv_file)
-        writer.writerow(headers)
-        for message in messages:
-            row = []
-            row.append(message[first_lang_code]['id'])
-            for language in languages:
-                for csv_key, dict_key in csv_columns:
-                    # Add the item to CSV, while removing from the dict
-                    # so that it's not included in the JSON later.
-                    row.append(message[language['code']].pop(dict_key))
-            writer.writerow(row)
-        
-        
-    # Write JS file (as "window.var = <messages as JSON>") - for webpage
-    # programming.
+    build_seconds = time.perf_counter() - build_start
     
-    # Make the JSON an object indexed by message id
-    json_to_write = dict([(m[first_lang_code]['id'], m) for m in messages])
-    with open('../../js/messages.js', 'w') as js_file:
-        js_file.write("window.messages = " + json.dumps(json_to_write))
+    if args.profile:
+        print()
+        for lang_code, stats in language_stats.items():
+            print_stats(stats, lang_code)
+        print_stats(build_stats, "all languages")
+        print("Total: {:.1f} ms".format(build_seconds * 1000))
         
+    if args.report:
+        report = dict(
+            total_seconds=build_seconds,
+            jobs=args.jobs,
+            languages=language_stats,
+            all_languages=build_stats,
+        )
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,786 @@
+# In: route text files (like sampleroute120.txt), item data
+# (itemdetails.csv, itemmessages.csv) and extracted messages
+# (js/messages/<code>.js, from messages/messagedata2js.py)
+# Out: validation status and text frame totals for each route, as JSON or CSV
+#
+# This is a port of the webpage's route processing (Route, Item and Message
+# in coffee/main.coffee), so that lots of routes can be scored at once
+# without loading the page.
+
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+
+DATA_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DATA_DIRECTORY, 'messages'))
+
+import messagedata2js
+from itemdata import (
+    item_requirements, parse_requirement, read_item_details,
+    read_item_messages)
+from itemdetails_csv2js import compile_item_graph
+
+
+
+NUM_AND_LEVEL_REGEX = re.compile(r'^\d+[\.|\)](.+)$')
+ACTION_AND_PARENS_NOTE_REGEX = re.compile(r'^(.+)\(.+\)$')
+
+CATEGORIES = {
+    'Any%': dict(
+        end_item_name="Bowser's Galaxy Reactor", end_requirements=[]),
+    '120 Star': dict(
+        end_item_name="Bowser's Galaxy Reactor",
+        end_requirements=[parse_requirement("120 stars")]),
+}
+
+# What the webpage's option dropdowns start out as.
+DEFAULT_ARG_SETS = [
+    dict(langCode='usenglish', character='mario', boxEndTimingError=10),
+    dict(langCode='jpjapanese', character='mario', boxEndTimingError=10),
+]
+
+
+def read_messages_js(filename):
+    # Read a js/messages/<code>.js file written by messagedata2js.py, and
+    # return the messages dict (message id -> content).
+    with open(filename, 'r', encoding='utf-8') as f:
+        text = f.read()
+    start = text.index(' = ', text.index('window.messages.')) + len(' = ')
+    return json.loads(text[start:].rstrip().rstrip(';'))
+
+
+def load_language(lang_code, messages_directory, lookup):
+    # Process one language's extracted messages, returning a dict from
+    # message id to the processed message (boxes and frames).
+    content = read_messages_js(
+        os.path.join(messages_directory, lang_code + '.js'))
+    messages_list = [
+        dict(id=message_id, content=c) for message_id, c in content.items()
+    ]
+    processed = dict()
+    for m in messagedata2js.process_messages(lang_code, messages_list, lookup):
+        processed[m['id']] = m
+    return processed
+
+
+def first_box_text(message, character):
+    # Text of a message's first box, for the given character.
+    box = message['boxes'][0]
+    if box.cases is not None and character in box.cases:
+        return box.text(character)
+    return box.text()
+
+
+def add_aliases(aliases):
+    # Add more human-readable aliases for various actions (mostly levels).
+    # Each action already has an alias for its own name.
+    # Same as Action.addAliases in the webpage.
+
+    def replace_last_char(s1, s2):
+        return s1[:-1] + s2
+
+    def add_alias(alias, item):
+        aliases[alias.lower()] = item
+
+    def get_aliases(bool_func=None):
+        # Aliases passing the boolean test, as a snapshot so that we can add
+        # aliases while going through them.
+        return [
+            (alias, item) for alias, item in aliases.items()
+            if bool_func is None or bool_func(alias)
+        ]
+
+    for alias, item in get_aliases(lambda a: a.startswith("bowser's ")):
+        # Can omit this part
+        add_alias(alias.replace("bowser's ", ""), item)
+
+    for alias, item in get_aliases(lambda a: a.startswith("bowser jr.'s ")):
+        # Can omit this part
+        add_alias(alias.replace("bowser jr.'s ", ""), item)
+
+    # Accept an alias ending in " 1" for single-star galaxies.
+    # The webpage passes an array of star endings to endsWith(), which turns
+    # it into the string "1,2,3,h,g,l,c,p", so in practice every level gets
+    # this alias. Do the same so that the same route text is accepted.
+    star_endings = "1,2,3,h,g,l,c,p"
+    for alias, item in get_aliases(lambda a: not a.endswith(star_endings)):
+        if item['type'] == 'Level':
+            add_alias(alias + " 1", item)
+
+    for alias, item in get_aliases(lambda a: a.endswith(" c")):
+        # Add alias that replaces c with 4, or comet
+        add_alias(replace_last_char(alias, "4"), item)
+        add_alias(replace_last_char(alias, "comet"), item)
+
+    for alias, item in get_aliases(lambda a: a.endswith(" p")):
+        add_alias(replace_last_char(alias, "100"), item)
+        add_alias(replace_last_char(alias, "purples"), item)
+        add_alias(replace_last_char(alias, "purple coins"), item)
+        add_alias(replace_last_char(alias, "purple comet"), item)
+        if alias == "gateway p":
+            add_alias(replace_last_char(alias, "2"), item)
+        else:
+            add_alias(replace_last_char(alias, "5"), item)
+
+    for alias, item in get_aliases():
+        if alias in ["good egg l", "honeyhive l", "buoy base g"]:
+            add_alias(replace_last_char(alias, "h"), item)
+
+        if alias in ["battlerock l", "dusty dune g"]:
+            add_alias(replace_last_char(alias, "h2"), item)
+            add_alias(replace_last_char(alias, "hidden 2"), item)
+            add_alias(replace_last_char(alias, "hidden star 2"), item)
+            add_alias(replace_last_char(alias, "s2"), item)
+            add_alias(replace_last_char(alias, "secret 2"), item)
+            add_alias(replace_last_char(alias, "secret star 2"), item)
+            add_alias(replace_last_char(alias, "7"), item)
+
+        if alias == "battlerock l":
+            add_alias(replace_last_char(alias, "g"), item)
+
+    for alias, item in get_aliases(lambda a: a.endswith(" h")):
+        add_alias(replace_last_char(alias, "hidden"), item)
+        add_alias(replace_last_char(alias, "hidden star"), item)
+        add_alias(replace_last_char(alias, "s"), item)
+        add_alias(replace_last_char(alias, "secret"), item)
+        add_alias(replace_last_char(alias, "secret star"), item)
+
+        if alias == "buoy base h":
+            add_alias(replace_last_char(alias, "2"), item)
+        else:
+            add_alias(replace_last_char(alias, "6"), item)
+
+    for alias, item in get_aliases(lambda a: a.endswith(" l")):
+        add_alias(replace_last_char(alias, "luigi"), item)
+        add_alias(replace_last_char(alias, "luigi star"), item)
+
+    for alias, item in get_aliases(lambda a: a.endswith(" g")):
+        add_alias(replace_last_char(alias, "green"), item)
+        add_alias(replace_last_char(alias, "green star"), item)
+
+
+def load_route_data(lang_codes, messages_directory=None):
+    # Load everything needed to evaluate routes: route items, their
+    # aliases, and processed messages for the given languages.
+    # usenglish is always loaded, since star names are recognized in
+    # usenglish.
+
+    if messages_directory is None:
+        messages_directory = os.path.join(
+            DATA_DIRECTORY, os.pardir, 'js', 'messages')
+
+    lookup = messagedata2js.make_lookup(
+        os.path.join(DATA_DIRECTORY, 'messages'))
+    languages = dict()
+    for lang_code in ['usenglish'] + list(lang_codes):
+        if lang_code not in languages:
+            languages[lang_code] = load_language(
+                lang_code, messages_directory, lookup)
+
+    item_details = read_item_details(
+        os.path.join(DATA_DIRECTORY, 'itemdetails.csv'))
+    item_messages = read_item_messages(
+        os.path.join(DATA_DIRECTORY, 'itemmessages.csv'))
+    graph = compile_item_graph(item_details)
+    requirements = item_requirements(item_details)
+
+    items = dict()
+    items_by_id = dict()
+    aliases = dict()
+    star_names = dict()
+
+    for item_id, item_name in enumerate(graph['names']):
+        details = item_details[item_name]
+        if details['type'] not in ['Level', 'Action', 'Event']:
+            print("Invalid item type: " + details['type'], file=sys.stderr)
+            continue
+
+        # Requirements as compiled by compile_item_graph. Completed items
+        # are tracked as a bitmask of item ids, so the required items are
+        # too.
+        required_mask = 0
+        for req_id in graph['requirements'][item_id]:
+            required_mask |= 1 << req_id
+
+        item = dict(
+            id=item_id,
+            name=item_name,
+            type=details['type'],
+            requirements=requirements[item_name],
+            required_mask=required_mask,
+            min_stars=graph['min_stars'][item_id],
+            less_than_stars=graph['less_than_stars'][item_id],
+            unfulfillable=graph['unfulfillable'][item_id],
+            star_name=details['star_name'],
+            messages=[
+                dict(
+                    id=m['id'],
+                    case=m.get('case'),
+                    skippable=m.get('skippable', False),
+                )
+                for m in item_messages.get(item_name, [])
+            ],
+        )
+        items[item_name] = item
+        items_by_id[item_id] = item
+
+        if item['type'] in ['Level', 'Action']:
+            aliases[item_name.lower()] = item
+
+        if item['type'] == 'Level' and item['star_name']:
+            # Star names can be given in place of level names.
+            star_name_message = languages['usenglish'][item['star_name']]
+            for character in ['mario', 'luigi']:
+                star_name = first_box_text(star_name_message, character)
+                star_names[star_name.lower()] = item
+
+    add_aliases(aliases)
+
+    # Following items, by item and by star counts.
+    for item_id, item in items_by_id.items():
+        item['following'] = [
+            items_by_id[following_id]
+            for following_id in graph['following'][item_id]
+            if following_id in items_by_id
+        ]
+    following_star_counts, following_green_star_counts = [
+        dict(
+            (count, [
+                items_by_id[following_id] for following_id in following_ids
+                if following_id in items_by_id])
+            for count, following_ids in graph[key].items())
+        for key in ['following_star_counts', 'following_green_star_counts']
+    ]
+
+    return dict(
+        items=items,
+        item_ids=dict(
+            (name, item_id) for item_id, name in enumerate(graph['names'])),
+        following_star_counts=following_star_counts,
+        following_green_star_counts=following_green_star_counts,
+        aliases=aliases,
+        star_names=star_names,
+        languages=languages,
+        # Frames per (item name, arg set), filled in as needed.
+        item_frames_cache=dict(),
+    )
+
+
+def line_to_action(line, route_data):
+    # Make item recognition non-case-sensitive
+    line = line.lower()
+    aliases = route_data['aliases']
+    star_names = route_data['star_names']
+
+    if line.startswith('*'):
+        # Assumed to be just a comment, e.g. "* Back to start of observatory"
+        return 'comment'
+    if line.startswith('>'):
+        # Assumed to be an action with an exact name, e.g. "> Luigi letter 2".
+        line = line[1:].strip()
+
+    # Check if line begins with a star number like "5." or "17)"
+    # If so, remove it
+    match = NUM_AND_LEVEL_REGEX.match(line)
+    if match:
+        line = match.group(1).strip()
+
+    # Check if we have an alias match
+    if line in aliases:
+        return aliases[line]
+
+    # Check if line ends with a parenthesized thing like "(skip cutscenes)"
+    # If so, remove it
+    match = ACTION_AND_PARENS_NOTE_REGEX.match(line)
+    if match:
+        line = match.group(1).strip()
+
+    # Check again if we have an alias match
+    if line in aliases:
+        return aliases[line]
+
+    # Check for just the star name
+    if line in star_names:
+        return star_names[line]
+
+    # Check if there's a dash, and if so, see if we can find a
+    # galaxy+number - starname match like "Good Egg 1 - Dino Piranha".
+    # Either one will do, don't need both correct.
+    # Try all the dashes if there's more than one.
+    index_of_dash = line.find('-')
+
+    while index_of_dash != -1:
+
+        possible_galaxy_and_num = line[:index_of_dash].strip()
+        if possible_galaxy_and_num in aliases:
+            return aliases[possible_galaxy_and_num]
+
+        possible_star_name = line[index_of_dash+1:].strip()
+        if possible_star_name in star_names:
+            return star_names[possible_star_name]
+
+        index_of_dash = line.find('-', index_of_dash+1)
+
+    # Tried everything we could think of
+    return None
+
+
+def parse_route(text, route_data):
+    # Returns a route dict with the route's name, its actions, and any
+    # status messages from parsing.
+    lines = re.split(r'\r\n|[\n\r]', text)
+    route = dict(name=lines[0], actions=[], status=[])
+
+    for line in lines[1:]:
+        line = line.strip()
+        if line == "":
+            # Blank line
+            continue
+
+        action = line_to_action(line, route_data)
+        if not action:
+            route['status'].append(
+                "Could not recognize as a level/action: " + line)
+            break
+        elif action == 'comment':
+            # Just a comment line in the text route; ignore it.
+            continue
+
+        route['actions'].append(action)
+
+    return route
+
+
+def fulfilled_requirement(req, completed, star_count, item_ids):
+    # req is a Requirement from itemdata.parse_requirement. completed is a
+    # bitmask of completed item ids, and item_ids is item name -> id.
+    # Way 1 to satisfy requirement: req names a completed action
+    if req.name is not None:
+        return bool(completed >> item_ids[req.name] & 1)
+
+    # Way 2: it's a >= stars req and we've got it
+    if req.kind == 'stars':
+        return star_count >= req.count
+
+    # Way 3: it's a < stars req and we've got it
+    if req.kind == 'less_than_stars':
+        return star_count < req.count
+
+    # Way 4: it's a star bits req
+    # TODO: Actually check this. For now we have no way of checking possible
+    # or probable star bit count, so we skip the check.
+    return req.kind == 'star_bits'
+
+
+def fulfilled_requirements(item, completed, star_count):
+    # Same as checking fulfilled_requirement for each of the item's
+    # requirements, using the requirements compiled by compile_item_graph.
+    if item['unfulfillable']:
+        return False
+    if completed & item['required_mask'] != item['required_mask']:
+        return False
+    if star_count < item['min_stars']:
+        return False
+    less_than_stars = item['less_than_stars']
+    return less_than_stars is None or star_count < less_than_stars
+
+
+def is_end_of_route(item, category, completed, star_count, item_ids):
+    # If the run only ends on a particular route item, check for that
+    # route item
+    end = CATEGORIES[category]
+    if end['end_item_name'] and item['name'] != end['end_item_name']:
+        return False
+
+    # Check that other end requirements are met
+    for req in end['end_requirements']:
+        if not fulfilled_requirement(req, completed, star_count, item_ids):
+            return False
+
+    return True
+
+
+def new_route_state():
+    # Everything that's tracked while going through a route's actions.
+    return dict(
+        star_count=0,
+        green_star_count=0,
+        expected_action_name=None,
+        # Bitmask of completed item ids
+        completed=0,
+        # luigi_stars goes up to 3: Good Egg L, Battlerock L, Honeyhive L
+        luigi_status=dict(
+            talked_at_garage=False, luigi_stars=0, between_stars=0),
+        # ended is set once the route reaches its end, and complete is also
+        # set if the end was reached by one of the route's own actions.
+        ended=False,
+        complete=False,
+    )
+
+
+def copy_route_state(state):
+    new_state = dict(state)
+    new_state['luigi_status'] = dict(state['luigi_status'])
+    return new_state
+
+
+def unfulfilled_requirement(action, state, route_data):
+    # Status message saying why the action can't be done at this point in
+    # the route, or None if it can.
+
+    # Check requirements for this item. Only go through the requirements
+    # one by one if they're not all met, to find which one to report.
+    if not fulfilled_requirements(
+      action, state['completed'], state['star_count']):
+        for req in action['requirements']:
+            if not fulfilled_requirement(
+              req, state['completed'], state['star_count'],
+              route_data['item_ids']):
+                return (
+                    "'" + action['name']
+                    + "' has an unfulfilled requirement: " + req.text
+                )
+
+    # Check special requirements for Luigi events.
+    luigi_status = state['luigi_status']
+    for letter_name, luigi_stars in [
+      ("Luigi letter 2", 1), ("Luigi letter 3", 2)]:
+        if action['name'] != letter_name:
+            continue
+        if not (luigi_status['luigi_stars'] == luigi_stars
+                and luigi_status['between_stars'] >= 5):
+            return (
+                "'{}' has an unfulfilled requirement: Must have {}"
+                " and 5 in-between stars since that Luigi star."
+                " Current status: {} Luigi star(s) and {} in-between"
+                " star(s).".format(
+                    action['name'],
+                    "1 Luigi star" if luigi_stars == 1
+                    else "2 Luigi stars",
+                    luigi_status['luigi_stars'],
+                    luigi_status['between_stars'],
+                )
+            )
+
+    return None
+
+
+def add_action(state, action, category, route_data, status):
+    # Add one action, and the events it triggers, to a route state from
+    # new_route_state. Returns the route items added, or None if the action
+    # can't be done at this point (the reason is added to status).
+
+    item_ids = route_data['item_ids']
+    luigi_status = state['luigi_status']
+    items = []
+
+    # Check if we are expecting a specific action here at this point in
+    # the route.
+    expected_action_name = state['expected_action_name']
+    if expected_action_name:
+        if action['name'] != expected_action_name:
+            status.append(
+                "At this point the route must have: '"
+                + expected_action_name + "' but instead it has: '"
+                + action['name'] + "'"
+            )
+        state['expected_action_name'] = None
+
+    message = unfulfilled_requirement(action, state, route_data)
+    if message:
+        status.append(message)
+        return None
+
+    # Add the action to the route.
+    following_items = []
+
+    if action['type'] == 'Level':
+        if state['completed'] >> action['id'] & 1:
+            # Duplicate star
+            items.append(dict(item=action, star_count=None))
+        else:
+            state['star_count'] += 1
+            items.append(dict(item=action, star_count=state['star_count']))
+
+            # Check for "x star(s)" triggers
+            following_items.extend(route_data['following_star_counts'].get(
+                state['star_count'], []))
+    else:
+        items.append(dict(item=action))
+    state['completed'] |= 1 << action['id']
+    if is_end_of_route(
+      action, category, state['completed'], state['star_count'],
+      item_ids):
+        state['ended'] = True
+        state['complete'] = True
+        return items
+
+    # Update Green Star count if applicable
+    if action['name'] in ["Battlerock L", "Buoy Base G", "Dusty Dune G"]:
+        state['green_star_count'] += 1
+
+        # Check for "x green star(s)" triggers
+        following_items.extend(
+            route_data['following_green_star_counts'].get(
+                state['green_star_count'], []))
+
+    # Update Luigi status if applicable
+    if action['name'] == "Talk to Luigi at Garage":
+        luigi_status['talked_at_garage'] = True
+    elif luigi_status['talked_at_garage'] and action['type'] == 'Level':
+        if action['name'] in ["Good Egg L", "Battlerock L", "Honeyhive L"]:
+            luigi_status['luigi_stars'] += 1
+            luigi_status['between_stars'] = 0
+        else:
+            luigi_status['between_stars'] += 1
+            # Check for Luigi letter 1 event
+            if luigi_status['luigi_stars'] == 0 \
+              and luigi_status['between_stars'] == 1:
+                following_items.append(
+                    route_data['items']["Luigi letter 1"])
+
+    # Items triggered by this action specifically
+    following_items.extend(action['following'])
+
+    while following_items:
+        following_item = following_items.pop(0)
+
+        if following_item['type'] in ['Action', 'Level']:
+            # By some special case, this following "event" is also
+            # considered an action of some sort. We'll go to the next
+            # action to process this action, and we'll make a note to
+            # check that this action is indeed the next item in the
+            # route.
+            state['expected_action_name'] = following_item['name']
+            continue
+
+        # Ensure all of this item's trigger requirements are met before
+        # adding the item. If the requirements aren't met, the item is
+        # not triggered.
+        if not fulfilled_requirements(
+          following_item, state['completed'], state['star_count']):
+            continue
+
+        # Add the item to the route.
+        items.append(dict(item=following_item))
+        state['completed'] |= 1 << following_item['id']
+        if is_end_of_route(
+          following_item, category, state['completed'],
+          state['star_count'], item_ids):
+            state['ended'] = True
+            return items
+
+        # Check if other items are triggered by this item
+        following_items.extend(following_item['following'])
+
+    return items
+
+
+def check_and_add_events(route, category, route_data):
+    # Add between-level events to the route, filling in route['items'] and
+    # route['complete']. Same as Route.checkAndAddEvents in the webpage.
+
+    state = new_route_state()
+    route['items'] = []
+    route['complete'] = False
+
+    for action in route['actions']:
+        items = add_action(
+            state, action, category, route_data, route['status'])
+        if items is None:
+            return
+        route['items'].extend(items)
+        if state['ended']:
+            route['complete'] = state['complete']
+            return
+
+
+def message_case_frames(message, arg_set, message_case):
+    # The frames dict (base, num_boxes, and animation_time if there's one)
+    # for the message case that this arg set and item use.
+    frames = message['frames']
+    if frames is None:
+        raise ValueError("Message {} has no content".format(message['id']))
+    if 'base' not in frames:
+        # Frames depend on the case; the case is either given by the item,
+        # or it's the character.
+        if message_case in frames:
+            frames = frames[message_case]
+        elif arg_set['character'] in frames:
+            frames = frames[arg_set['character']]
+        else:
+            raise ValueError(
+                "Don't know which case of message {} to use".format(
+                    message['id']))
+    return frames
+
+
+def message_frames(message, arg_set, message_case):
+    # Frames for one message, like Message.frames in the webpage.
+    frames = message_case_frames(message, arg_set, message_case)
+    total = frames['base']
+    # Like the webpage, only count box end timing errors of more than 0.
+    if arg_set['boxEndTimingError'] > 0:
+        total += frames['num_boxes'] * arg_set['boxEndTimingError']
+    if 'animation_time' in frames:
+        # There's a cutscene with animations that have to play out entirely
+        # before advancing, even if the message is done.
+        total = max(total, frames['animation_time'])
+    return total
+
+
+def item_messages(item, arg_set, route_data):
+    # (message, case) for each of a route item's messages that count
+    # towards its frames, for this arg set's language and character.
+    messages = route_data['languages'][arg_set['langCode']]
+    for m in item['messages']:
+        # Don't include skippable messages in our frame count.
+        if m['skippable']:
+            continue
+        message_id = m['id']
+        if type(message_id) != str:
+            # Dict containing multiple cases. The only possible factor for
+            # message id is character.
+            message_id = message_id[arg_set['character']]
+        if message_id not in messages:
+            raise ValueError("Message {} not found for {}".format(
+                message_id, arg_set['langCode']))
+        yield messages[message_id], m['case']
+
+
+def item_frames(item, arg_set, route_data):
+    # Total frames for a route item's messages. These don't depend on the
+    # route, so they're cached: for every box end timing error, or if
+    # route_data has cached_box_end_timing_errors, only for those.
+    key = (item['name'], arg_set['langCode'], arg_set['character'],
+           arg_set['boxEndTimingError'])
+    cache = route_data['item_frames_cache']
+    if key in cache:
+        return cache[key]
+
+    total = 0
+    for message, message_case in item_messages(item, arg_set, route_data):
+        total += message_frames(message, arg_set, message_case)
+
+    cached_box_end_timing_errors = route_data.get(
+        'cached_box_end_timing_errors')
+    if cached_box_end_timing_errors is None \
+      or arg_set['boxEndTimingError'] in cached_box_end_timing_errors:
+        cache[key] = total
+    return total
+
+
+def evaluate_route(text, category, arg_sets, route_data):
+    # Parse, validate and score one route. Returns a JSON-friendly dict.
+    route = parse_route(text, route_data)
+    check_and_add_events(route, category, route_data)
+    if not route['complete']:
+        route['status'].append("Route is incomplete!")
+
+    items = []
+    totals = [0] * len(arg_sets)
+    for item_obj in route['items']:
+        item = item_obj['item']
+        frames = [item_frames(item, arg_set, route_data)
+                  for arg_set in arg_sets]
+        for i, f in enumerate(frames):
+            totals[i] += f
+        items.append(dict(
+            name=item['name'],
+            star_count=item_obj.get('star_count'),
+            frames=frames,
+        ))
+
+    return dict(
+        name=route['name'],
+        complete=route['complete'],
+        status=route['status'],
+        items=items,
+        # Like the webpage, only give totals for complete routes.
+        totals=totals if route['complete'] else None,
+    )
+
+
+def parse_arg_set(s):
+    # "usenglish,mario,10" -> arg set dict
+    lang_code, character, box_end_timing_error = s.split(',')
+    return dict(
+        langCode=lang_code,
+        character=character,
+        boxEndTimingError=float(box_end_timing_error)
+        if '.' in box_end_timing_error else int(box_end_timing_error),
+    )
+
+
+def route_filenames(paths):
+    # Expand directories into the route text files inside them.
+    for path in paths:
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                if filename.endswith('.txt'):
+                    yield os.path.join(path, filename)
+        else:
+            yield path
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Validate routes and total their text frames.")
+    parser.add_argument(
+        'routes', nargs='+',
+        help="Route text files, or directories of them.")
+    parser.add_argument(
+        '--category', choices=sorted(CATEGORIES), default='Any%')
+    parser.add_argument(
+        '--arg-set', action='append', type=parse_arg_set,
+        metavar='LANG,CHARACTER,BTE', dest='arg_sets',
+        help="Language code, character and box end timing error to count"
+        " frames with. Can be given more than once."
+        " Default: usenglish,mario,10 and jpjapanese,mario,10")
+    parser.add_argument(
+        '--messages-dir',
+        help="Directory with the js/messages/<code>.js files.")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    args = parser.parse_args()
+
+    arg_sets = args.arg_sets or DEFAULT_ARG_SETS
+    route_data = load_route_data(
+        [arg_set['langCode'] for arg_set in arg_sets], args.messages_dir)
+
+    results = []
+    for filename in route_filenames(args.routes):
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+        try:
+            result = evaluate_route(text, args.category, arg_sets, route_data)
+        except ValueError as e:
+            result = dict(
+                name=None, complete=False, status=[str(e)], items=[],
+                totals=None)
+        result['file'] = filename
+        results.append(result)
+
+    if args.format == 'json':
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        arg_set_names = [
+            '{langCode}/{character}/{boxEndTimingError} BTE'.format(**a)
+            for a in arg_sets
+        ]
+        writer = csv.writer(sys.stdout)
+        writer.writerow(
+            ['file', 'name', 'complete']
+            + ['total ' + name for name in arg_set_names]
+            + ['status'])
+        for result in results:
+            totals = result['totals'] or [''] * len(arg_sets)
+            writer.writerow(
+                [result['file'], result['name'], result['complete']]
+                + totals + ['\n'.join(result['status'])])
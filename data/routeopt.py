@@ -0,0 +1,299 @@
+# In: a route text file (like sampleroute120.txt) whose actions are to be
+# reordered, plus the same item data and messages as routeeval.py
+# Out: orderings of those actions with the lowest text frame totals for an
+# arg set, as route text that the webpage and routeeval.py accept
+#
+# Only the order of the route's actions changes; the stars and other
+# actions stay the same. Most of a route's text frames are fixed by which
+# actions it has. The rest come from events, and only a few actions trigger
+# events that depend on when they're done (e.g. a Grand Star returned
+# before or after 60 stars), so the search branches on where those actions
+# go and keeps the rest in the order they were given in.
+
+
+import argparse
+import collections
+import os
+import sys
+
+import routeeval
+
+
+
+def order_dependent_names(route_data):
+    # Names of items that trigger events with requirements (directly or
+    # through other events), like "Less than 60 stars". Where these go in a
+    # route can change which events happen, and so the route's frames.
+    names = set()
+    for name, item in route_data['items'].items():
+        to_check = list(item['following'])
+        checked = set()
+        while to_check:
+            following_item = to_check.pop()
+            if following_item['name'] in checked \
+              or following_item['type'] in ['Action', 'Level']:
+                continue
+            checked.add(following_item['name'])
+            # Star bit requirements are never checked.
+            if any(req.kind != 'star_bits'
+                   for req in following_item['requirements']):
+                names.add(name)
+                break
+            to_check.extend(following_item['following'])
+    return names
+
+
+def optimize_route(actions, category, arg_set, route_data, num_routes=1):
+    # Search orderings of the actions (a list of items, as in a parsed
+    # route) for complete routes with the lowest text frames. Returns up to
+    # num_routes (total frames, ordered actions) pairs, lowest total first.
+    #
+    # This is a depth-first search over route states, with the route so
+    # far pruned when:
+    # - It can't beat the routes found so far, even if the remaining
+    #   actions trigger no events.
+    # - An earlier ordering reached the same state (same completed items,
+    #   star counts, Luigi status...) with the same or fewer frames.
+
+    items = route_data['items']
+    end_item_name = routeeval.CATEGORIES[category]['end_item_name']
+    order_dependent = order_dependent_names(route_data)
+
+    # Only the order-dependent actions move. The others keep the order
+    # they were given in, since itemdetails.csv doesn't list every
+    # requirement the game has (e.g. only a galaxy's first star requires
+    # anything), so any other order might not be playable.
+    in_order = [
+        action for action in actions
+        if action['name'] not in order_dependent
+        and action['name'] != end_item_name]
+    order_dependent_in_order = list(collections.OrderedDict.fromkeys(
+        action['name'] for action in actions
+        if action['name'] in order_dependent
+        and action['name'] != end_item_name))
+    # Which of the in_order actions are done. An action that has to follow
+    # another immediately can be done ahead of its turn.
+    in_order_done = [False] * len(in_order)
+
+    def in_order_index(name=None):
+        # Index of the first in_order action not done yet (with this name,
+        # if given), or None.
+        for i, action in enumerate(in_order):
+            if not in_order_done[i] \
+              and (name is None or action['name'] == name):
+                return i
+        return None
+
+    remaining = collections.Counter(action['name'] for action in actions)
+    remaining_frames = [sum(
+        routeeval.item_frames(action, arg_set, route_data)
+        for action in actions
+    )]
+    sequence = []
+    best_frames = dict()
+    routes = []
+
+    def frames_to_beat():
+        if len(routes) < num_routes:
+            return None
+        return routes[-1][0]
+
+    def next_actions(state):
+        # Actions worth trying next from this state.
+        expected_action_name = state['expected_action_name']
+        if expected_action_name:
+            if remaining[expected_action_name]:
+                return [items[expected_action_name]]
+            return []
+
+        # The next of the actions that keep their order, if its
+        # requirements are met.
+        next_in_order = None
+        i = in_order_index()
+        if i is not None:
+            action = in_order[i]
+            if routeeval.unfulfilled_requirement(
+              action, state, route_data) is None:
+                next_in_order = action
+        if next_in_order and next_in_order['type'] != 'Level':
+            # It doesn't add a star, so it might as well be done right
+            # away.
+            return [next_in_order]
+
+        # Try each available order-dependent action here, and otherwise the
+        # next action in order.
+        choices = [
+            items[name] for name in order_dependent_in_order
+            if remaining[name] and routeeval.unfulfilled_requirement(
+                items[name], state, route_data) is None
+        ]
+        if next_in_order:
+            choices.append(next_in_order)
+        if not choices:
+            # The end comes after everything else.
+            if remaining[end_item_name] \
+              and sum(remaining.values()) == remaining[end_item_name]:
+                return [items[end_item_name]]
+        return choices
+
+    def search(state, frames):
+        if state['ended']:
+            if state['complete'] and not sum(remaining.values()):
+                routes.append((frames, list(sequence)))
+                routes.sort(key=lambda route: route[0])
+                del routes[num_routes:]
+            return
+
+        to_beat = frames_to_beat()
+        if to_beat is not None and frames + remaining_frames[0] >= to_beat:
+            return
+
+        key = (
+            state['completed'], len(sequence),
+            state['star_count'], state['green_star_count'],
+            tuple(sorted(state['luigi_status'].items())),
+            state['expected_action_name'],
+            # Routes can have the same action more than once, so the
+            # completed items don't say which actions are left.
+            tuple(sorted(remaining.items())),
+        )
+        if key in best_frames and best_frames[key] <= frames:
+            return
+        best_frames[key] = frames
+
+        for action in next_actions(state):
+            new_state = routeeval.copy_route_state(state)
+            status = []
+            added_items = routeeval.add_action(
+                new_state, action, category, route_data, status)
+            if added_items is None or status:
+                continue
+            added_frames = sum(
+                routeeval.item_frames(item_obj['item'], arg_set, route_data)
+                for item_obj in added_items
+            )
+            action_frames = routeeval.item_frames(
+                action, arg_set, route_data)
+
+            i = in_order_index(action['name'])
+            if i is not None:
+                in_order_done[i] = True
+            remaining[action['name']] -= 1
+            remaining_frames[0] -= action_frames
+            sequence.append(action)
+            search(new_state, frames + added_frames)
+            sequence.pop()
+            remaining_frames[0] += action_frames
+            remaining[action['name']] += 1
+            if i is not None:
+                in_order_done[i] = False
+
+    search(routeeval.new_route_state(), 0)
+    return routes
+
+
+def route_text(name, actions):
+    # Route text for a list of actions, numbering the stars like the sample
+    # routes do.
+    lines = [name]
+    completed_level_names = set()
+    for action in actions:
+        if action['type'] == 'Level' \
+          and action['name'] not in completed_level_names:
+            completed_level_names.add(action['name'])
+            lines.append("{}. {}".format(
+                len(completed_level_names), action['name']))
+        else:
+            lines.append(action['name'])
+    return '\n'.join(lines) + '\n'
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Reorder a route's actions for the fewest text frames.")
+    parser.add_argument(
+        'route',
+        help="Route text file with the actions to reorder. Actions that"
+        " don't trigger order-dependent events keep their order.")
+    parser.add_argument(
+        '--category', choices=sorted(routeeval.CATEGORIES), default='Any%')
+    parser.add_argument(
+        '--arg-set', type=routeeval.parse_arg_set,
+        default=routeeval.DEFAULT_ARG_SETS[0],
+        metavar='LANG,CHARACTER,BTE',
+        help="Language code, character and box end timing error to count"
+        " frames with. Default: usenglish,mario,10")
+    parser.add_argument(
+        '--messages-dir',
+        help="Directory with the js/messages/<code>.js files.")
+    parser.add_argument(
+        '--top', type=int, default=1, metavar='N',
+        help="Output up to N routes, lowest total first. Orderings that"
+        " reach the same point as an earlier one without fewer frames are"
+        " not followed further, so these differ in where the"
+        " order-dependent actions go.")
+    parser.add_argument(
+        '--out-dir',
+        help="Write the routes to route-1.txt, route-2.txt, etc. in this"
+        " directory, instead of printing them.")
+    args = parser.parse_args()
+
+    route_data = routeeval.load_route_data(
+        [args.arg_set['langCode']], args.messages_dir)
+    with open(args.route, 'r', encoding='utf-8') as f:
+        text = f.read()
+    route = routeeval.parse_route(text, route_data)
+    if route['status']:
+        raise SystemExit('\n'.join(route['status']))
+
+    arg_set_name = '{langCode}/{character}/{boxEndTimingError} BTE'.format(
+        **args.arg_set)
+    actions = route['actions']
+    routeeval.check_and_add_events(route, args.category, route_data)
+    if route['complete']:
+        # Leave out anything after the end of the route.
+        actions = [
+            item_obj['item'] for item_obj in route['items']
+            if item_obj['item']['type'] != 'Event'
+        ]
+        given_frames = sum(
+            routeeval.item_frames(
+                item_obj['item'], args.arg_set, route_data)
+            for item_obj in route['items']
+        )
+        print("Given route: {} frames ({})".format(
+            given_frames, arg_set_name), file=sys.stderr)
+
+    routes = optimize_route(
+        actions, args.category, args.arg_set, route_data, args.top)
+    if not routes:
+        raise SystemExit(
+            "No complete {} route has these actions.".format(args.category))
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    for rank, (frames, actions) in enumerate(routes, 1):
+        name = "{} (reordered, {} frames for {})".format(
+            route['name'], frames, arg_set_name)
+        text = route_text(name, actions)
+
+        # Check the route with the evaluator, same as the webpage would.
+        result = routeeval.evaluate_route(
+            text, args.category, [args.arg_set], route_data)
+        if result['status'] or result['totals'] != [frames]:
+            raise SystemExit(
+                "Reordered route doesn't evaluate as expected: {} {}".format(
+                    result['totals'], result['status']))
+
+        print("Route {}: {} frames".format(rank, frames), file=sys.stderr)
+        if args.out_dir:
+            filename = os.path.join(
+                args.out_dir, 'route-{}.txt'.format(rank))
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(text)
+        else:
+            if rank > 1:
+                print()
+            print(text, end='')
@@ -0,0 +1,349 @@
+# In: route text files (like sampleroute120.txt), and a distribution of box
+# end timing errors (see parse_timing_error)
+# Out: the distribution of each route's text frames when every box end's
+# timing error is drawn from that distribution: mean and percentiles (p50,
+# p90, p99 by default) per route item and for the whole route, as JSON or
+# CSV
+#
+# routeeval.py counts every box end as the same fixed number of frames
+# late. Here each box end is an independent draw from the distribution
+# instead. The timing errors are whole frames, so rather than sampling,
+# the distribution of the sum of a route's box ends is computed exactly by
+# convolving the per-box distribution with itself (with FFTs). This gives
+# the same percentiles that an endless number of samples would, and a
+# whole route takes milliseconds.
+
+
+import argparse
+import csv
+import json
+import math
+import sys
+
+import numpy as np
+
+import routeeval
+
+
+
+# Probabilities smaller than this are treated as 0 when finding the range
+# of a distribution, so that FFT round-off doesn't widen it.
+NEGLIGIBLE_PROBABILITY = 1e-12
+
+
+# A distribution of a whole number of frames is a (start, probabilities)
+# pair: probabilities[i] is the chance of start + i frames.
+
+
+def constant_distribution(frames):
+    return (frames, np.ones(1))
+
+
+def normalized(start, probabilities):
+    # Clean up FFT round-off: no negative probabilities, no negligible
+    # tails, and a total of 1.
+    probabilities = np.clip(probabilities, 0, None)
+    nonzero = np.flatnonzero(probabilities > NEGLIGIBLE_PROBABILITY)
+    first, last = nonzero[0], nonzero[-1]
+    probabilities = probabilities[first:last + 1]
+    return (start + int(first), probabilities / probabilities.sum())
+
+
+def parse_timing_error(s):
+    # Box end timing error distribution from the command line:
+    # - "10": always 10 frames, same as routeeval.py
+    # - "normal:MEAN,SD": a normal distribution rounded to whole frames,
+    #   with anything below 0 counted as 0
+    # - "uniform:LOW,HIGH": any whole number of frames from LOW to HIGH
+    # - "values:FILE": the observed timing errors in FILE, one per line
+    kind, _, params = s.partition(':')
+    if not params:
+        return constant_distribution(int(kind))
+
+    if kind == 'normal':
+        mean, sd = [float(x) for x in params.split(',')]
+        if sd <= 0:
+            return constant_distribution(max(0, int(round(mean))))
+        low = max(0, int(math.floor(mean - 8 * sd)))
+        high = int(math.ceil(mean + 8 * sd))
+
+        def cdf(x):
+            return 0.5 * (1 + math.erf((x - mean) / (sd * math.sqrt(2))))
+
+        # Frame f gets the probability of rounding to f.
+        edges = [cdf(f + 0.5) for f in range(low, high + 1)]
+        probabilities = np.diff([0.0] + edges)
+        return normalized(low, probabilities)
+
+    if kind == 'uniform':
+        low, high = [int(x) for x in params.split(',')]
+        if high < low:
+            raise ValueError("Uniform range is empty: " + params)
+        return (low, np.full(high - low + 1, 1.0 / (high - low + 1)))
+
+    if kind == 'values':
+        with open(params, 'r') as f:
+            values = [int(line) for line in f if line.strip()]
+        if not values:
+            raise ValueError("No timing errors in " + params)
+        low = min(values)
+        counts = np.bincount(np.array(values) - low)
+        return (low, counts / counts.sum())
+
+    raise ValueError("Unknown timing error distribution: " + s)
+
+
+def fft_size(n):
+    # Power of 2 that's at least n.
+    return 1 << max(0, (n - 1).bit_length())
+
+
+def convolve(a, b):
+    # Distribution of the sum of two independent distributions.
+    start_a, probabilities_a = a
+    start_b, probabilities_b = b
+    if min(len(probabilities_a), len(probabilities_b)) <= 64:
+        # Direct convolution is faster when one side is short.
+        probabilities = np.convolve(probabilities_a, probabilities_b)
+    else:
+        size = len(probabilities_a) + len(probabilities_b) - 1
+        n = fft_size(size)
+        probabilities = np.fft.irfft(
+            np.fft.rfft(probabilities_a, n) * np.fft.rfft(probabilities_b, n),
+            n)[:size]
+    return normalized(start_a + start_b, probabilities)
+
+
+def sum_of_draws(distribution, count, cache):
+    # Distribution of the sum of count independent draws from the
+    # distribution. Computed with one FFT, by raising the distribution's
+    # transform to the count'th power. Results are cached by count, since
+    # lots of items have the same number of boxes.
+    if count in cache:
+        return cache[count]
+    start, probabilities = distribution
+    if count == 0 or len(probabilities) == 1:
+        result = (start * count, np.ones(1))
+    else:
+        size = count * (len(probabilities) - 1) + 1
+        n = fft_size(size)
+        transform = np.fft.rfft(probabilities, n) ** count
+        result = normalized(
+            start * count, np.fft.irfft(transform, n)[:size])
+    cache[count] = result
+    return result
+
+
+def at_least(distribution, minimum):
+    # Distribution of max(draw, minimum).
+    start, probabilities = distribution
+    if start >= minimum:
+        return distribution
+    if start + len(probabilities) - 1 <= minimum:
+        return constant_distribution(minimum)
+    below = minimum - start
+    probabilities = probabilities[below:].copy()
+    probabilities[0] += distribution[1][:below].sum()
+    return (minimum, probabilities)
+
+
+def distribution_mean(distribution):
+    start, probabilities = distribution
+    return start + float(np.dot(np.arange(len(probabilities)), probabilities))
+
+
+def distribution_percentiles(distribution, percentiles):
+    # Smallest frame count that's at least as likely as each percentile.
+    start, probabilities = distribution
+    cdf = np.cumsum(probabilities)
+    indexes = np.searchsorted(
+        cdf, np.array(percentiles) / 100 - NEGLIGIBLE_PROBABILITY)
+    return [start + int(min(i, len(cdf) - 1)) for i in indexes]
+
+
+def chance_faster(a, b):
+    # Chance that a draw from a is less than an independent draw from b.
+    start_a, probabilities_a = a
+    start_b, probabilities_b = b
+    # For each of a's values, the chance that b is more than it.
+    b_indexes = start_a - start_b + np.arange(len(probabilities_a))
+    b_more = 1 - np.cumsum(probabilities_b)[
+        np.clip(b_indexes, 0, len(probabilities_b) - 1)]
+    b_more[b_indexes < 0] = 1.0
+    b_more[b_indexes >= len(probabilities_b)] = 0.0
+    return float(np.dot(probabilities_a, b_more))
+
+
+def item_frame_parts(item, arg_set, route_data):
+    # Split a route item's messages into the part that's linear in the
+    # timing errors, as (base frames, number of boxes), and the messages
+    # with an animation time (their frames dicts), which take at least that
+    # long however quickly their boxes end.
+    base = 0
+    num_boxes = 0
+    animated = []
+    for message, message_case in routeeval.item_messages(
+      item, arg_set, route_data):
+        frames = routeeval.message_case_frames(message, arg_set, message_case)
+        if 'animation_time' in frames:
+            animated.append(frames)
+        else:
+            base += frames['base']
+            num_boxes += frames['num_boxes']
+    return base, num_boxes, animated
+
+
+def parts_distribution(base, num_boxes, animated, timing_error, cache):
+    # Distribution of frames for messages split up as in item_frame_parts.
+    # The linear part is one sum of draws, however many messages it covers.
+    # The animated messages are short, so they're convolved with each other
+    # first, and then with the linear part.
+    animated_distribution = constant_distribution(0)
+    for frames in animated:
+        start, probabilities = sum_of_draws(
+            timing_error, frames['num_boxes'], cache)
+        animated_distribution = convolve(animated_distribution, at_least(
+            (start + frames['base'], probabilities),
+            frames['animation_time']))
+    start, probabilities = sum_of_draws(timing_error, num_boxes, cache)
+    return convolve((start + base, probabilities), animated_distribution)
+
+
+def summarize(distribution, percentiles):
+    summary = dict(mean=round(distribution_mean(distribution), 2))
+    for p, frames in zip(
+      percentiles, distribution_percentiles(distribution, percentiles)):
+        summary['p{:g}'.format(p)] = frames
+    return summary
+
+
+def simulate_route(
+  text, category, arg_set, timing_error, route_data, percentiles,
+  cache=None):
+    # Parse and validate one route, and find the distribution of its frames
+    # with every box end's timing error drawn from timing_error. Returns a
+    # JSON-friendly dict like routeeval.evaluate_route, with a summary
+    # (mean and percentiles) in place of each frame count, and the route
+    # total's distribution under '_distribution'.
+    if cache is None:
+        cache = dict()
+    route = routeeval.parse_route(text, route_data)
+    routeeval.check_and_add_events(route, category, route_data)
+    if not route['complete']:
+        route['status'].append("Route is incomplete!")
+
+    items = []
+    item_summaries = dict()
+    # Every box end in the route is a separate draw, including when an item
+    # comes up more than once, so the route total is split up the same way
+    # as an item's frames.
+    total_base = 0
+    total_boxes = 0
+    total_animated = []
+    for item_obj in route['items']:
+        item = item_obj['item']
+        base, num_boxes, animated = item_frame_parts(
+            item, arg_set, route_data)
+        if item['name'] not in item_summaries:
+            item_summaries[item['name']] = summarize(parts_distribution(
+                base, num_boxes, animated, timing_error, cache), percentiles)
+        total_base += base
+        total_boxes += num_boxes
+        total_animated.extend(animated)
+        items.append(dict(
+            name=item['name'],
+            star_count=item_obj.get('star_count'),
+            frames=item_summaries[item['name']],
+        ))
+    total = parts_distribution(
+        total_base, total_boxes, total_animated, timing_error, cache)
+
+    return dict(
+        name=route['name'],
+        complete=route['complete'],
+        status=route['status'],
+        items=items,
+        # Like the webpage, only give totals for complete routes.
+        total=summarize(total, percentiles) if route['complete'] else None,
+        _distribution=total if route['complete'] else None,
+    )
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description="Find the spread of routes' text frames when box end"
+        " timing errors vary.")
+    parser.add_argument(
+        'routes', nargs='+',
+        help="Route text files, or directories of them.")
+    parser.add_argument(
+        '--timing-error', type=parse_timing_error, required=True,
+        metavar='DISTRIBUTION',
+        help="Distribution of each box end's timing error, in frames:"
+        " a number (always that many), normal:MEAN,SD, uniform:LOW,HIGH, or"
+        " values:FILE (observed timing errors, one per line).")
+    parser.add_argument(
+        '--category', choices=sorted(routeeval.CATEGORIES), default='Any%')
+    parser.add_argument('--language', default='usenglish')
+    parser.add_argument(
+        '--character', choices=['mario', 'luigi'], default='mario')
+    parser.add_argument(
+        '--percentile', type=float, action='append', dest='percentiles',
+        help="Percentile to report. Can be given more than once."
+        " Default: 50, 90 and 99")
+    parser.add_argument(
+        '--messages-dir',
+        help="Directory with the js/messages/<code>.js files.")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    args = parser.parse_args()
+
+    percentiles = args.percentiles or [50, 90, 99]
+    # The fixed timing error only matters to routeeval's own frame counts.
+    arg_set = dict(
+        langCode=args.language, character=args.character,
+        boxEndTimingError=0)
+    route_data = routeeval.load_route_data(
+        [args.language], args.messages_dir)
+
+    results = []
+    cache = dict()
+    for filename in routeeval.route_filenames(args.routes):
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+        try:
+            result = simulate_route(
+                text, args.category, arg_set, args.timing_error,
+                route_data, percentiles, cache)
+        except ValueError as e:
+            result = dict(
+                name=None, complete=False, status=[str(e)], items=[],
+                total=None, _distribution=None)
+        result['file'] = filename
+        results.append(result)
+
+    # How often each route would beat the first complete one.
+    complete = [r for r in results if r['_distribution'] is not None]
+    for result in complete[1:]:
+        result['chance_faster_than_first'] = round(chance_faster(
+            result['_distribution'], complete[0]['_distribution']), 4)
+    for result in results:
+        del result['_distribution']
+
+    if args.format == 'json':
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        stat_names = ['mean'] + ['p{:g}'.format(p) for p in percentiles]
+        writer = csv.writer(sys.stdout)
+        writer.writerow(
+            ['file', 'name', 'complete'] + stat_names
+            + ['chance faster than first', 'status'])
+        for r in results:
+            total = r['total'] or dict()
+            writer.writerow(
+                [r['file'], r['name'], r['complete']]
+                + [total.get(name, '') for name in stat_names]
+                + [r.get('chance_faster_than_first', ''),
+                   ' / '.join(r['status'])])
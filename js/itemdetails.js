@@ -1 +1,2 @@
-window.itemDetails = {"Save Luigi": {"star_name": null, "follows": ["Ghostly 1"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Space Junk H": {"star_name": "ScenarioName_StarDustGalaxy6", "follows": [], "end_location": null, "requirements": ["Space Junk 2"], "type": "Level", "start_location": "Fountain"}, "Ghostly 1": {"star_name": "ScenarioName_PhantomGalaxy1", "follows": [], "end_location": null, "requirements": ["20 stars"], "type": "Level", "start_location": "Kitchen"}, "Feed Garden Hungry Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Melty Molten 1", "1600 star bits"], "type": "Action", "start_location": "Garden Hungry Luma"}, "Storybook Chapter 4": {"star_name": null, "follows": [], "end_location": null, "requirements": ["32 stars"], "type": "Event", "start_location": null}, "Good Egg 2": {"star_name": "ScenarioName_EggStarGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Terrace"}, "Terrace Grand Star returned": {"star_name": null, "follows": ["Bowser Jr.'s Robot Reactor"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Ending (120 stars)": {"star_name": null, "follows": ["Bowser's Galaxy Reactor"], "end_location": null, "requirements": ["120 stars"], "type": "Event", "start_location": null}, "Dusty Dune C": {"star_name": "ScenarioName_SandClockGalaxy4", "follows": [], "end_location": null, "requirements": ["Dusty Dune 3"], "type": "Level", "start_location": "Bedroom"}, "Melty Molten 1": {"star_name": "ScenarioName_HellProminenceGalaxy1", "follows": [], "end_location": null, "requirements": ["52 stars"], "type": "Level", "start_location": "Garden"}, "Melty Molten C": {"star_name": "ScenarioName_HellProminenceGalaxy4", "follows": [], "end_location": null, "requirements": ["Melty Molten 2"], "type": "Level", "start_location": "Garden"}, "Dusty Dune 1": {"star_name": "ScenarioName_SandClockGalaxy1", "follows": [], "end_location": null, "requirements": ["29 stars"], "type": "Level", "start_location": "Bedroom"}, "Matter Splatter": {"star_name": "ScenarioName_DarkRoomGalaxy1", "follows": [], "end_location": null, "requirements": ["50 stars"], "type": "Level", "start_location": "Garden"}, "Dusty Dune G": {"star_name": "ScenarioName_SandClockGalaxy7", "follows": [], "end_location": null, "requirements": ["Dusty Dune 1"], "type": "Level", "start_location": "Bedroom"}, "Gusty Garden P": {"star_name": "ScenarioName_CosmosGardenGalaxy5", "follows": [], "end_location": null, "requirements": ["Gusty Garden 1"], "type": "Level", "start_location": "Bedroom"}, "Feed Fountain Hungry Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Space Junk 3", "400 star bits"], "type": "Action", "start_location": "Fountain Hungry Luma"}, "Bowser Jr.'s Lava Reactor": {"star_name": "ScenarioName_FloaterOtaKingGalaxy1", "follows": [], "end_location": null, "requirements": ["45 stars"], "type": "Level", "start_location": "Engine Room"}, "Storybook Chapter 7": {"star_name": null, "follows": [], "end_location": null, "requirements": ["58 stars"], "type": "Event", "start_location": null}, "Battlerock C": {"star_name": "ScenarioName_BattleShipGalaxy4", "follows": [], "end_location": null, "requirements": ["Battlerock 3"], "type": "Level", "start_location": "Fountain"}, "Honeyhive L": {"star_name": "ScenarioName_HoneyBeeKingdomGalaxy6", "follows": [], "end_location": null, "requirements": ["3 stars", "Luigi letter 3"], "type": "Level", "start_location": "Terrace"}, "Hurry-Scurry": {"star_name": "ScenarioName_BreakDownPlanetGalaxy1", "follows": [], "end_location": null, "requirements": ["18 stars"], "type": "Level", "start_location": "Fountain"}, "Fountain enemy base found": {"star_name": null, "follows": ["15 stars"], "end_location": null, "requirements": [], "type": "Event", "start_location": "Fountain"}, "Loopdeeloop": {"star_name": "ScenarioName_SurfingLv1Galaxy1", "follows": [], "end_location": null, "requirements": ["5 stars"], "type": "Level", "start_location": "Terrace"}, "Bowser Jr.'s Airship Armada": {"star_name": "ScenarioName_KoopaJrShipLv1Galaxy1", "follows": [], "end_location": null, "requirements": ["23 stars"], "type": "Level", "start_location": "Kitchen"}, "Loopdeeswoop": {"star_name": "ScenarioName_SurfingLv2Galaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Talk to Loopdeeswoop Luma"], "type": "Level", "start_location": "Loopdeswoop Luma"}, "Bowser's Dark Matter Plant": {"star_name": "ScenarioName_KoopaBattleVs2Galaxy1", "follows": [], "end_location": null, "requirements": ["33 stars"], "type": "Level", "start_location": "Bedroom"}, "Dusty Dune 2": {"star_name": "ScenarioName_SandClockGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Bedroom"}, "Freezeflame P": {"star_name": "ScenarioName_IceVolcanoGalaxy5", "follows": [], "end_location": null, "requirements": ["Freezeflame 1"], "type": "Level", "start_location": "Bedroom"}, "Rolling Green": {"star_name": "ScenarioName_TamakoroExLv1Galaxy1", "follows": [], "end_location": null, "requirements": ["11 stars"], "type": "Level", "start_location": "Fountain"}, "Deep Dark P": {"star_name": "ScenarioName_OceanPhantomCaveGalaxy5", "follows": [], "end_location": null, "requirements": ["Deep Dark 1"], "type": "Level", "start_location": "Garden"}, "Ghostly 3": {"star_name": "ScenarioName_PhantomGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Kitchen"}, "Gusty Garden C": {"star_name": "ScenarioName_CosmosGardenGalaxy4", "follows": [], "end_location": null, "requirements": ["Gusty Garden 3"], "type": "Level", "start_location": "Bedroom"}, "Sea Slide 2": {"star_name": "ScenarioName_OceanRingGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Engine Room"}, "Melty Molten 2": {"star_name": "ScenarioName_HellProminenceGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Garden"}, "Dreadnought 2": {"star_name": "ScenarioName_CannonFleetGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Garden"}, "Honeyhive 1": {"star_name": "ScenarioName_HoneyBeeKingdomGalaxy1", "follows": [], "end_location": null, "requirements": ["3 stars"], "type": "Level", "start_location": "Terrace"}, "Gold Leaf 1": {"star_name": "ScenarioName_ReverseKingdomGalaxy1", "follows": [], "end_location": null, "requirements": ["34 stars"], "type": "Level", "start_location": "Engine Room"}, "Storybook Chapter 6": {"star_name": null, "follows": [], "end_location": null, "requirements": ["49 stars"], "type": "Event", "start_location": null}, "Snow Cap": {"star_name": "ScenarioName_SnowCapsuleGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Feed Garden Hungry Luma"], "type": "Level", "start_location": "Garden Hungry Luma"}, "Battlerock 3": {"star_name": "ScenarioName_BattleShipGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Fountain"}, "Grand Finale": {"star_name": "ScenarioName_PeachCastleFinalGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Talk to Grand Finale Luma"], "type": "Level", "start_location": "Grand Finale Luma"}, "Battlerock 2": {"star_name": "ScenarioName_BattleShipGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Fountain"}, "Toy Time 1": {"star_name": "ScenarioName_FactoryGalaxy1", "follows": [], "end_location": null, "requirements": ["40 stars"], "type": "Level", "start_location": "Engine Room"}, "Beach Bowl C": {"star_name": "ScenarioName_HeavenlyBeachGalaxy4", "follows": [], "end_location": null, "requirements": ["Beach Bowl 3"], "type": "Level", "start_location": "Kitchen"}, "Good Egg C": {"star_name": "ScenarioName_EggStarGalaxy4", "follows": [], "end_location": null, "requirements": ["Good Egg 1"], "type": "Level", "start_location": "Terrace"}, "Sea Slide 1": {"star_name": "ScenarioName_OceanRingGalaxy1", "follows": [], "end_location": null, "requirements": ["36 stars"], "type": "Level", "start_location": "Engine Room"}, "Bubble Breeze": {"star_name": "ScenarioName_CubeBubbleExLv1Galaxy1", "follows": [], "end_location": null, "requirements": ["19 stars"], "type": "Level", "start_location": "Kitchen"}, "Find Toads": {"star_name": null, "follows": ["Honeyhive 1"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Talk to Rolling Gizmo Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Green star 3 returned"], "type": "Action", "start_location": "Rolling Gizmo Luma"}, "Freezeflame 3": {"star_name": "ScenarioName_IceVolcanoGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Bedroom"}, "Sea Slide H": {"star_name": "ScenarioName_OceanRingGalaxy6", "follows": [], "end_location": null, "requirements": ["Sea Slide 2"], "type": "Level", "start_location": "Engine Room"}, "Sea Slide 3": {"star_name": "ScenarioName_OceanRingGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Engine Room"}, "Bowser's Star Reactor": {"star_name": "ScenarioName_KoopaBattleVs1Galaxy1", "follows": [], "end_location": null, "requirements": ["15 stars"], "type": "Level", "start_location": "Fountain"}, "Sling Pod": {"star_name": "ScenarioName_CocoonExGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Feed Fountain Hungry Luma"], "type": "Level", "start_location": "Fountain Hungry Luma"}, "Beach Bowl 1": {"star_name": "ScenarioName_HeavenlyBeachGalaxy1", "follows": [], "end_location": null, "requirements": ["16 stars"], "type": "Level", "start_location": "Kitchen"}, "Space Junk P": {"star_name": "ScenarioName_StarDustGalaxy5", "follows": [], "end_location": null, "requirements": ["Space Junk 2"], "type": "Level", "start_location": "Fountain"}, "Beach Bowl 2": {"star_name": "ScenarioName_HeavenlyBeachGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Kitchen"}, "Good Egg 1": {"star_name": "ScenarioName_EggStarGalaxy1", "follows": [], "end_location": null, "requirements": ["1 star"], "type": "Level", "start_location": "Terrace"}, "Feed Engine Room Hungry Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Ghostly 1", "Sea Slide 2", "1000 star bits"], "type": "Action", "start_location": "Engine Room Hungry Luma"}, "Honeyhive 2": {"star_name": "ScenarioName_HoneyBeeKingdomGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Terrace"}, "Dreadnought C": {"star_name": "ScenarioName_CannonFleetGalaxy4", "follows": [], "end_location": null, "requirements": ["Dreadnought 3"], "type": "Level", "start_location": "Garden"}, "Ghostly P": {"star_name": "ScenarioName_PhantomGalaxy5", "follows": [], "end_location": null, "requirements": ["Ghostly 2"], "type": "Level", "start_location": "Kitchen"}, "Deep Dark 1": {"star_name": "ScenarioName_OceanPhantomCaveGalaxy1", "follows": [], "end_location": null, "requirements": ["46 stars"], "type": "Level", "start_location": "Garden"}, "Luigi letter 1": {"star_name": null, "follows": [], "end_location": "Mailtoad", "requirements": [], "type": "Event", "start_location": null}, "Bubble Blast": {"star_name": "ScenarioName_CubeBubbleExLv2Galaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Talk to Bubble Blast Luma"], "type": "Level", "start_location": "Bubble Blast Luma"}, "Engine Room Grand Star returned (before 60 stars)": {"star_name": null, "follows": ["Bowser Jr.'s Lava Reactor"], "end_location": "Observatory start", "requirements": ["Less than 60 stars"], "type": "Event", "start_location": null}, "Butler's star bit explanation": {"star_name": null, "follows": ["2 stars"], "end_location": "Terrace", "requirements": [], "type": "Event", "start_location": null}, "Deep Dark C": {"star_name": "ScenarioName_OceanPhantomCaveGalaxy4", "follows": [], "end_location": null, "requirements": ["Deep Dark 2"], "type": "Level", "start_location": "Garden"}, "Toy Time H": {"star_name": "ScenarioName_FactoryGalaxy6", "follows": [], "end_location": null, "requirements": ["Toy Time 1"], "type": "Level", "start_location": "Engine Room"}, "Freezeflame C": {"star_name": "ScenarioName_IceVolcanoGalaxy4", "follows": [], "end_location": null, "requirements": ["Freezeflame 1"], "type": "Level", "start_location": "Bedroom"}, "Space Junk 1": {"star_name": "ScenarioName_StarDustGalaxy1", "follows": [], "end_location": null, "requirements": ["9 stars"], "type": "Level", "start_location": "Fountain"}, "Gusty Garden 3": {"star_name": "ScenarioName_CosmosGardenGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Bedroom"}, "Engine Room Grand Star returned (60 stars)": {"star_name": null, "follows": ["Bowser Jr.'s Lava Reactor"], "end_location": "Observatory start", "requirements": ["60 stars"], "type": "Event", "start_location": null}, "Bowser's Galaxy Reactor": {"star_name": "ScenarioName_KoopaBattleVs3Galaxy1", "follows": ["Unlock center of universe (and choose Go)", "120 stars (and going to center of universe)"], "end_location": null, "requirements": ["60 stars"], "type": "Level", "start_location": null}, "Bowser Jr.'s Robot Reactor": {"star_name": "ScenarioName_TriLegLv1Galaxy1", "follows": [], "end_location": null, "requirements": ["8 stars"], "type": "Level", "start_location": "Terrace"}, "Flipswitch": {"star_name": "ScenarioName_FlipPanelExGalaxy1", "follows": [], "end_location": null, "requirements": ["7 stars"], "type": "Level", "start_location": "Terrace"}, "Rolling Gizmo": {"star_name": "ScenarioName_TamakoroExLv2Galaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Talk to Rolling Gizmo Luma"], "type": "Level", "start_location": "Rolling Gizmo Luma"}, "Unlock Honeyhive": {"star_name": null, "follows": ["3 stars"], "end_location": "Terrace", "requirements": [], "type": "Event", "start_location": null}, "Melty Molten 3": {"star_name": "ScenarioName_HellProminenceGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Garden"}, "Bigmouth": {"star_name": "ScenarioName_FishTunnelGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Feed Bedroom Hungry Luma"], "type": "Level", "start_location": "Bedroom Hungry Luma"}, "Drip Drop": {"star_name": "ScenarioName_TearDropGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Feed Kitchen Hungry Luma"], "type": "Level", "start_location": "Kitchen Hungry Luma"}, "First Terrace visit": {"star_name": null, "follows": ["Gateway Grand Star returned"], "end_location": null, "requirements": [], "type": "Event", "start_location": "Terrace"}, "Gold Leaf 2": {"star_name": "ScenarioName_ReverseKingdomGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Engine Room"}, "Space Junk 2": {"star_name": "ScenarioName_StarDustGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Fountain"}, "Bonefin": {"star_name": "ScenarioName_SkullSharkGalaxy1", "follows": [], "end_location": null, "requirements": ["55 stars", "Drip Drop"], "type": "Level", "start_location": "Engine Room"}, "Gusty Garden 1": {"star_name": "ScenarioName_CosmosGardenGalaxy1", "follows": [], "end_location": null, "requirements": ["24 stars"], "type": "Level", "start_location": "Bedroom"}, "Dusty Dune 3": {"star_name": "ScenarioName_SandClockGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Bedroom"}, "Deep Dark H": {"star_name": "ScenarioName_OceanPhantomCaveGalaxy6", "follows": [], "end_location": null, "requirements": ["46 stars"], "type": "Level", "start_location": "Garden"}, "Terrace enemy base found": {"star_name": null, "follows": ["8 stars"], "end_location": null, "requirements": [], "type": "Event", "start_location": "Terrace"}, "Beach Bowl P": {"star_name": "ScenarioName_HeavenlyBeachGalaxy5", "follows": [], "end_location": null, "requirements": ["Beach Bowl 3"], "type": "Level", "start_location": "Kitchen"}, "Good Egg L": {"star_name": "ScenarioName_EggStarGalaxy6", "follows": [], "end_location": null, "requirements": ["1 star", "Luigi letter 1"], "type": "Level", "start_location": "Terrace"}, "Bedroom Grand Star returned (before 60 stars)": {"star_name": null, "follows": ["Bowser's Dark Matter Plant"], "end_location": "Observatory start", "requirements": ["Less than 60 stars"], "type": "Event", "start_location": null}, "Return to Observatory after 61 star ending": {"star_name": null, "follows": ["Ending (61 stars)"], "end_location": null, "requirements": [], "type": "Event", "start_location": null}, "Toy Time 3": {"star_name": "ScenarioName_FactoryGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Engine Room"}, "Beach Bowl H": {"star_name": "ScenarioName_HeavenlyBeachGalaxy6", "follows": [], "end_location": null, "requirements": ["Beach Bowl 2"], "type": "Level", "start_location": "Kitchen"}, "Deep Dark 3": {"star_name": "ScenarioName_OceanPhantomCaveGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Garden"}, "Feed Terrace Hungry Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["7 stars", "400 star bits"], "type": "Action", "start_location": "Terrace Hungry Luma"}, "Gateway Grand Star returned": {"star_name": null, "follows": ["Gateway 1"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Battlerock H": {"star_name": "ScenarioName_BattleShipGalaxy6", "follows": [], "end_location": null, "requirements": ["Battlerock 1"], "type": "Level", "start_location": "Fountain"}, "Deep Dark 2": {"star_name": "ScenarioName_OceanPhantomCaveGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Garden"}, "Dusty Dune H": {"star_name": "ScenarioName_SandClockGalaxy6", "follows": [], "end_location": null, "requirements": ["Dusty Dune 2"], "type": "Level", "start_location": "Bedroom"}, "Gateway 1": {"star_name": "ScenarioName_HeavensDoorGalaxy1", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "File select"}, "Engine Room enemy base found": {"star_name": null, "follows": ["45 stars"], "end_location": null, "requirements": [], "type": "Event", "start_location": "Engine Room"}, "Honeyclimb": {"star_name": "ScenarioName_HoneyBeeExGalaxy1", "follows": [], "end_location": null, "requirements": ["42 stars"], "type": "Level", "start_location": "Bedroom"}, "Battlerock 1": {"star_name": "ScenarioName_BattleShipGalaxy1", "follows": [], "end_location": null, "requirements": ["12 stars"], "type": "Level", "start_location": "Fountain"}, "Dreadnought 1": {"star_name": "ScenarioName_CannonFleetGalaxy1", "follows": [], "end_location": null, "requirements": ["48 stars"], "type": "Level", "start_location": "Garden"}, "Kitchen Grand Star returned": {"star_name": null, "follows": ["Bowser Jr.'s Airship Armada"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Toy Time 2": {"star_name": "ScenarioName_FactoryGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Engine Room"}, "Ghostly 2": {"star_name": "ScenarioName_PhantomGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Kitchen"}, "Toy Time P": {"star_name": "ScenarioName_FactoryGalaxy5", "follows": [], "end_location": null, "requirements": ["Toy Time 2"], "type": "Level", "start_location": "Engine Room"}, "Talk to Grand Finale Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Ending (120 stars)"], "type": "Action", "start_location": "Grand Finale Luma"}, "Luigi letter 2": {"star_name": null, "follows": [], "end_location": null, "requirements": [], "type": "Action", "start_location": "Mailtoad"}, "Dusty Dune P": {"star_name": "ScenarioName_SandClockGalaxy5", "follows": [], "end_location": null, "requirements": ["Dusty Dune 2"], "type": "Level", "start_location": "Bedroom"}, "Talk to Luigi at Garage": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Ghostly 1"], "type": "Action", "start_location": "Luigi at Garage"}, "Freezeflame H": {"star_name": "ScenarioName_IceVolcanoGalaxy6", "follows": [], "end_location": null, "requirements": ["26 stars"], "type": "Level", "start_location": "Bedroom"}, "Sea Slide P": {"star_name": "ScenarioName_OceanRingGalaxy5", "follows": [], "end_location": null, "requirements": ["Sea Slide 3"], "type": "Level", "start_location": "Engine Room"}, "Storybook Chapter 2": {"star_name": null, "follows": [], "end_location": null, "requirements": ["24 stars"], "type": "Event", "start_location": null}, "Talk to Loopdeeswoop Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Green star 3 returned"], "type": "Action", "start_location": "Loopdeswoop Luma"}, "Space Junk 3": {"star_name": "ScenarioName_StarDustGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Fountain"}, "Ghostly C": {"star_name": "ScenarioName_PhantomGalaxy4", "follows": [], "end_location": null, "requirements": ["Ghostly 3"], "type": "Level", "start_location": "Kitchen"}, "Good Egg 3": {"star_name": "ScenarioName_EggStarGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Terrace"}, "Gold Leaf H": {"star_name": "ScenarioName_ReverseKingdomGalaxy6", "follows": [], "end_location": null, "requirements": ["Gold Leaf 1"], "type": "Level", "start_location": "Engine Room"}, "Feed Gate Hungry Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Ghostly 1", "Gateway P", "1200 star bits"], "type": "Action", "start_location": "Gate Hungry Luma"}, "Gusty Garden 2": {"star_name": "ScenarioName_CosmosGardenGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Bedroom"}, "Green star 3 returned": {"star_name": null, "follows": ["3 green stars"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Dreadnought H": {"star_name": "ScenarioName_CannonFleetGalaxy6", "follows": [], "end_location": null, "requirements": ["Dreadnought 2"], "type": "Level", "start_location": "Garden"}, "120 stars (and going to center of universe)": {"star_name": null, "follows": ["120 stars"], "end_location": null, "requirements": [], "type": "Event", "start_location": null}, "Feed Kitchen Hungry Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Beach Bowl 1", "600 star bits"], "type": "Action", "start_location": "Kitchen Hungry Luma"}, "Honeyhive C": {"star_name": "ScenarioName_HoneyBeeKingdomGalaxy4", "follows": [], "end_location": null, "requirements": ["Honeyhive 1"], "type": "Level", "start_location": "Terrace"}, "Storybook Chapter 5": {"star_name": null, "follows": [], "end_location": null, "requirements": ["40 stars"], "type": "Event", "start_location": null}, "Unlock comets": {"star_name": null, "follows": ["13 stars"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Unlock center of universe (and choose Go)": {"star_name": null, "follows": ["60 stars"], "end_location": null, "requirements": [], "type": "Event", "start_location": null}, "Boo's Boneyard": {"star_name": "ScenarioName_TeresaMario2DGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Feed Gate Hungry Luma"], "type": "Level", "start_location": "Gate Hungry Luma"}, "Feed Bedroom Hungry Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Dusty Dune 1", "800 star bits"], "type": "Action", "start_location": "Bedroom Hungry Luma"}, "Battlerock L": {"star_name": "ScenarioName_BattleShipGalaxy7", "follows": [], "end_location": null, "requirements": ["12 stars", "Luigi letter 2"], "type": "Level", "start_location": "Fountain"}, "Toy Time C": {"star_name": "ScenarioName_FactoryGalaxy4", "follows": [], "end_location": null, "requirements": ["Toy Time H"], "type": "Level", "start_location": "Engine Room"}, "Storybook Chapter 8 and 9": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Bowser's Galaxy Reactor"], "type": "Event", "start_location": null}, "Bedroom Grand Star returned (60 stars)": {"star_name": null, "follows": ["Bowser's Dark Matter Plant"], "end_location": "Observatory start", "requirements": ["60 stars"], "type": "Event", "start_location": null}, "Gold Leaf P": {"star_name": "ScenarioName_ReverseKingdomGalaxy5", "follows": [], "end_location": null, "requirements": ["Gold Leaf 3"], "type": "Level", "start_location": "Engine Room"}, "Ending (61 stars)": {"star_name": null, "follows": ["Bowser's Galaxy Reactor"], "end_location": "Title screen", "requirements": ["Less than 120 stars"], "type": "Event", "start_location": null}, "Luigi letter 3": {"star_name": null, "follows": [], "end_location": null, "requirements": [], "type": "Action", "start_location": "Mailtoad"}, "Honeyhive P": {"star_name": "ScenarioName_HoneyBeeKingdomGalaxy5", "follows": [], "end_location": null, "requirements": ["Honeyhive 1"], "type": "Level", "start_location": "Terrace"}, "Sand Spiral": {"star_name": "ScenarioName_TransformationExGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Feed Engine Room Hungry Luma"], "type": "Level", "start_location": "Engine Room Hungry Luma"}, "Freezeflame 1": {"star_name": "ScenarioName_IceVolcanoGalaxy1", "follows": [], "end_location": null, "requirements": ["26 stars"], "type": "Level", "start_location": "Bedroom"}, "Dreadnought 3": {"star_name": "ScenarioName_CannonFleetGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Garden"}, "Talk to Bubble Blast Luma": {"star_name": null, "follows": [], "end_location": null, "requirements": ["Green star 3 returned"], "type": "Action", "start_location": "Bubble Blast Luma"}, "Fountain Grand Star returned": {"star_name": null, "follows": ["Bowser's Star Reactor"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Good Egg P": {"star_name": "ScenarioName_EggStarGalaxy5", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Terrace"}, "Space Junk C": {"star_name": "ScenarioName_StarDustGalaxy4", "follows": [], "end_location": null, "requirements": ["Space Junk 1"], "type": "Level", "start_location": "Fountain"}, "Melty Molten P": {"star_name": "ScenarioName_HellProminenceGalaxy5", "follows": [], "end_location": null, "requirements": ["Melty Molten 3"], "type": "Level", "start_location": "Garden"}, "Gusty Garden H": {"star_name": "ScenarioName_CosmosGardenGalaxy6", "follows": [], "end_location": null, "requirements": ["Gusty Garden 2"], "type": "Level", "start_location": "Bedroom"}, "Gateway P": {"star_name": "ScenarioName_HeavensDoorGalaxy2", "follows": [], "end_location": "Observatory start", "requirements": [], "type": "Level", "start_location": "Gate"}, "Melty Molten H": {"star_name": "ScenarioName_HellProminenceGalaxy6", "follows": [], "end_location": null, "requirements": ["52 stars"], "type": "Level", "start_location": "Garden"}, "Bedroom enemy base found": {"star_name": null, "follows": ["33 stars"], "end_location": null, "requirements": [], "type": "Event", "start_location": "Bedroom"}, "Green star 1 returned": {"star_name": null, "follows": ["1 green star"], "end_location": "Observatory start", "requirements": [], "type": "Event", "start_location": null}, "Storybook Chapter 1": {"star_name": null, "follows": [], "end_location": null, "requirements": ["17 stars"], "type": "Event", "start_location": null}, "Buoy Base 1": {"star_name": "ScenarioName_OceanFloaterLandGalaxy1", "follows": [], "end_location": null, "requirements": ["30 stars"], "type": "Level", "start_location": "Kitchen"}, "Sea Slide C": {"star_name": "ScenarioName_OceanRingGalaxy4", "follows": [], "end_location": null, "requirements": ["Sea Slide 1"], "type": "Level", "start_location": "Engine Room"}, "Buoy Base G": {"star_name": "ScenarioName_OceanFloaterLandGalaxy2", "follows": [], "end_location": null, "requirements": ["30 stars"], "type": "Level", "start_location": "Kitchen"}, "Ghostly H": {"star_name": "ScenarioName_PhantomGalaxy6", "follows": [], "end_location": null, "requirements": ["Ghostly 1"], "type": "Level", "start_location": "Kitchen"}, "Sweet Sweet": {"star_name": "ScenarioName_BeltConveyerExGalaxy1", "follows": [], "end_location": "Observatory start", "requirements": ["Feed Terrace Hungry Luma"], "type": "Level", "start_location": "Terrace Hungry Luma"}, "Beach Bowl 3": {"star_name": "ScenarioName_HeavenlyBeachGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Kitchen"}, "Battlerock P": {"star_name": "ScenarioName_BattleShipGalaxy5", "follows": [], "end_location": null, "requirements": ["Battlerock 1"], "type": "Level", "start_location": "Fountain"}, "Kitchen enemy base found": {"star_name": null, "follows": ["23 stars"], "end_location": null, "requirements": [], "type": "Event", "start_location": "Kitchen"}, "Storybook Chapter 3": {"star_name": null, "follows": [], "end_location": null, "requirements": ["28 stars"], "type": "Event", "start_location": null}, "Freezeflame 2": {"star_name": "ScenarioName_IceVolcanoGalaxy2", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Bedroom"}, "Gold Leaf 3": {"star_name": "ScenarioName_ReverseKingdomGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Engine Room"}, "Dreadnought P": {"star_name": "ScenarioName_CannonFleetGalaxy5", "follows": [], "end_location": null, "requirements": ["Dreadnought 2"], "type": "Level", "start_location": "Garden"}, "Honeyhive 3": {"star_name": "ScenarioName_HoneyBeeKingdomGalaxy3", "follows": [], "end_location": null, "requirements": [], "type": "Level", "start_location": "Terrace"}, "Gold Leaf C": {"star_name": "ScenarioName_ReverseKingdomGalaxy4", "follows": [], "end_location": null, "requirements": ["Gold Leaf 3"], "type": "Level", "start_location": "Engine Room"}}
\ No newline at end of file
+window.itemDetails = {"Gateway Grand Star returned": {"requirements": [], "follows": ["Gateway 1"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "First Terrace visit": {"requirements": [], "follows": ["Gateway Grand Star returned"], "start_location": "Terrace", "end_location": null, "star_name": null, "type": "Event"}, "Butler's star bit explanation": {"requirements": [], "follows": ["2 stars"], "start_location": null, "end_location": "Terrace", "star_name": null, "type": "Event"}, "Unlock Honeyhive": {"requirements": [], "follows": ["3 stars"], "start_location": null, "end_location": "Terrace", "star_name": null, "type": "Event"}, "Find Toads": {"requirements": [], "follows": ["Honeyhive 1"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Terrace enemy base found": {"requirements": [], "follows": ["8 stars"], "start_location": "Terrace", "end_location": null, "star_name": null, "type": "Event"}, "Terrace Grand Star returned": {"requirements": [], "follows": ["Bowser Jr.'s Robot Reactor"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Unlock comets": {"requirements": [], "follows": ["13 stars"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Fountain enemy base found": {"requirements": [], "follows": ["15 stars"], "start_location": "Fountain", "end_location": null, "star_name": null, "type": "Event"}, "Fountain Grand Star returned": {"requirements": [], "follows": ["Bowser's Star Reactor"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Save Luigi": {"requirements": [], "follows": ["Ghostly 1"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Talk to Luigi at Garage": {"requirements": ["Ghostly 1"], "follows": [], "start_location": "Luigi at Garage", "end_location": null, "star_name": null, "type": "Action"}, "Luigi letter 1": {"requirements": [], "follows": [], "start_location": null, "end_location": "Mailtoad", "star_name": null, "type": "Event"}, "Luigi letter 2": {"requirements": [], "follows": [], "start_location": "Mailtoad", "end_location": null, "star_name": null, "type": "Action"}, "Luigi letter 3": {"requirements": [], "follows": [], "start_location": "Mailtoad", "end_location": null, "star_name": null, "type": "Action"}, "Kitchen enemy base found": {"requirements": [], "follows": ["23 stars"], "start_location": "Kitchen", "end_location": null, "star_name": null, "type": "Event"}, "Kitchen Grand Star returned": {"requirements": [], "follows": ["Bowser Jr.'s Airship Armada"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Bedroom enemy base found": {"requirements": [], "follows": ["33 stars"], "start_location": "Bedroom", "end_location": null, "star_name": null, "type": "Event"}, "Bedroom Grand Star returned (before 60 stars)": {"requirements": ["Less than 60 stars"], "follows": ["Bowser's Dark Matter Plant"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Bedroom Grand Star returned (60 stars)": {"requirements": ["60 stars"], "follows": ["Bowser's Dark Matter Plant"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Engine Room enemy base found": {"requirements": [], "follows": ["45 stars"], "start_location": "Engine Room", "end_location": null, "star_name": null, "type": "Event"}, "Engine Room Grand Star returned (before 60 stars)": {"requirements": ["Less than 60 stars"], "follows": ["Bowser Jr.'s Lava Reactor"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Engine Room Grand Star returned (60 stars)": {"requirements": ["60 stars"], "follows": ["Bowser Jr.'s Lava Reactor"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Unlock center of universe (and choose Go)": {"requirements": [], "follows": ["60 stars"], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Ending (61 stars)": {"requirements": ["Less than 120 stars"], "follows": ["Bowser's Galaxy Reactor"], "start_location": null, "end_location": "Title screen", "star_name": null, "type": "Event"}, "Return to Observatory after 61 star ending": {"requirements": [], "follows": ["Ending (61 stars)"], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "120 stars (and going to center of universe)": {"requirements": [], "follows": ["120 stars"], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Ending (120 stars)": {"requirements": ["120 stars"], "follows": ["Bowser's Galaxy Reactor"], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Feed Terrace Hungry Luma": {"requirements": ["7 stars", "400 star bits"], "follows": [], "start_location": "Terrace Hungry Luma", "end_location": null, "star_name": null, "type": "Action"}, "Feed Fountain Hungry Luma": {"requirements": ["Space Junk 3", "400 star bits"], "follows": [], "start_location": "Fountain Hungry Luma", "end_location": null, "star_name": null, "type": "Action"}, "Feed Kitchen Hungry Luma": {"requirements": ["Beach Bowl 1", "600 star bits"], "follows": [], "start_location": "Kitchen Hungry Luma", "end_location": null, "star_name": null, "type": "Action"}, "Feed Bedroom Hungry Luma": {"requirements": ["Dusty Dune 1", "800 star bits"], "follows": [], "start_location": "Bedroom Hungry Luma", "end_location": null, "star_name": null, "type": "Action"}, "Feed Engine Room Hungry Luma": {"requirements": ["Ghostly 1", "Sea Slide 2", "1000 star bits"], "follows": [], "start_location": "Engine Room Hungry Luma", "end_location": null, "star_name": null, "type": "Action"}, "Feed Gate Hungry Luma": {"requirements": ["Ghostly 1", "Gateway P", "1200 star bits"], "follows": [], "start_location": "Gate Hungry Luma", "end_location": null, "star_name": null, "type": "Action"}, "Feed Garden Hungry Luma": {"requirements": ["Melty Molten 1", "1600 star bits"], "follows": [], "start_location": "Garden Hungry Luma", "end_location": null, "star_name": null, "type": "Action"}, "Green star 1 returned": {"requirements": [], "follows": ["1 green star"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Green star 3 returned": {"requirements": [], "follows": ["3 green stars"], "start_location": null, "end_location": "Observatory start", "star_name": null, "type": "Event"}, "Talk to Rolling Gizmo Luma": {"requirements": ["Green star 3 returned"], "follows": [], "start_location": "Rolling Gizmo Luma", "end_location": null, "star_name": null, "type": "Action"}, "Talk to Loopdeeswoop Luma": {"requirements": ["Green star 3 returned"], "follows": [], "start_location": "Loopdeswoop Luma", "end_location": null, "star_name": null, "type": "Action"}, "Talk to Bubble Blast Luma": {"requirements": ["Green star 3 returned"], "follows": [], "start_location": "Bubble Blast Luma", "end_location": null, "star_name": null, "type": "Action"}, "Talk to Grand Finale Luma": {"requirements": ["Ending (120 stars)"], "follows": [], "start_location": "Grand Finale Luma", "end_location": null, "star_name": null, "type": "Action"}, "Good Egg 1": {"requirements": ["1 star"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_EggStarGalaxy1", "type": "Level"}, "Good Egg 2": {"requirements": [], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_EggStarGalaxy2", "type": "Level"}, "Good Egg 3": {"requirements": [], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_EggStarGalaxy3", "type": "Level"}, "Good Egg C": {"requirements": ["Good Egg 1"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_EggStarGalaxy4", "type": "Level"}, "Good Egg P": {"requirements": [], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_EggStarGalaxy5", "type": "Level"}, "Good Egg L": {"requirements": ["1 star", "Luigi letter 1"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_EggStarGalaxy6", "type": "Level"}, "Honeyhive 1": {"requirements": ["3 stars"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_HoneyBeeKingdomGalaxy1", "type": "Level"}, "Honeyhive 2": {"requirements": [], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_HoneyBeeKingdomGalaxy2", "type": "Level"}, "Honeyhive 3": {"requirements": [], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_HoneyBeeKingdomGalaxy3", "type": "Level"}, "Honeyhive C": {"requirements": ["Honeyhive 1"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_HoneyBeeKingdomGalaxy4", "type": "Level"}, "Honeyhive P": {"requirements": ["Honeyhive 1"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_HoneyBeeKingdomGalaxy5", "type": "Level"}, "Honeyhive L": {"requirements": ["3 stars", "Luigi letter 3"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_HoneyBeeKingdomGalaxy6", "type": "Level"}, "Space Junk 1": {"requirements": ["9 stars"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_StarDustGalaxy1", "type": "Level"}, "Space Junk 2": {"requirements": [], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_StarDustGalaxy2", "type": "Level"}, "Space Junk 3": {"requirements": [], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_StarDustGalaxy3", "type": "Level"}, "Space Junk C": {"requirements": ["Space Junk 1"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_StarDustGalaxy4", "type": "Level"}, "Space Junk P": {"requirements": ["Space Junk 2"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_StarDustGalaxy5", "type": "Level"}, "Space Junk H": {"requirements": ["Space Junk 2"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_StarDustGalaxy6", "type": "Level"}, "Battlerock 1": {"requirements": ["12 stars"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BattleShipGalaxy1", "type": "Level"}, "Battlerock 2": {"requirements": [], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BattleShipGalaxy2", "type": "Level"}, "Battlerock 3": {"requirements": [], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BattleShipGalaxy3", "type": "Level"}, "Battlerock C": {"requirements": ["Battlerock 3"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BattleShipGalaxy4", "type": "Level"}, "Battlerock P": {"requirements": ["Battlerock 1"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BattleShipGalaxy5", "type": "Level"}, "Battlerock H": {"requirements": ["Battlerock 1"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BattleShipGalaxy6", "type": "Level"}, "Battlerock L": {"requirements": ["12 stars", "Luigi letter 2"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BattleShipGalaxy7", "type": "Level"}, "Beach Bowl 1": {"requirements": ["16 stars"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_HeavenlyBeachGalaxy1", "type": "Level"}, "Beach Bowl 2": {"requirements": [], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_HeavenlyBeachGalaxy2", "type": "Level"}, "Beach Bowl 3": {"requirements": [], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_HeavenlyBeachGalaxy3", "type": "Level"}, "Beach Bowl C": {"requirements": ["Beach Bowl 3"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_HeavenlyBeachGalaxy4", "type": "Level"}, "Beach Bowl P": {"requirements": ["Beach Bowl 3"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_HeavenlyBeachGalaxy5", "type": "Level"}, "Beach Bowl H": {"requirements": ["Beach Bowl 2"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_HeavenlyBeachGalaxy6", "type": "Level"}, "Ghostly 1": {"requirements": ["20 stars"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_PhantomGalaxy1", "type": "Level"}, "Ghostly 2": {"requirements": [], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_PhantomGalaxy2", "type": "Level"}, "Ghostly 3": {"requirements": [], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_PhantomGalaxy3", "type": "Level"}, "Ghostly C": {"requirements": ["Ghostly 3"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_PhantomGalaxy4", "type": "Level"}, "Ghostly P": {"requirements": ["Ghostly 2"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_PhantomGalaxy5", "type": "Level"}, "Ghostly H": {"requirements": ["Ghostly 1"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_PhantomGalaxy6", "type": "Level"}, "Gusty Garden 1": {"requirements": ["24 stars"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_CosmosGardenGalaxy1", "type": "Level"}, "Gusty Garden 2": {"requirements": [], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_CosmosGardenGalaxy2", "type": "Level"}, "Gusty Garden 3": {"requirements": [], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_CosmosGardenGalaxy3", "type": "Level"}, "Gusty Garden C": {"requirements": ["Gusty Garden 3"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_CosmosGardenGalaxy4", "type": "Level"}, "Gusty Garden P": {"requirements": ["Gusty Garden 1"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_CosmosGardenGalaxy5", "type": "Level"}, "Gusty Garden H": {"requirements": ["Gusty Garden 2"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_CosmosGardenGalaxy6", "type": "Level"}, "Freezeflame 1": {"requirements": ["26 stars"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_IceVolcanoGalaxy1", "type": "Level"}, "Freezeflame 2": {"requirements": [], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_IceVolcanoGalaxy2", "type": "Level"}, "Freezeflame 3": {"requirements": [], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_IceVolcanoGalaxy3", "type": "Level"}, "Freezeflame C": {"requirements": ["Freezeflame 1"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_IceVolcanoGalaxy4", "type": "Level"}, "Freezeflame P": {"requirements": ["Freezeflame 1"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_IceVolcanoGalaxy5", "type": "Level"}, "Freezeflame H": {"requirements": ["26 stars"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_IceVolcanoGalaxy6", "type": "Level"}, "Dusty Dune 1": {"requirements": ["29 stars"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_SandClockGalaxy1", "type": "Level"}, "Dusty Dune 2": {"requirements": [], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_SandClockGalaxy2", "type": "Level"}, "Dusty Dune 3": {"requirements": [], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_SandClockGalaxy3", "type": "Level"}, "Dusty Dune C": {"requirements": ["Dusty Dune 3"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_SandClockGalaxy4", "type": "Level"}, "Dusty Dune P": {"requirements": ["Dusty Dune 2"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_SandClockGalaxy5", "type": "Level"}, "Dusty Dune H": {"requirements": ["Dusty Dune 2"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_SandClockGalaxy6", "type": "Level"}, "Dusty Dune G": {"requirements": ["Dusty Dune 1"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_SandClockGalaxy7", "type": "Level"}, "Gold Leaf 1": {"requirements": ["34 stars"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_ReverseKingdomGalaxy1", "type": "Level"}, "Gold Leaf 2": {"requirements": [], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_ReverseKingdomGalaxy2", "type": "Level"}, "Gold Leaf 3": {"requirements": [], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_ReverseKingdomGalaxy3", "type": "Level"}, "Gold Leaf C": {"requirements": ["Gold Leaf 3"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_ReverseKingdomGalaxy4", "type": "Level"}, "Gold Leaf P": {"requirements": ["Gold Leaf 3"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_ReverseKingdomGalaxy5", "type": "Level"}, "Gold Leaf H": {"requirements": ["Gold Leaf 1"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_ReverseKingdomGalaxy6", "type": "Level"}, "Sea Slide 1": {"requirements": ["36 stars"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_OceanRingGalaxy1", "type": "Level"}, "Sea Slide 2": {"requirements": [], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_OceanRingGalaxy2", "type": "Level"}, "Sea Slide 3": {"requirements": [], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_OceanRingGalaxy3", "type": "Level"}, "Sea Slide C": {"requirements": ["Sea Slide 1"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_OceanRingGalaxy4", "type": "Level"}, "Sea Slide P": {"requirements": ["Sea Slide 3"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_OceanRingGalaxy5", "type": "Level"}, "Sea Slide H": {"requirements": ["Sea Slide 2"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_OceanRingGalaxy6", "type": "Level"}, "Toy Time 1": {"requirements": ["40 stars"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_FactoryGalaxy1", "type": "Level"}, "Toy Time 2": {"requirements": [], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_FactoryGalaxy2", "type": "Level"}, "Toy Time 3": {"requirements": [], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_FactoryGalaxy3", "type": "Level"}, "Toy Time C": {"requirements": ["Toy Time H"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_FactoryGalaxy4", "type": "Level"}, "Toy Time P": {"requirements": ["Toy Time 2"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_FactoryGalaxy5", "type": "Level"}, "Toy Time H": {"requirements": ["Toy Time 1"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_FactoryGalaxy6", "type": "Level"}, "Deep Dark 1": {"requirements": ["46 stars"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_OceanPhantomCaveGalaxy1", "type": "Level"}, "Deep Dark 2": {"requirements": [], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_OceanPhantomCaveGalaxy2", "type": "Level"}, "Deep Dark 3": {"requirements": [], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_OceanPhantomCaveGalaxy3", "type": "Level"}, "Deep Dark C": {"requirements": ["Deep Dark 2"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_OceanPhantomCaveGalaxy4", "type": "Level"}, "Deep Dark P": {"requirements": ["Deep Dark 1"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_OceanPhantomCaveGalaxy5", "type": "Level"}, "Deep Dark H": {"requirements": ["46 stars"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_OceanPhantomCaveGalaxy6", "type": "Level"}, "Dreadnought 1": {"requirements": ["48 stars"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_CannonFleetGalaxy1", "type": "Level"}, "Dreadnought 2": {"requirements": [], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_CannonFleetGalaxy2", "type": "Level"}, "Dreadnought 3": {"requirements": [], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_CannonFleetGalaxy3", "type": "Level"}, "Dreadnought C": {"requirements": ["Dreadnought 3"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_CannonFleetGalaxy4", "type": "Level"}, "Dreadnought P": {"requirements": ["Dreadnought 2"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_CannonFleetGalaxy5", "type": "Level"}, "Dreadnought H": {"requirements": ["Dreadnought 2"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_CannonFleetGalaxy6", "type": "Level"}, "Melty Molten 1": {"requirements": ["52 stars"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_HellProminenceGalaxy1", "type": "Level"}, "Melty Molten 2": {"requirements": [], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_HellProminenceGalaxy2", "type": "Level"}, "Melty Molten 3": {"requirements": [], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_HellProminenceGalaxy3", "type": "Level"}, "Melty Molten C": {"requirements": ["Melty Molten 2"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_HellProminenceGalaxy4", "type": "Level"}, "Melty Molten P": {"requirements": ["Melty Molten 3"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_HellProminenceGalaxy5", "type": "Level"}, "Melty Molten H": {"requirements": ["52 stars"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_HellProminenceGalaxy6", "type": "Level"}, "Gateway 1": {"requirements": [], "follows": [], "start_location": "File select", "end_location": null, "star_name": "ScenarioName_HeavensDoorGalaxy1", "type": "Level"}, "Gateway P": {"requirements": [], "follows": [], "start_location": "Gate", "end_location": "Observatory start", "star_name": "ScenarioName_HeavensDoorGalaxy2", "type": "Level"}, "Bowser Jr.'s Robot Reactor": {"requirements": ["8 stars"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_TriLegLv1Galaxy1", "type": "Level"}, "Bowser's Star Reactor": {"requirements": ["15 stars"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_KoopaBattleVs1Galaxy1", "type": "Level"}, "Bowser Jr.'s Airship Armada": {"requirements": ["23 stars"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_KoopaJrShipLv1Galaxy1", "type": "Level"}, "Bowser's Dark Matter Plant": {"requirements": ["33 stars"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_KoopaBattleVs2Galaxy1", "type": "Level"}, "Bowser Jr.'s Lava Reactor": {"requirements": ["45 stars"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_FloaterOtaKingGalaxy1", "type": "Level"}, "Bowser's Galaxy Reactor": {"requirements": ["60 stars"], "follows": ["Unlock center of universe (and choose Go)", "120 stars (and going to center of universe)"], "start_location": null, "end_location": null, "star_name": "ScenarioName_KoopaBattleVs3Galaxy1", "type": "Level"}, "Loopdeeloop": {"requirements": ["5 stars"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_SurfingLv1Galaxy1", "type": "Level"}, "Flipswitch": {"requirements": ["7 stars"], "follows": [], "start_location": "Terrace", "end_location": null, "star_name": "ScenarioName_FlipPanelExGalaxy1", "type": "Level"}, "Rolling Green": {"requirements": ["11 stars"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_TamakoroExLv1Galaxy1", "type": "Level"}, "Hurry-Scurry": {"requirements": ["18 stars"], "follows": [], "start_location": "Fountain", "end_location": null, "star_name": "ScenarioName_BreakDownPlanetGalaxy1", "type": "Level"}, "Bubble Breeze": {"requirements": ["19 stars"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_CubeBubbleExLv1Galaxy1", "type": "Level"}, "Sweet Sweet": {"requirements": ["Feed Terrace Hungry Luma"], "follows": [], "start_location": "Terrace Hungry Luma", "end_location": "Observatory start", "star_name": "ScenarioName_BeltConveyerExGalaxy1", "type": "Level"}, "Sling Pod": {"requirements": ["Feed Fountain Hungry Luma"], "follows": [], "start_location": "Fountain Hungry Luma", "end_location": "Observatory start", "star_name": "ScenarioName_CocoonExGalaxy1", "type": "Level"}, "Buoy Base 1": {"requirements": ["30 stars"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_OceanFloaterLandGalaxy1", "type": "Level"}, "Buoy Base G": {"requirements": ["30 stars"], "follows": [], "start_location": "Kitchen", "end_location": null, "star_name": "ScenarioName_OceanFloaterLandGalaxy2", "type": "Level"}, "Drip Drop": {"requirements": ["Feed Kitchen Hungry Luma"], "follows": [], "start_location": "Kitchen Hungry Luma", "end_location": "Observatory start", "star_name": "ScenarioName_TearDropGalaxy1", "type": "Level"}, "Boo's Boneyard": {"requirements": ["Feed Gate Hungry Luma"], "follows": [], "start_location": "Gate Hungry Luma", "end_location": "Observatory start", "star_name": "ScenarioName_TeresaMario2DGalaxy1", "type": "Level"}, "Honeyclimb": {"requirements": ["42 stars"], "follows": [], "start_location": "Bedroom", "end_location": null, "star_name": "ScenarioName_HoneyBeeExGalaxy1", "type": "Level"}, "Snow Cap": {"requirements": ["Feed Garden Hungry Luma"], "follows": [], "start_location": "Garden Hungry Luma", "end_location": "Observatory start", "star_name": "ScenarioName_SnowCapsuleGalaxy1", "type": "Level"}, "Bonefin": {"requirements": ["55 stars", "Drip Drop"], "follows": [], "start_location": "Engine Room", "end_location": null, "star_name": "ScenarioName_SkullSharkGalaxy1", "type": "Level"}, "Sand Spiral": {"requirements": ["Feed Engine Room Hungry Luma"], "follows": [], "start_location": "Engine Room Hungry Luma", "end_location": "Observatory start", "star_name": "ScenarioName_TransformationExGalaxy1", "type": "Level"}, "Matter Splatter": {"requirements": ["50 stars"], "follows": [], "start_location": "Garden", "end_location": null, "star_name": "ScenarioName_DarkRoomGalaxy1", "type": "Level"}, "Bigmouth": {"requirements": ["Feed Bedroom Hungry Luma"], "follows": [], "start_location": "Bedroom Hungry Luma", "end_location": "Observatory start", "star_name": "ScenarioName_FishTunnelGalaxy1", "type": "Level"}, "Rolling Gizmo": {"requirements": ["Talk to Rolling Gizmo Luma"], "follows": [], "start_location": "Rolling Gizmo Luma", "end_location": "Observatory start", "star_name": "ScenarioName_TamakoroExLv2Galaxy1", "type": "Level"}, "Loopdeeswoop": {"requirements": ["Talk to Loopdeeswoop Luma"], "follows": [], "start_location": "Loopdeswoop Luma", "end_location": "Observatory start", "star_name": "ScenarioName_SurfingLv2Galaxy1", "type": "Level"}, "Bubble Blast": {"requirements": ["Talk to Bubble Blast Luma"], "follows": [], "start_location": "Bubble Blast Luma", "end_location": "Observatory start", "star_name": "ScenarioName_CubeBubbleExLv2Galaxy1", "type": "Level"}, "Grand Finale": {"requirements": ["Talk to Grand Finale Luma"], "follows": [], "start_location": "Grand Finale Luma", "end_location": "Observatory start", "star_name": "ScenarioName_PeachCastleFinalGalaxy1", "type": "Level"}, "Storybook Chapter 1": {"requirements": ["17 stars"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Storybook Chapter 2": {"requirements": ["24 stars"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Storybook Chapter 3": {"requirements": ["28 stars"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Storybook Chapter 4": {"requirements": ["32 stars"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Storybook Chapter 5": {"requirements": ["40 stars"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Storybook Chapter 6": {"requirements": ["49 stars"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Storybook Chapter 7": {"requirements": ["58 stars"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}, "Storybook Chapter 8 and 9": {"requirements": ["Bowser's Galaxy Reactor"], "follows": [], "start_location": null, "end_location": null, "star_name": null, "type": "Event"}};
+window.itemGraph = {"names": ["Gateway Grand Star returned", "First Terrace visit", "Butler's star bit explanation", "Unlock Honeyhive", "Find Toads", "Terrace enemy base found", "Terrace Grand Star returned", "Unlock comets", "Fountain enemy base found", "Fountain Grand Star returned", "Save Luigi", "Talk to Luigi at Garage", "Luigi letter 1", "Luigi letter 2", "Luigi letter 3", "Kitchen enemy base found", "Kitchen Grand Star returned", "Bedroom enemy base found", "Bedroom Grand Star returned (before 60 stars)", "Bedroom Grand Star returned (60 stars)", "Engine Room enemy base found", "Engine Room Grand Star returned (before 60 stars)", "Engine Room Grand Star returned (60 stars)", "Unlock center of universe (and choose Go)", "Ending (61 stars)", "Return to Observatory after 61 star ending", "120 stars (and going to center of universe)", "Ending (120 stars)", "Feed Terrace Hungry Luma", "Feed Fountain Hungry Luma", "Feed Kitchen Hungry Luma", "Feed Bedroom Hungry Luma", "Feed Engine Room Hungry Luma", "Feed Gate Hungry Luma", "Feed Garden Hungry Luma", "Green star 1 returned", "Green star 3 returned", "Talk to Rolling Gizmo Luma", "Talk to Loopdeeswoop Luma", "Talk to Bubble Blast Luma", "Talk to Grand Finale Luma", "Good Egg 1", "Good Egg 2", "Good Egg 3", "Good Egg C", "Good Egg P", "Good Egg L", "Honeyhive 1", "Honeyhive 2", "Honeyhive 3", "Honeyhive C", "Honeyhive P", "Honeyhive L", "Space Junk 1", "Space Junk 2", "Space Junk 3", "Space Junk C", "Space Junk P", "Space Junk H", "Battlerock 1", "Battlerock 2", "Battlerock 3", "Battlerock C", "Battlerock P", "Battlerock H", "Battlerock L", "Beach Bowl 1", "Beach Bowl 2", "Beach Bowl 3", "Beach Bowl C", "Beach Bowl P", "Beach Bowl H", "Ghostly 1", "Ghostly 2", "Ghostly 3", "Ghostly C", "Ghostly P", "Ghostly H", "Gusty Garden 1", "Gusty Garden 2", "Gusty Garden 3", "Gusty Garden C", "Gusty Garden P", "Gusty Garden H", "Freezeflame 1", "Freezeflame 2", "Freezeflame 3", "Freezeflame C", "Freezeflame P", "Freezeflame H", "Dusty Dune 1", "Dusty Dune 2", "Dusty Dune 3", "Dusty Dune C", "Dusty Dune P", "Dusty Dune H", "Dusty Dune G", "Gold Leaf 1", "Gold Leaf 2", "Gold Leaf 3", "Gold Leaf C", "Gold Leaf P", "Gold Leaf H", "Sea Slide 1", "Sea Slide 2", "Sea Slide 3", "Sea Slide C", "Sea Slide P", "Sea Slide H", "Toy Time 1", "Toy Time 2", "Toy Time 3", "Toy Time C", "Toy Time P", "Toy Time H", "Deep Dark 1", "Deep Dark 2", "Deep Dark 3", "Deep Dark C", "Deep Dark P", "Deep Dark H", "Dreadnought 1", "Dreadnought 2", "Dreadnought 3", "Dreadnought C", "Dreadnought P", "Dreadnought H", "Melty Molten 1", "Melty Molten 2", "Melty Molten 3", "Melty Molten C", "Melty Molten P", "Melty Molten H", "Gateway 1", "Gateway P", "Bowser Jr.'s Robot Reactor", "Bowser's Star Reactor", "Bowser Jr.'s Airship Armada", "Bowser's Dark Matter Plant", "Bowser Jr.'s Lava Reactor", "Bowser's Galaxy Reactor", "Loopdeeloop", "Flipswitch", "Rolling Green", "Hurry-Scurry", "Bubble Breeze", "Sweet Sweet", "Sling Pod", "Buoy Base 1", "Buoy Base G", "Drip Drop", "Boo's Boneyard", "Honeyclimb", "Snow Cap", "Bonefin", "Sand Spiral", "Matter Splatter", "Bigmouth", "Rolling Gizmo", "Loopdeeswoop", "Bubble Blast", "Grand Finale", "Storybook Chapter 1", "Storybook Chapter 2", "Storybook Chapter 3", "Storybook Chapter 4", "Storybook Chapter 5", "Storybook Chapter 6", "Storybook Chapter 7", "Storybook Chapter 8 and 9"], "types": ["Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Action", "Event", "Action", "Action", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Action", "Action", "Action", "Action", "Action", "Action", "Action", "Event", "Event", "Action", "Action", "Action", "Action", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Level", "Event", "Event", "Event", "Event", "Event", "Event", "Event", "Event"], "requirements": [[], [], [], [], [], [], [], [], [], [], [], [72], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [55], [66], [90], [72, 104], [72, 134], [127], [], [], [36], [36], [36], [27], [], [], [], [41], [], [12], [], [], [], [47], [47], [14], [], [], [], [53], [54], [54], [], [], [], [61], [59], [59], [13], [], [], [], [68], [68], [67], [], [], [], [74], [73], [72], [], [], [], [80], [78], [79], [], [], [], [84], [84], [], [], [], [], [92], [91], [91], [90], [], [], [], [99], [99], [97], [], [], [], [103], [105], [104], [], [], [], [114], [110], [109], [], [], [], [116], [115], [], [], [], [], [123], [122], [122], [], [], [], [128], [129], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [28], [29], [], [], [30], [33], [], [34], [150], [32], [], [31], [37], [38], [39], [40], [], [], [], [], [], [], [], [140]], "min_stars": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 60, 0, 0, 60, 0, 0, 0, 0, 120, 7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 3, 0, 0, 0, 0, 3, 9, 0, 0, 0, 0, 0, 12, 0, 0, 0, 0, 0, 12, 16, 0, 0, 0, 0, 0, 20, 0, 0, 0, 0, 0, 24, 0, 0, 0, 0, 0, 26, 0, 0, 0, 0, 26, 29, 0, 0, 0, 0, 0, 0, 34, 0, 0, 0, 0, 0, 36, 0, 0, 0, 0, 0, 40, 0, 0, 0, 0, 0, 46, 0, 0, 0, 0, 46, 48, 0, 0, 0, 0, 0, 52, 0, 0, 0, 0, 52, 0, 0, 8, 15, 23, 33, 45, 60, 5, 7, 11, 18, 19, 0, 0, 30, 30, 0, 0, 42, 0, 55, 0, 50, 0, 0, 0, 0, 0, 17, 24, 28, 32, 40, 49, 58, 0], "less_than_stars": [null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, 60, null, null, 60, null, null, 120, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null, null], "unfulfillable": [false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false, false], "following": [[1], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [140], [25], [], [140], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [4], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [10], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [0], [], [6], [9], [16], [18, 19], [21, 22], [24, 27], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], [], []], "following_star_counts": {"2": [2], "3": [3], "8": [5], "13": [7], "15": [8], "23": [15], "33": [17], "45": [20], "60": [23], "120": [26]}, "following_green_star_counts": {"1": [35], "3": [36]}, "topological_order": [2, 3, 5, 7, 8, 12, 13, 14, 15, 17, 20, 23, 26, 28, 35, 36, 37, 38, 39, 41, 42, 43, 44, 45, 46, 47, 4, 48, 49, 50, 51, 52, 53, 54, 55, 29, 56, 57, 58, 59, 60, 61, 62, 63, 64, 65, 66, 30, 67, 68, 69, 70, 71, 72, 10, 11, 73, 74, 75, 76, 77, 78, 79, 80, 81, 82, 83, 84, 85, 86, 87, 88, 89, 90, 31, 91, 92, 93, 94, 95, 96, 97, 98, 99, 100, 101, 102, 103, 104, 32, 105, 106, 107, 108, 109, 110, 111, 113, 114, 112, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125, 126, 127, 34, 128, 129, 130, 131, 132, 133, 0, 1, 134, 33, 135, 6, 136, 9, 137, 16, 138, 18, 19, 139, 21, 22, 140, 24, 25, 27, 40, 141, 142, 143, 144, 145, 146, 147, 148, 149, 150, 151, 152, 153, 154, 155, 156, 157, 158, 159, 160, 161, 162, 163, 164, 165, 166, 167, 168, 169]}
\ No newline at end of file
@@ -1,6 +1,6 @@
 // Generated by CoffeeScript 1.9.3
 (function() {
-  var Action, Event, Item, Level, Main, Message, MessageUtil, Route, addLanguages, determineArgSets,
+  var Action, BinaryMessages, Event, Item, Level, Main, Message, MessageShards, MessageUtil, Route, addLanguages, determineArgSets, numberNameEscape,
     extend = function(child, parent) { for (var key in parent) { if (hasProp.call(parent, key)) child[key] = parent[key]; } function ctor() { this.constructor = child; } ctor.prototype = parent.prototype; child.prototype = new ctor(); child.__super__ = parent.prototype; return child; },
     hasProp = {}.hasOwnProperty,
     indexOf = [].indexOf || function(item) { for (var i = 0, l = this.length; i < l; i++) { if (i in this && this[i] === item) return i; } return -1; };
@@ -8,49 +8,145 @@
   Item = (function() {
     Item.idLookup = {};
 
-    Item.followingItemsLookup = {};
+    Item.byId = [];
+
+    Item.followingStarCounts = {};
+
+    Item.followingGreenStarCounts = {};
+
+    Item.applyGraph = function(graph) {
+      var count, id, ids, item, j, k, len, len1, name, ref, ref1, ref2, ref3, results;
+      ref = graph.names;
+      for (id = j = 0, len = ref.length; j < len; id = ++j) {
+        name = ref[id];
+        if (name in this.idLookup) {
+          this.byId[id] = this.idLookup[name];
+        }
+      }
+      ref1 = this.byId;
+      for (id = k = 0, len1 = ref1.length; k < len1; id = ++k) {
+        item = ref1[id];
+        if (!item) {
+          continue;
+        }
+        item.id = id;
+        item.requiredIds = graph.requirements[id];
+        item.minStars = graph.min_stars[id];
+        item.lessThanStars = graph.less_than_stars[id];
+        item.unfulfillable = graph.unfulfillable[id];
+        item.following = this.itemsWithIds(graph.following[id]);
+      }
+      ref2 = graph.following_star_counts;
+      for (count in ref2) {
+        if (!hasProp.call(ref2, count)) continue;
+        ids = ref2[count];
+        this.followingStarCounts[count] = this.itemsWithIds(ids);
+      }
+      ref3 = graph.following_green_star_counts;
+      results = [];
+      for (count in ref3) {
+        if (!hasProp.call(ref3, count)) continue;
+        ids = ref3[count];
+        results.push(this.followingGreenStarCounts[count] = this.itemsWithIds(ids));
+      }
+      return results;
+    };
+
+    Item.itemsWithIds = function(ids) {
+      var id, items, j, len;
+      items = [];
+      for (j = 0, len = ids.length; j < len; j++) {
+        id = ids[j];
+        if (this.byId[id]) {
+          items.push(this.byId[id]);
+        }
+      }
+      return items;
+    };
+
+    Item.applyMessageIndex = function(index) {
+      var character, entry, id, ids, item, itemId, j, len, name, p, position, ref, results;
+      ids = index.messages;
+      ref = index.items;
+      results = [];
+      for (itemId = j = 0, len = ref.length; j < len; itemId = ++j) {
+        name = ref[itemId];
+        item = this.idLookup[name];
+        if (!item) {
+          continue;
+        }
+        item.messages = [];
+        results.push((function() {
+          var k, len1, ref1, results1;
+          ref1 = index.itemMessages[itemId];
+          results1 = [];
+          for (k = 0, len1 = ref1.length; k < len1; k++) {
+            entry = ref1[k];
+            position = entry[0];
+            if (typeof position === 'number') {
+              id = ids[position];
+            } else {
+              id = {};
+              for (character in position) {
+                if (!hasProp.call(position, character)) continue;
+                p = position[character];
+                id[character] = ids[p];
+              }
+            }
+            results1.push(item.messages.push({
+              id: id,
+              position: position,
+              "case": entry[1],
+              skippable: entry[2]
+            }));
+          }
+          return results1;
+        })());
+      }
+      return results;
+    };
 
     function Item(name, details, messages) {
-      var itemName, j, k, len, len1, message, ref, ref1, ref2;
+      var j, len, message, ref, ref1;
       this.name = name;
       this.constructor.idLookup[this.name] = this;
       this.requirements = details.requirements;
       this.startLocation = details.start_location;
       this.endLocation = details.end_location;
-      ref = details.follows;
-      for (j = 0, len = ref.length; j < len; j++) {
-        itemName = ref[j];
-        if (itemName in this.constructor.followingItemsLookup) {
-          this.constructor.followingItemsLookup[itemName].push(this);
-        } else {
-          this.constructor.followingItemsLookup[itemName] = [this];
-        }
-      }
       this.messages = [];
-      for (k = 0, len1 = messages.length; k < len1; k++) {
-        message = messages[k];
+      for (j = 0, len = messages.length; j < len; j++) {
+        message = messages[j];
         this.messages.push({
           id: message['id'],
-          "case": (ref1 = message['case']) != null ? ref1 : null,
-          skippable: (ref2 = message['skippable']) != null ? ref2 : false
+          "case": (ref = message['case']) != null ? ref : null,
+          skippable: (ref1 = message['skippable']) != null ? ref1 : false
         });
       }
     }
 
     Item.prototype.frames = function(argSet) {
-      var id, j, len, m, message, messageFrames, ref, totalFrames;
+      var byPosition, id, j, len, m, message, messageFrames, position, ref, totalFrames;
       totalFrames = 0;
+      byPosition = Message.byPosition[argSet.langCode];
       ref = this.messages;
       for (j = 0, len = ref.length; j < len; j++) {
         message = ref[j];
         if (message.skippable) {
           continue;
         }
-        id = message.id;
-        if (typeof id !== 'string') {
-          id = id[argSet.character];
+        if ((byPosition != null) && (message.position != null)) {
+          position = message.position;
+          if (typeof position !== 'number') {
+            position = position[argSet.character];
+          }
+          m = byPosition[position];
+        } else {
+          id = message.id;
+          if (typeof id !== 'string') {
+            id = id[argSet.character];
+          }
+          m = Message.lookup(id, argSet.langCode);
         }
-        m = Message.lookup(id, argSet.langCode);
         messageFrames = m.frames(argSet, message["case"]);
         totalFrames += messageFrames;
       }
@@ -349,134 +445,104 @@
       return String.fromCharCode.apply(String, codePoints);
     };
 
-    MessageUtil.bytesStartWith = function(bytes, arr2) {
-      var arr1;
-      arr1 = bytes.slice(0, arr2.length);
-      if (arr1.length !== arr2.length) {
-        return false;
+    MessageUtil.escapeTable = {};
+
+    MessageUtil.registerEscape = function(name, prefix, handler) {
+      var entries;
+      if (!(prefix[0] in this.escapeTable)) {
+        this.escapeTable[prefix[0]] = [];
       }
-      return arr1.every(function(element, index) {
-        return element === arr2[index];
+      entries = this.escapeTable[prefix[0]];
+      entries.push({
+        name: name,
+        prefix: prefix,
+        handler: handler
+      });
+      return entries.sort(function(a, b) {
+        return b.prefix.length - a.prefix.length;
       });
     };
 
-    MessageUtil.processEscapeSequence = function(escapeBytes, boxes, messageId, argSet, messageCase, displayColors, displayFurigana) {
-      var colorByte, colorType, escapeBytesStartWith, furiganaBytes, furiganaStr, iconByte, iconName, kanjiCount, lastBox, numberNameType, obj, pauseLength, text, textMessage, textMessageId;
+    MessageUtil.escapeType = function(escapeBytes) {
+      var entries, entry, i, j, len, prefix;
+      entries = this.escapeTable[escapeBytes[0]];
+      if (entries == null) {
+        return null;
+      }
+      for (j = 0, len = entries.length; j < len; j++) {
+        entry = entries[j];
+        prefix = entry.prefix;
+        i = 1;
+        while (i < prefix.length && escapeBytes[i] === prefix[i]) {
+          i += 1;
+        }
+        if (i === prefix.length) {
+          return entry;
+        }
+      }
+      return null;
+    };
+
+    MessageUtil.decodeEscapes = function(content) {
+      var item, j, len, results;
+      results = [];
+      for (j = 0, len = content.length; j < len; j++) {
+        item = content[j];
+        results.push(typeof item === "string" ? null : this.escapeType(item));
+      }
+      return results;
+    };
+
+    MessageUtil.processEscapeSequence = function(escapeBytes, boxes, messageId, argSet, messageCase, displayColors, displayFurigana, entry) {
+      var lastBox, text;
       if (displayColors == null) {
         displayColors = false;
       }
       if (displayFurigana == null) {
         displayFurigana = false;
       }
-      escapeBytesStartWith = Util.curry(this.bytesStartWith, escapeBytes);
+      if (entry == null) {
+        entry = null;
+      }
+      if (entry == null) {
+        entry = this.escapeType(escapeBytes);
+      }
       lastBox = boxes[boxes.length - 1];
-      if (escapeBytesStartWith([1, 0, 0, 0])) {
-        pauseLength = escapeBytes[4];
-        text = "<Text pause, " + (pauseLength.toString()) + "L>";
-        if ('pauseLength' in lastBox) {
-          lastBox.pauseLength += pauseLength;
-        } else {
-          lastBox.pauseLength = pauseLength;
-        }
-      } else if (escapeBytesStartWith([1, 0, 1])) {
-        text = "";
-        boxes.push({
-          chars: 0,
-          text: ""
-        });
-      } else if (escapeBytesStartWith([1, 0, 2])) {
-        text = '<Lower-baseline text>';
-      } else if (escapeBytesStartWith([1, 0, 3])) {
-        text = '<Center align>';
-      } else if (escapeBytesStartWith([2, 0, 0, 0, 0x53])) {
-        text = '<Play voice audio>';
-      } else if (escapeBytesStartWith([3, 0])) {
-        iconByte = escapeBytes[2];
-        iconName = messageLookup.icons[iconByte];
-        text = "<" + iconName + " icon>";
-        lastBox.chars += 1;
-      } else if (escapeBytesStartWith([4, 0, 0])) {
-        text = '<Small text>';
-      } else if (escapeBytesStartWith([4, 0, 2])) {
-        text = '<Large text>';
-      } else if (escapeBytesStartWith([5, 0, 0, 0, 0])) {
-        if (messageCase === 'general') {
-          text = '<Player name>';
-        } else {
-          if (argSet.character === 'mario') {
-            textMessageId = 'System_PlayerName000';
-          } else if (argSet.character === 'luigi') {
-            textMessageId = 'System_PlayerName100';
-          }
-          textMessage = Message.lookup(textMessageId, argSet.langCode);
-          text = textMessage.computeBoxes(argSet, messageCase)[0].text;
-          lastBox.chars += text.length;
-        }
-      } else if (escapeBytesStartWith([5, 0, 0, 1, 0])) {
-        if (messageCase === 'general') {
-          text = '<Mr. Plaaayer naaame>';
-        } else {
-          if (argSet.character === 'mario') {
-            textMessageId = 'System_PlayerName001';
-          } else if (argSet.character === 'luigi') {
-            textMessageId = 'System_PlayerName101';
-          }
-          textMessage = Message.lookup(textMessageId, argSet.langCode);
-          text = textMessage.computeBoxes(argSet, messageCase)[0].text;
-          lastBox.chars += text.length;
-        }
-      } else if ((escapeBytesStartWith([6])) || (escapeBytesStartWith([7]))) {
-        if (messageId in messageLookup.numbersNames) {
-          obj = messageLookup.numbersNames[messageId];
-          numberNameType = obj._type;
-          if (messageCase === 'general') {
-            text = obj._placeholder;
-          } else if (numberNameType === 'text') {
-            if (messageCase in obj) {
-              text = obj[messageCase];
-            } else if (argSet.character in obj) {
-              text = obj[argSet.character];
-            }
-            lastBox.chars += text.length;
-          } else if (numberNameType === 'message') {
-            if (messageCase in obj) {
-              textMessageId = obj[messageCase];
-            } else if (argSet.character in obj) {
-              textMessageId = obj[argSet.character];
-            }
-            textMessage = Message.lookup(textMessageId, argSet.langCode);
-            text = textMessage.computeBoxes(argSet, messageCase)[0].text;
-            lastBox.chars += text.length;
-          }
-        } else {
-          console.log("Don't know how to handle number/name variable", +("for message: " + messageId));
-        }
-      } else if (escapeBytesStartWith([9, 0, 5])) {
-        text = 'xx:xx:xx';
-        lastBox.chars += text.length;
-      } else if (escapeBytesStartWith([0xFF, 0, 0])) {
-        colorByte = escapeBytes[3];
-        colorType = messageLookup.colors[colorByte];
-        if (displayColors) {
-          text = "<" + colorType + " color>";
-        } else {
-          text = "";
-        }
-      } else if (escapeBytesStartWith([0xFF, 0, 2])) {
-        kanjiCount = escapeBytes[3];
-        furiganaBytes = escapeBytes.slice(4);
-        furiganaStr = this.decodeUTF16BigEndian(furiganaBytes);
-        if (displayFurigana) {
-          text = "<" + furiganaStr + ">";
-        } else {
-          text = "";
-        }
+      if (entry != null) {
+        text = entry.handler(escapeBytes, lastBox, boxes, messageId, argSet, messageCase, displayColors, displayFurigana);
       } else {
         console.log("Unknown escape sequence: " + escapeBytes);
       }
       return lastBox.text += text;
     };
 
+    MessageUtil.firstBoxText = function(textMessageId, argSet, messageCase) {
+      var textMessage;
+      textMessage = Message.lookup(textMessageId, argSet.langCode);
+      return textMessage.computeBoxes(argSet, messageCase)[0].text;
+    };
+
+    MessageUtil.playerNameIds = ['System_PlayerName000', 'System_PlayerName001', 'System_PlayerName100', 'System_PlayerName101'];
+
+    MessageUtil.withIncludedMessageIds = function(messageIds) {
+      var ids, j, key, len, messageId, obj, textMessageId;
+      ids = messageIds.concat(this.playerNameIds);
+      for (j = 0, len = messageIds.length; j < len; j++) {
+        messageId = messageIds[j];
+        obj = messageLookup.numbersNames[messageId];
+        if ((obj != null) && obj._type === 'message') {
+          for (key in obj) {
+            if (!hasProp.call(obj, key)) continue;
+            textMessageId = obj[key];
+            if (!key.startsWith('_')) {
+              ids.push(textMessageId);
+            }
+          }
+        }
+      }
+      return ids;
+    };
+
     MessageUtil.boxTextDisplayHTML = function($el, box) {
       var boxTextLines, index, j, len, line, notLastLine, results;
       boxTextLines = box.text.split('\n');
@@ -548,6 +614,28 @@
       return $finalResult.removeClass('mid-result').addClass('final-result');
     };
 
+    MessageUtil.precomputedFrames = function(messageId, langCode, argSet, messageCase) {
+      var d, frames, ref, ref1;
+      if (((ref = window.messageFrames) != null ? ref[langCode] : void 0) == null) {
+        return null;
+      }
+      d = window.messageFrames[langCode][messageId];
+      if (d == null) {
+        return null;
+      }
+      if (d.base == null) {
+        d = (ref1 = d[messageCase]) != null ? ref1 : d[argSet.character];
+        if (d == null) {
+          return null;
+        }
+      }
+      frames = d.base + (d.num_boxes * argSet.boxEndTimingError);
+      if (d.animation_time != null) {
+        frames = Math.max(frames, d.animation_time);
+      }
+      return frames;
+    };
+
     MessageUtil.messageFrames = function(boxes, messageId, boxEndTimingError, $el) {
       var $finalResult, $li, $ul, animationTime, b, boxLength, boxLengths, frames, index, j, k, len, len1, line, numBoxes, result;
       if ($el == null) {
@@ -651,9 +739,360 @@
 
   })();
 
+  MessageUtil.registerEscape('pause', [1, 0, 0, 0], function(escapeBytes, lastBox) {
+    var pauseLength;
+    pauseLength = escapeBytes[4];
+    if ('pauseLength' in lastBox) {
+      lastBox.pauseLength += pauseLength;
+    } else {
+      lastBox.pauseLength = pauseLength;
+    }
+    return "<Text pause, " + (pauseLength.toString()) + "L>";
+  });
+
+  MessageUtil.registerEscape('boxBreak', [1, 0, 1], function(escapeBytes, lastBox, boxes) {
+    boxes.push({
+      chars: 0,
+      text: ""
+    });
+    return "";
+  });
+
+  MessageUtil.registerEscape('lowerBaseline', [1, 0, 2], function() {
+    return '<Lower-baseline text>';
+  });
+
+  MessageUtil.registerEscape('centerAlign', [1, 0, 3], function() {
+    return '<Center align>';
+  });
+
+  MessageUtil.registerEscape('voice', [2, 0, 0, 0, 0x53], function() {
+    return '<Play voice audio>';
+  });
+
+  MessageUtil.registerEscape('icon', [3, 0], function(escapeBytes, lastBox) {
+    var iconByte, iconName;
+    iconByte = escapeBytes[2];
+    iconName = messageLookup.icons[iconByte];
+    lastBox.chars += 1;
+    return "<" + iconName + " icon>";
+  });
+
+  MessageUtil.registerEscape('smallText', [4, 0, 0], function() {
+    return '<Small text>';
+  });
+
+  MessageUtil.registerEscape('largeText', [4, 0, 2], function() {
+    return '<Large text>';
+  });
+
+  MessageUtil.registerEscape('playerName', [5, 0, 0, 0, 0], function(escapeBytes, lastBox, boxes, messageId, argSet, messageCase) {
+    var text, textMessageId;
+    if (messageCase === 'general') {
+      return '<Player name>';
+    }
+    if (argSet.character === 'mario') {
+      textMessageId = 'System_PlayerName000';
+    } else if (argSet.character === 'luigi') {
+      textMessageId = 'System_PlayerName100';
+    }
+    text = MessageUtil.firstBoxText(textMessageId, argSet, messageCase);
+    lastBox.chars += text.length;
+    return text;
+  });
+
+  MessageUtil.registerEscape('mrPlayerName', [5, 0, 0, 1, 0], function(escapeBytes, lastBox, boxes, messageId, argSet, messageCase) {
+    var text, textMessageId;
+    if (messageCase === 'general') {
+      return '<Mr. Plaaayer naaame>';
+    }
+    if (argSet.character === 'mario') {
+      textMessageId = 'System_PlayerName001';
+    } else if (argSet.character === 'luigi') {
+      textMessageId = 'System_PlayerName101';
+    }
+    text = MessageUtil.firstBoxText(textMessageId, argSet, messageCase);
+    lastBox.chars += text.length;
+    return text;
+  });
+
+  numberNameEscape = function(escapeBytes, lastBox, boxes, messageId, argSet, messageCase) {
+    var numberNameType, obj, text, textMessageId;
+    if (!(messageId in messageLookup.numbersNames)) {
+      console.log("Don't know how to handle number/name variable", +("for message: " + messageId));
+      return;
+    }
+    obj = messageLookup.numbersNames[messageId];
+    numberNameType = obj._type;
+    if (messageCase === 'general') {
+      text = obj._placeholder;
+    } else if (numberNameType === 'text') {
+      if (messageCase in obj) {
+        text = obj[messageCase];
+      } else if (argSet.character in obj) {
+        text = obj[argSet.character];
+      }
+      lastBox.chars += text.length;
+    } else if (numberNameType === 'message') {
+      if (messageCase in obj) {
+        textMessageId = obj[messageCase];
+      } else if (argSet.character in obj) {
+        textMessageId = obj[argSet.character];
+      }
+      text = MessageUtil.firstBoxText(textMessageId, argSet, messageCase);
+      lastBox.chars += text.length;
+    }
+    return text;
+  };
+
+  MessageUtil.registerEscape('number', [6], numberNameEscape);
+
+  MessageUtil.registerEscape('name', [7], numberNameEscape);
+
+  MessageUtil.registerEscape('raceTime', [9, 0, 5], function(escapeBytes, lastBox) {
+    var text;
+    text = 'xx:xx:xx';
+    lastBox.chars += text.length;
+    return text;
+  });
+
+  MessageUtil.registerEscape('color', [0xFF, 0, 0], function(escapeBytes, lastBox, boxes, messageId, argSet, messageCase, displayColors) {
+    var colorByte, colorType;
+    colorByte = escapeBytes[3];
+    colorType = messageLookup.colors[colorByte];
+    if (displayColors) {
+      return "<" + colorType + " color>";
+    }
+    return "";
+  });
+
+  MessageUtil.registerEscape('furigana', [0xFF, 0, 2], function(escapeBytes, lastBox, boxes, messageId, argSet, messageCase, displayColors, displayFurigana) {
+    var furiganaBytes, furiganaStr;
+    furiganaBytes = escapeBytes.slice(4);
+    furiganaStr = MessageUtil.decodeUTF16BigEndian(furiganaBytes);
+    if (displayFurigana) {
+      return "<" + furiganaStr + ">";
+    }
+    return "";
+  });
+
+  BinaryMessages = (function() {
+    BinaryMessages.magic = 'SMGM';
+
+    BinaryMessages.version = 1;
+
+    function BinaryMessages(buffer) {
+      var contentEnd, contentStart, count, i, id, idEnd, j, magic, ref, stringTableSize, stringTableStart, stringsEnd, stringsStart, version, view;
+      this.bytes = new Uint8Array(buffer);
+      view = new DataView(buffer);
+      magic = String.fromCharCode.apply(null, this.bytes.subarray(0, 4));
+      version = view.getUint16(4, true);
+      if (magic !== this.constructor.magic || version !== this.constructor.version) {
+        throw new Error("Unsupported binary messages file");
+      }
+      count = view.getUint32(8, true);
+      stringTableSize = view.getUint32(12, true);
+      stringTableStart = 16 + 12 * count;
+      this.contentStart = stringTableStart + stringTableSize;
+      this.strings = new TextDecoder('utf-8').decode(this.bytes.subarray(stringTableStart, this.contentStart));
+      this.index = {};
+      stringsStart = 0;
+      contentStart = 0;
+      for (i = j = 0, ref = count; 0 <= ref ? j < ref : j > ref; i = 0 <= ref ? ++j : --j) {
+        idEnd = view.getUint32(16 + 12 * i, true);
+        stringsEnd = view.getUint32(16 + 12 * i + 4, true);
+        contentEnd = view.getUint32(16 + 12 * i + 8, true);
+        id = this.strings.slice(stringsStart, idEnd);
+        if (contentEnd >= 0x80000000) {
+          contentEnd -= 0x80000000;
+          this.index[id] = null;
+        } else {
+          this.index[id] = [idEnd, contentStart, contentEnd];
+        }
+        stringsStart = stringsEnd;
+        contentStart = contentEnd;
+      }
+    }
+
+    BinaryMessages.prototype.has = function(id) {
+      return id in this.index;
+    };
+
+    BinaryMessages.prototype.content = function(id) {
+      var content, end, entry, header, pos, size, textPos;
+      entry = this.index[id];
+      if (entry == null) {
+        return null;
+      }
+      content = [];
+      textPos = entry[0];
+      pos = this.contentStart + entry[1];
+      end = this.contentStart + entry[2];
+      while (pos < end) {
+        header = this.bytes[pos] | (this.bytes[pos + 1] << 8);
+        pos += 2;
+        if (header & 0x8000) {
+          size = header & 0x7FFF;
+          content.push((function() {
+            var k, ref, ref1, results;
+            results = [];
+            for (k = ref = pos, ref1 = pos + size; ref <= ref1 ? k < ref1 : k > ref1; k = ref <= ref1 ? ++k : --k) {
+              results.push(this.bytes[k]);
+            }
+            return results;
+          }).call(this));
+          pos += size;
+        } else {
+          content.push(this.strings.slice(textPos, textPos + header));
+          textPos += header;
+        }
+      }
+      return content;
+    };
+
+    return BinaryMessages;
+
+  })();
+
+  MessageShards = (function() {
+    function MessageShards() {}
+
+    MessageShards.manifests = {};
+
+    MessageShards.loaded = {};
+
+    MessageShards.fullLoads = {};
+
+    MessageShards.shardName = function(manifest, messageId) {
+      var index, prefix;
+      index = messageId.indexOf('_');
+      if (index !== -1) {
+        prefix = messageId.slice(0, index);
+        if (indexOf.call(manifest.shards, prefix) >= 0) {
+          return prefix;
+        }
+      }
+      return manifest.other_shard;
+    };
+
+    MessageShards.load = function(langCodes, messageIds, callback) {
+      var id, j, k, key, keys, langCode, len, len1, manifest, numShards, onError, onLoad, onShardDone, results, shardName, shardNames;
+      keys = {};
+      for (j = 0, len = langCodes.length; j < len; j++) {
+        langCode = langCodes[j];
+        manifest = this.manifests[langCode];
+        if (manifest == null) {
+          continue;
+        }
+        if (messageIds != null) {
+          shardNames = (function() {
+            var k, len1, results;
+            results = [];
+            for (k = 0, len1 = messageIds.length; k < len1; k++) {
+              id = messageIds[k];
+              results.push(MessageShards.shardName(manifest, id));
+            }
+            return results;
+          })();
+        } else {
+          shardNames = manifest.shards;
+        }
+        for (k = 0, len1 = shardNames.length; k < len1; k++) {
+          shardName = shardNames[k];
+          key = langCode + "/" + shardName;
+          if (!(key in this.loaded)) {
+            keys[key] = langCode;
+          }
+        }
+      }
+      numShards = Object.keys(keys).length;
+      if (numShards === 0) {
+        callback();
+        return;
+      }
+      onShardDone = function() {
+        numShards -= 1;
+        if (numShards === 0) {
+          return callback();
+        }
+      };
+      results = [];
+      for (key in keys) {
+        if (!hasProp.call(keys, key)) continue;
+        langCode = keys[key];
+        onLoad = (function(key, langCode) {
+          return function() {
+            var data, messageId, ref;
+            ref = window.messageShards[key];
+            for (messageId in ref) {
+              if (!hasProp.call(ref, messageId)) continue;
+              data = ref[messageId];
+              new Message(messageId, langCode, data);
+            }
+            delete window.messageShards[key];
+            MessageShards.loaded[key] = true;
+            return onShardDone();
+          };
+        })(key, langCode);
+        onError = (function(langCode) {
+          return function() {
+            return MessageShards.loadFull(langCode, onShardDone);
+          };
+        })(langCode);
+        results.push(Util.readServerJSFile("js/messages/" + key + ".js", onLoad, onError));
+      }
+      return results;
+    };
+
+    MessageShards.loadFull = function(langCode, callback) {
+      var onDone, onError, onLoad;
+      if (this.manifests[langCode] == null) {
+        callback();
+        return;
+      }
+      if (langCode in this.fullLoads) {
+        this.fullLoads[langCode].push(callback);
+        return;
+      }
+      this.fullLoads[langCode] = [callback];
+      onDone = function() {
+        var callbacks, cb, j, len, results;
+        callbacks = MessageShards.fullLoads[langCode];
+        delete MessageShards.fullLoads[langCode];
+        results = [];
+        for (j = 0, len = callbacks.length; j < len; j++) {
+          cb = callbacks[j];
+          results.push(cb());
+        }
+        return results;
+      };
+      onLoad = function() {
+        var data, messageId, ref;
+        delete MessageShards.manifests[langCode];
+        ref = window.messages[langCode];
+        for (messageId in ref) {
+          if (!hasProp.call(ref, messageId)) continue;
+          data = ref[messageId];
+          new Message(messageId, langCode, data);
+        }
+        return onDone();
+      };
+      onError = function() {
+        console.log("Couldn't load the messages for " + langCode);
+        return onDone();
+      };
+      return Util.readServerJSFile("js/messages/" + langCode + ".js", onLoad, onError);
+    };
+
+    return MessageShards;
+
+  })();
+
   Message = (function() {
     Message.lookupStructure = {};
 
+    Message.byPosition = {};
+
     function Message(id1, langCode1, data1) {
       this.id = id1;
       this.langCode = langCode1;
@@ -662,20 +1101,44 @@
     }
 
     Message.lookup = function(id, langCode) {
-      return this.lookupStructure[id + "/" + langCode];
+      var key, messages, ref;
+      key = id + "/" + langCode;
+      if (!(key in this.lookupStructure)) {
+        messages = (ref = window.messages) != null ? ref[langCode] : void 0;
+        if (messages instanceof BinaryMessages && messages.has(id)) {
+          new Message(id, langCode, messages.content(id));
+        }
+      }
+      return this.lookupStructure[key];
+    };
+
+    Message.addIndexed = function(langCode, contents) {
+      var data, ids, j, len, messages, position;
+      ids = window.messageIndex.messages;
+      messages = [];
+      for (position = j = 0, len = contents.length; j < len; position = ++j) {
+        data = contents[position];
+        if (data !== 0) {
+          messages[position] = new Message(ids[position], langCode, data);
+        }
+      }
+      return this.byPosition[langCode] = messages;
     };
 
     Message.prototype.computeBoxes = function(argSet, messageCase) {
-      var box, boxes, item, j, k, lastBox, len, len1, newlineAfterBoxBreak, ref;
+      var box, boxes, index, item, j, k, lastBox, len, len1, newlineAfterBoxBreak, ref;
       boxes = [
         {
           chars: 0,
           text: ""
         }
       ];
+      if (this.escapes == null) {
+        this.escapes = MessageUtil.decodeEscapes(this.data);
+      }
       ref = this.data;
-      for (j = 0, len = ref.length; j < len; j++) {
-        item = ref[j];
+      for (index = j = 0, len = ref.length; j < len; index = ++j) {
+        item = ref[index];
         lastBox = boxes[boxes.length - 1];
         if (typeof item === "string") {
           newlineAfterBoxBreak = item.charAt(0) === '\n' && lastBox.text === "";
@@ -685,7 +1148,7 @@
           lastBox.chars += item.length;
           lastBox.text += item;
         } else {
-          MessageUtil.processEscapeSequence(item, boxes, this.id, argSet, messageCase);
+          MessageUtil.processEscapeSequence(item, boxes, this.id, argSet, messageCase, false, false, this.escapes[index]);
         }
       }
       for (k = 0, len1 = boxes.length; k < len1; k++) {
@@ -697,6 +1160,10 @@
 
     Message.prototype.frames = function(argSet, messageCase) {
       var boxes, frames;
+      frames = MessageUtil.precomputedFrames(this.id, this.langCode, argSet, messageCase);
+      if (frames != null) {
+        return frames;
+      }
       boxes = this.computeBoxes(argSet, messageCase);
       frames = MessageUtil.messageFrames(boxes, this.id, argSet.boxEndTimingError);
       return frames;
@@ -752,6 +1219,14 @@
 
     Route.prototype.isComplete = false;
 
+    Route.isCompleted = function(completed, item) {
+      return (completed[item.id >>> 5] & (1 << (item.id & 31))) !== 0;
+    };
+
+    Route.setCompleted = function(completed, item) {
+      return completed[item.id >>> 5] |= 1 << (item.id & 31);
+    };
+
     function Route(text, category) {
       var action, j, len, line, lines;
       this.actions = [];
@@ -829,10 +1304,12 @@
       return null;
     };
 
-    Route.prototype.fulfilledRequirement = function(req, completedItemNames, starCount) {
+    Route.prototype.fulfilledRequirement = function(req, completed, starCount) {
       var match, reqLessThanStars, reqStars;
-      if (indexOf.call(completedItemNames, req) >= 0) {
-        return true;
+      if (req in Item.idLookup) {
+        if (this.constructor.isCompleted(completed, Item.idLookup[req])) {
+          return true;
+        }
       }
       match = this.constructor.starsReqRegex.exec(req);
       if (match) {
@@ -855,7 +1332,25 @@
       return false;
     };
 
-    Route.prototype.isEndOfRoute = function(item, completedItemNames, starCount) {
+    Route.prototype.fulfilledRequirements = function(item, completed, starCount) {
+      var id, j, len, ref;
+      if (item.unfulfillable) {
+        return false;
+      }
+      ref = item.requiredIds;
+      for (j = 0, len = ref.length; j < len; j++) {
+        id = ref[j];
+        if ((completed[id >>> 5] & (1 << (id & 31))) === 0) {
+          return false;
+        }
+      }
+      if (starCount < item.minStars) {
+        return false;
+      }
+      return item.lessThanStars === null || starCount < item.lessThanStars;
+    };
+
+    Route.prototype.isEndOfRoute = function(item, completed, starCount) {
       var j, len, ref, req;
       if (this.endItemName) {
         if (item.name !== this.endItemName) {
@@ -865,7 +1360,7 @@
       ref = this.endRequirements;
       for (j = 0, len = ref.length; j < len; j++) {
         req = ref[j];
-        if (!this.fulfilledRequirement(req, completedItemNames, starCount)) {
+        if (!this.fulfilledRequirement(req, completed, starCount)) {
           return false;
         }
       }
@@ -873,13 +1368,13 @@
     };
 
     Route.prototype.checkAndAddEvents = function() {
-      var action, completedItemNames, expectedActionName, followingItem, followingItems, greenStarCount, j, k, l, len, len1, len2, luigiStatus, ref, ref1, ref2, ref3, ref4, ref5, req, reqFailed, s, starCount, starCountStr;
+      var action, completed, expectedActionName, followingItem, followingItems, greenStarCount, j, k, len, len1, luigiStatus, ref, ref1, ref2, ref3, req, s, starCount;
       this.isComplete = false;
       this.items = [];
       starCount = 0;
       greenStarCount = 0;
       expectedActionName = null;
-      completedItemNames = [];
+      completed = new Uint32Array((Item.byId.length + 31) >>> 5);
       luigiStatus = {
         talkedAtGarage: false,
         luigiStars: 0,
@@ -895,13 +1390,15 @@
           }
           expectedActionName = null;
         }
-        ref1 = action.requirements;
-        for (k = 0, len1 = ref1.length; k < len1; k++) {
-          req = ref1[k];
-          if (!this.fulfilledRequirement(req, completedItemNames, starCount)) {
-            s = "'" + action.name + "' has an unfulfilled requirement: " + req;
-            this.addRouteStatus(s);
-            return;
+        if (!this.fulfilledRequirements(action, completed, starCount)) {
+          ref1 = action.requirements;
+          for (k = 0, len1 = ref1.length; k < len1; k++) {
+            req = ref1[k];
+            if (!this.fulfilledRequirement(req, completed, starCount)) {
+              s = "'" + action.name + "' has an unfulfilled requirement: " + req;
+              this.addRouteStatus(s);
+              return;
+            }
           }
         }
         if (action.name === "Luigi letter 2") {
@@ -919,7 +1416,7 @@
         }
         followingItems = [];
         if (action instanceof Level) {
-          if (ref2 = action.name, indexOf.call(completedItemNames, ref2) >= 0) {
+          if (this.constructor.isCompleted(completed, action)) {
             this.items.push({
               item: action,
               starCount: null
@@ -930,13 +1427,8 @@
               item: action,
               starCount: starCount
             });
-            if (starCount === 1) {
-              starCountStr = "1 star";
-            } else {
-              starCountStr = starCount + " stars";
-            }
-            if (starCountStr in Item.followingItemsLookup) {
-              followingItems.push.apply(followingItems, Item.followingItemsLookup[starCountStr]);
+            if (starCount in Item.followingStarCounts) {
+              followingItems.push.apply(followingItems, Item.followingStarCounts[starCount]);
             }
           }
         } else {
@@ -944,26 +1436,21 @@
             item: action
           });
         }
-        completedItemNames.push(action.name);
-        if (this.isEndOfRoute(action, completedItemNames, starCount)) {
+        this.constructor.setCompleted(completed, action);
+        if (this.isEndOfRoute(action, completed, starCount)) {
           this.isComplete = true;
           return;
         }
-        if ((ref3 = action.name) === "Battlerock L" || ref3 === "Buoy Base G" || ref3 === "Dusty Dune G") {
+        if ((ref2 = action.name) === "Battlerock L" || ref2 === "Buoy Base G" || ref2 === "Dusty Dune G") {
           greenStarCount += 1;
-          if (greenStarCount === 1) {
-            starCountStr = "1 green star";
-          } else {
-            starCountStr = greenStarCount + " green stars";
-          }
-          if (starCountStr in Item.followingItemsLookup) {
-            followingItems.push.apply(followingItems, Item.followingItemsLookup[starCountStr]);
+          if (greenStarCount in Item.followingGreenStarCounts) {
+            followingItems.push.apply(followingItems, Item.followingGreenStarCounts[greenStarCount]);
           }
         }
         if (action.name === "Talk to Luigi at Garage") {
           luigiStatus.talkedAtGarage = true;
         } else if (luigiStatus.talkedAtGarage && action instanceof Level) {
-          if ((ref4 = action.name) === "Good Egg L" || ref4 === "Battlerock L" || ref4 === "Honeyhive L") {
+          if ((ref3 = action.name) === "Good Egg L" || ref3 === "Battlerock L" || ref3 === "Honeyhive L") {
             luigiStatus.luigiStars += 1;
             luigiStatus.betweenStars = 0;
           } else {
@@ -973,38 +1460,50 @@
             }
           }
         }
-        if (action.name in Item.followingItemsLookup) {
-          followingItems.push.apply(followingItems, Item.followingItemsLookup[action.name]);
-        }
+        followingItems.push.apply(followingItems, action.following);
         while (followingItems.length > 0) {
           followingItem = followingItems.shift();
           if (followingItem instanceof Action) {
             expectedActionName = followingItem.name;
             continue;
           }
-          reqFailed = false;
-          ref5 = followingItem.requirements;
-          for (l = 0, len2 = ref5.length; l < len2; l++) {
-            req = ref5[l];
-            if (!this.fulfilledRequirement(req, completedItemNames, starCount)) {
-              reqFailed = true;
-            }
-          }
-          if (reqFailed) {
+          if (!this.fulfilledRequirements(followingItem, completed, starCount)) {
             continue;
           }
           this.items.push({
             item: followingItem
           });
-          completedItemNames.push(followingItem.name);
-          if (this.isEndOfRoute(followingItem, completedItemNames, starCount)) {
+          this.constructor.setCompleted(completed, followingItem);
+          if (this.isEndOfRoute(followingItem, completed, starCount)) {
             return;
           }
-          if (followingItem.name in Item.followingItemsLookup) {
-            followingItems.push.apply(followingItems, Item.followingItemsLookup[followingItem.name]);
+          followingItems.push.apply(followingItems, followingItem.following);
+        }
+      }
+    };
+
+    Route.prototype.messageIds = function() {
+      var character, ids, itemObj, j, k, len, len1, message, messageId, ref, ref1, ref2;
+      ids = [];
+      ref = this.items;
+      for (j = 0, len = ref.length; j < len; j++) {
+        itemObj = ref[j];
+        ref1 = itemObj.item.messages;
+        for (k = 0, len1 = ref1.length; k < len1; k++) {
+          message = ref1[k];
+          if (typeof message.id === 'string') {
+            ids.push(message.id);
+          } else {
+            ref2 = message.id;
+            for (character in ref2) {
+              if (!hasProp.call(ref2, character)) continue;
+              messageId = ref2[character];
+              ids.push(messageId);
+            }
           }
         }
       }
+      return MessageUtil.withIncludedMessageIds(ids);
     };
 
     Route.prototype.makeTable = function(argSets) {
@@ -1174,13 +1673,19 @@
     return argSets;
   };
 
-  addLanguages = function(langCodes, callbackAfterInitAllLanguages) {
-    var allLanguagesLoaded, callbackAfterLoadingLanguage, cb, j, langCode, len, results;
+  addLanguages = function(langCodes, callbackAfterInitAllLanguages, messageIds) {
+    var allLanguagesLoaded, callbackAfterLoadingLanguage, callbackAfterLoadingShards, cb, files, j, langCode, len, loadIndexed, loadLanguage, loadLanguageJS, loadManifest, ref, ref1, results;
+    if (messageIds == null) {
+      messageIds = null;
+    }
+    callbackAfterLoadingShards = function() {
+      return MessageShards.load(langCodes, messageIds, callbackAfterInitAllLanguages);
+    };
     allLanguagesLoaded = langCodes.every(function(code) {
       return (window.messages != null) && code in window.messages;
     });
     if (allLanguagesLoaded) {
-      callbackAfterInitAllLanguages();
+      callbackAfterLoadingShards();
       return;
     }
     results = [];
@@ -1190,12 +1695,14 @@
         continue;
       }
       cb = function(langCode_, langCodes_, callbackAfterInitAllLanguages_) {
-        var data, messageId, ref;
-        ref = window.messages[langCode_];
-        for (messageId in ref) {
-          if (!hasProp.call(ref, messageId)) continue;
-          data = ref[messageId];
-          new Message(messageId, langCode_, data);
+        var data, languageMessages, messageId;
+        languageMessages = window.messages[langCode_];
+        if (!(languageMessages instanceof BinaryMessages)) {
+          for (messageId in languageMessages) {
+            if (!hasProp.call(languageMessages, messageId)) continue;
+            data = languageMessages[messageId];
+            new Message(messageId, langCode_, data);
+          }
         }
         allLanguagesLoaded = langCodes_.every(function(code) {
           return code in window.messages;
@@ -1204,8 +1711,78 @@
           return callbackAfterInitAllLanguages_();
         }
       };
-      callbackAfterLoadingLanguage = Util.curry(cb, langCode, langCodes, callbackAfterInitAllLanguages);
-      results.push(Util.readServerJSFile("js/messages/" + langCode + ".js", callbackAfterLoadingLanguage));
+      callbackAfterLoadingLanguage = Util.curry(cb, langCode, langCodes, callbackAfterLoadingShards);
+      files = (ref = (ref1 = window.messageFiles) != null ? ref1.languages[langCode] : void 0) != null ? ref : {};
+      loadLanguageJS = (function(langCode, callbackAfterLoadingLanguage) {
+        return function() {
+          return Util.readServerJSFile("js/messages/" + langCode + ".js", callbackAfterLoadingLanguage);
+        };
+      })(langCode, callbackAfterLoadingLanguage);
+      loadLanguage = (function(langCode, callbackAfterLoadingLanguage, loadLanguageJS, files) {
+        return function() {
+          var onLoad;
+          if (!files.binary || (window.TextDecoder == null)) {
+            loadLanguageJS();
+            return;
+          }
+          onLoad = function(buffer) {
+            if (window.messages == null) {
+              window.messages = {};
+            }
+            window.messages[langCode] = new BinaryMessages(buffer);
+            return callbackAfterLoadingLanguage();
+          };
+          return Util.readServerBinaryFile("js/messages/" + langCode + ".bin", onLoad, loadLanguageJS);
+        };
+      })(langCode, callbackAfterLoadingLanguage, loadLanguageJS, files);
+      loadManifest = (function(langCode, callbackAfterLoadingLanguage, loadLanguage, files) {
+        return function() {
+          var onLoad;
+          if (!files.shards) {
+            loadLanguage();
+            return;
+          }
+          onLoad = function() {
+            MessageShards.manifests[langCode] = window.messageManifests[langCode];
+            if (window.messages == null) {
+              window.messages = {};
+            }
+            window.messages[langCode] = {};
+            return callbackAfterLoadingLanguage();
+          };
+          return Util.readServerJSFile("js/messages/" + langCode + "/_manifest.js", onLoad, loadLanguage);
+        };
+      })(langCode, callbackAfterLoadingLanguage, loadLanguage, files);
+      loadIndexed = (function(langCode, callbackAfterLoadingLanguage, loadManifest, files) {
+        return function() {
+          var onLoad;
+          if (!files.indexed || (window.messageIndex == null)) {
+            loadManifest();
+            return;
+          }
+          onLoad = function() {
+            var indexed;
+            indexed = window.indexedMessages[langCode];
+            delete window.indexedMessages[langCode];
+            if (indexed.key !== window.messageIndex.key) {
+              loadManifest();
+              return;
+            }
+            Message.addIndexed(langCode, indexed.messages);
+            if (window.messages == null) {
+              window.messages = {};
+            }
+            window.messages[langCode] = {};
+            return callbackAfterLoadingLanguage();
+          };
+          return Util.readServerJSFile("js/indexed/" + langCode + ".js", onLoad, loadManifest);
+        };
+      })(langCode, callbackAfterLoadingLanguage, loadManifest, files);
+      if (files.frames) {
+        results.push(Util.readServerJSFile("js/messageframes/" + langCode + ".js", loadIndexed, loadIndexed));
+      } else {
+        results.push(loadIndexed());
+      }
     }
     return results;
   };
@@ -1215,13 +1792,32 @@
 
     Main.prototype.routeTextChanged = false;
 
-    Main.prototype.init = function(itemDetails, itemMessages) {
-      var callback;
-      callback = Util.curry(this.init2, itemDetails, itemMessages);
-      return addLanguages(['usenglish'], callback);
+    Main.prototype.init = function(itemDetails, itemMessages, itemGraph) {
+      var _, callback, details, loadLanguages, ref, starNameIds;
+      callback = Util.curry(this.init2, itemDetails, itemMessages, itemGraph);
+      starNameIds = MessageUtil.withIncludedMessageIds((function() {
+        var results;
+        results = [];
+        for (_ in itemDetails) {
+          if (!hasProp.call(itemDetails, _)) continue;
+          details = itemDetails[_];
+          if (details.star_name) {
+            results.push(details.star_name);
+          }
+        }
+        return results;
+      })());
+      loadLanguages = function() {
+        return addLanguages(['usenglish'], callback, starNameIds);
+      };
+      if ((ref = window.messageFiles) != null ? ref.index : void 0) {
+        return Util.readServerJSFile("js/indexed/index.js", loadLanguages, loadLanguages);
+      } else {
+        return loadLanguages();
+      }
     };
 
-    Main.prototype.init2 = function(itemDetails, itemMessages) {
+    Main.prototype.init2 = function(itemDetails, itemMessages, itemGraph) {
       var $select, _, applySampleRoute, args, details, itemKey, j, k, l, lang, langCode, languageLookup, languages, len, len1, len2, n, num, obj, ref, ref1, ref2, ref3, set, sortFunc, text, value;
       for (itemKey in itemDetails) {
         if (!hasProp.call(itemDetails, itemKey)) continue;
@@ -1249,6 +1845,10 @@
           console.log("Invalid item type: " + details.type);
         }
       }
+      Item.applyGraph(itemGraph);
+      if (window.messageIndex != null) {
+        Item.applyMessageIndex(window.messageIndex);
+      }
       Action.addAliases();
       languages = [];
       languageLookup = {};
@@ -1326,7 +1926,7 @@
               results.push(argSet.langCode);
             }
             return results;
-          })(), callback);
+          })(), callback, route.messageIds());
         };
       })(this);
       $('.help-button').each(function() {
@@ -23,15 +23,42 @@
       };
     };
 
-    Util.readServerJSFile = function(filepath, callback) {
+    Util.readServerJSFile = function(filepath, callback, errorCallback) {
+      if (errorCallback == null) {
+        errorCallback = null;
+      }
       return $.ajax({
         url: filepath,
         type: 'GET',
         dataType: 'script',
-        success: callback
+        success: callback,
+        error: errorCallback
       });
     };
 
+    Util.readServerBinaryFile = function(filepath, callback, errorCallback) {
+      var request;
+      if (errorCallback == null) {
+        errorCallback = null;
+      }
+      request = new XMLHttpRequest();
+      request.open('GET', filepath);
+      request.responseType = 'arraybuffer';
+      request.onload = function() {
+        if (request.status === 200) {
+          return callback(request.response);
+        } else if (errorCallback != null) {
+          return errorCallback();
+        }
+      };
+      request.onerror = function() {
+        if (errorCallback != null) {
+          return errorCallback();
+        }
+      };
+      return request.send();
+    };
+
     Util.readServerTextFile = function(filepath, callback) {
       return $.ajax({
         url: filepath,